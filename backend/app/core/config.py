@@ -43,6 +43,75 @@ class Settings(BaseSettings):
     # Vector Database
     VECTOR_DB_PATH: str = "./data/vectordb"
     EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
+    INDEX_SNAPSHOT_GRACE_SECONDS: float = 300.0  # Keep retired snapshots for in-flight queries
+    INDEX_WATCH_INTERVAL_SECONDS: float = 5.0  # Manifest polling interval for hot reload
+    
+    # Passage Indexing (full judgments are split into overlapping passages)
+    PASSAGE_MAX_CHARS: int = 1000  # ~256 tokens, the MiniLM input window
+    PASSAGE_OVERLAP_CHARS: int = 200
+    EMBEDDING_BATCH_SIZE: int = 32
+    PASSAGE_SCORE_AGGREGATION: str = "max"  # max, sum_top_n
+    PASSAGE_SCORE_TOP_N: int = 3
+    PASSAGE_SEARCH_FANOUT: int = 8  # Passages fetched per requested judgment
+    
+    # Cross-Encoder Re-ranking (optional second stage for case-law search)
+    RERANK_ENABLED: bool = False
+    RERANK_MODEL: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    RERANK_CANDIDATES: int = 50
+    RERANK_BATCH_SIZE: int = 16
+    RERANK_BUDGET_MS: float = 150.0  # Per-request budget; partial re-ranking after this
+    RERANK_CACHE_SIZE: int = 10000  # (query hash, doc id) score entries
+    
+    # Citation search result cache (cleared when the precedent or vector corpus changes)
+    CITATION_CACHE_SIZE: int = 2048
+    
+    # Indian Kanoon API (mock results are served while no token is set)
+    INDIAN_KANOON_API_URL: str = "https://api.indiankanoon.org"
+    INDIAN_KANOON_API_TOKEN: str = ""
+    CASE_LAW_MIRROR_PATH: str = "./data/case_law_mirror.db"  # Local FTS5 mirror, searched first
+    CASE_LAW_CACHE_TTL_SECONDS: float = 3600.0  # API results are fresh for an hour
+    CASE_LAW_CACHE_STALE_SECONDS: float = 86400.0  # ...then served stale (and refreshed) for a day
+    CASE_LAW_CACHE_MAX_ENTRIES: int = 5000
+    CASE_LAW_CACHE_PATH: str = "./data/case_law_cache.db"  # Empty for an in-memory cache only
+    
+    # Outbound quota (token bucket shared by searches and dataset ingestion)
+    INDIAN_KANOON_RATE_PER_SECOND: float = 2.0
+    INDIAN_KANOON_BURST: int = 5
+    OUTBOUND_INTERACTIVE_MAX_WAIT_SECONDS: float = 5.0  # User searches fail fast after this
+    OUTBOUND_BATCH_MAX_WAIT_SECONDS: float = 300.0
+    
+    # Outbound HTTP client (shared, pooled)
+    HTTP2_ENABLED: bool = True  # Used only if the 'h2' package is installed
+    HTTP_MAX_CONNECTIONS: int = 20
+    HTTP_MAX_CONCURRENCY_PER_HOST: int = 8
+    HTTP_KEEPALIVE_SECONDS: float = 30.0
+    HTTP_TIMEOUT_SECONDS: float = 10.0
+    HTTP_MAX_RETRIES: int = 3
+    HTTP_RETRY_BASE_DELAY_SECONDS: float = 0.25
+    HTTP_RETRY_MAX_DELAY_SECONDS: float = 4.0
+    
+    # OCR process pool
+    OCR_WORKERS: int = 2
+    OCR_MAX_QUEUE: int = 16  # Documents queued or running before uploads get a 503
+    OCR_TASK_TIMEOUT_SECONDS: float = 300.0
+    OCR_START_METHOD: str = "spawn"  # spawn, forkserver, fork
+    OCR_USE_EASYOCR: bool = True  # Use EasyOCR when installed (else Tesseract only)
+    OCR_PRELOAD_MODELS: bool = False  # Load models at startup, once, shared by forked workers (needs forkserver/fork)
+    OCR_PDF_DPI: int = 200  # Rasterization resolution for scanned pages
+    OCR_PDF_GRAYSCALE: bool = True  # 1 byte/pixel instead of 3; OCR does not use colour
+    OCR_RENDER_WINDOW_PAGES: int = 8  # Pages rasterized at a time (bounds memory on long PDFs)
+    OCR_PREPROCESS_STEPS: List[str] = ["downscale", "grayscale", "binarize", "deskew", "crop"]  # [] disables
+    OCR_PREPROCESS_TARGET_DPI: int = 300  # Larger images (e.g. phone photos) are scaled down to this
+    OCR_PREPROCESS_MAX_SKEW_DEGREES: float = 5.0
+    OCR_CACHE_PATH: str = "./data/ocr_cache.db"  # Results keyed by SHA-256 of file/page bytes
+    OCR_CACHE_MAX_AGE_DAYS: float = 180.0  # Entries older than this are purged on startup (0 keeps all)
+    OCR_JOB_WORKER_ENABLED: bool = True  # Run an OCR job worker inside the API process
+    OCR_JOB_CONCURRENCY: int = 2  # Documents one worker processes at once
+    OCR_JOB_POLL_SECONDS: float = 2.0
+    OCR_JOB_STALE_SECONDS: float = 900.0  # Claims without a heartbeat for this long are re-queued
+    OCR_JOB_MAX_ATTEMPTS: int = 3
+    OCR_MAX_CONCURRENT_PER_USER: int = 2  # Documents of one user OCR'd at once (across all workers)
+    BATCH_MAX_FILES: int = 50  # Files per batch upload (ZIP members included)
     
     # File Upload
     UPLOAD_DIR: str = "./uploads"
@@ -2,7 +2,7 @@
 Database configuration and session management
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
@@ -16,9 +16,55 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+# Columns added to tables that existing databases already have. create_all
+# only creates missing tables, so init_db adds these in place when absent.
+ADDED_COLUMNS = {
+    "precedents": ["parallel_citations"],
+    "uploaded_documents": [
+        "content_hash",
+        "document_type", "pages_total", "pages_done", "error_message",
+        "claimed_by", "claimed_at", "attempts",
+        "batch_id",
+    ],
+}
+
+def _column_ddl(column) -> str:
+    """Column definition for ALTER TABLE ... ADD COLUMN"""
+    ddl = f"{column.name} {column.type.compile(dialect=engine.dialect)}"
+    default = column.default.arg if column.default is not None and column.default.is_scalar else None
+    if isinstance(default, bool):
+        ddl += f" DEFAULT {int(default)}"
+    elif isinstance(default, (int, float)):
+        ddl += f" DEFAULT {default}"
+    elif isinstance(default, str):
+        ddl += " DEFAULT '{}'".format(default.replace("'", "''"))
+    for foreign_key in column.foreign_keys:
+        ddl += f" REFERENCES {foreign_key.column.table.name}({foreign_key.column.name})"
+    return ddl
+
+def add_missing_columns():
+    """Idempotently add ADDED_COLUMNS (and their indexes) to existing tables"""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table_name, column_names in ADDED_COLUMNS.items():
+            if not inspector.has_table(table_name):
+                continue  # Created complete by create_all
+            existing = {column["name"] for column in inspector.get_columns(table_name)}
+            table = Base.metadata.tables[table_name]
+            for name in column_names:
+                if name in existing:
+                    continue
+                column = table.c[name]
+                conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {_column_ddl(column)}"))
+                if column.index:
+                    # Same name create_all gives index=True columns
+                    conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{table_name}_{name} ON {table_name} ({name})"))
+                print(f"[+] Added column {table_name}.{name}")
+
 async def init_db():
     """Initialize database tables"""
     Base.metadata.create_all(bind=engine)
+    add_missing_columns()
 
 def get_db():
     """Dependency for database sessions"""
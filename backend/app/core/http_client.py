@@ -0,0 +1,148 @@
+"""
+Shared async HTTP client
+One pooled httpx.AsyncClient for outbound API calls (Indian Kanoon etc.)
+with keep-alive, optional HTTP/2, per-host concurrency limits and retries
+"""
+
+import asyncio
+import random
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.rate_limiter import INTERACTIVE, get_rate_limiter
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional 'h2' package (pip install httpx[http2])"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class AsyncHTTPClient:
+    """
+    Process-wide outbound HTTP client
+
+    The underlying httpx.AsyncClient is created on first use and reused for
+    every request, so connections (and TLS sessions) are kept alive between
+    searches instead of being opened per call.
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_per_host: Optional[int] = None,
+        timeout_seconds: Optional[float] = None,
+        max_retries: Optional[int] = None
+    ):
+        self.max_connections = max_connections or settings.HTTP_MAX_CONNECTIONS
+        self.max_per_host = max_per_host or settings.HTTP_MAX_CONCURRENCY_PER_HOST
+        self.timeout_seconds = timeout_seconds or settings.HTTP_TIMEOUT_SECONDS
+        self.max_retries = settings.HTTP_MAX_RETRIES if max_retries is None else max_retries
+        self.http2 = settings.HTTP2_ENABLED and _http2_available()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=settings.HTTP_KEEPALIVE_SECONDS
+                ),
+                timeout=httpx.Timeout(self.timeout_seconds, connect=min(5.0, self.timeout_seconds)),
+                headers={"User-Agent": f"{settings.APP_NAME}/{settings.VERSION}"}
+            )
+        return self._client
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._host_semaphores[host] = asyncio.Semaphore(self.max_per_host)
+        return semaphore
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        """Full-jitter exponential backoff, honouring Retry-After when sent"""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), settings.HTTP_RETRY_MAX_DELAY_SECONDS)
+        ceiling = min(settings.HTTP_RETRY_MAX_DELAY_SECONDS, settings.HTTP_RETRY_BASE_DELAY_SECONDS * 2 ** attempt)
+        return random.uniform(0, ceiling)
+
+    async def request(self, method: str, url: str, priority: str = INTERACTIVE, **kwargs) -> httpx.Response:
+        """
+        Send a request, retrying transport errors and 429/5xx responses
+
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            priority: Quota priority for rate-limited hosts ("interactive" or "batch")
+            **kwargs: Passed to httpx (params, json, headers, ...)
+
+        Returns:
+            The final response (raise_for_status is left to the caller)
+
+        Raises:
+            RateLimitExceeded: The host's quota queue is longer than the allowed wait
+        """
+        client = self._get_client()
+        semaphore = self._host_semaphore(url)
+        limiter = get_rate_limiter(url)
+
+        for attempt in range(self.max_retries + 1):
+            response = None
+            error = None
+            if limiter is not None:
+                await limiter.acquire_async(priority)
+            started = time.perf_counter()
+            try:
+                async with semaphore:
+                    response = await client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                error = e
+            finally:
+                metrics.observe("http_request_ms", (time.perf_counter() - started) * 1000)
+
+            if error is None and response.status_code not in RETRY_STATUS_CODES:
+                return response
+            if attempt == self.max_retries:
+                if error is not None:
+                    raise error
+                return response
+
+            metrics.increment("http_retries")
+            delay = self._retry_delay(attempt, response)
+            if limiter is not None and response is not None and response.status_code == 429:
+                # Quota exhausted: hold back every caller of this host, not just this one
+                limiter.penalize(delay)
+            else:
+                await asyncio.sleep(delay)
+
+    async def get(self, url: str, priority: str = INTERACTIVE, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, priority=priority, **kwargs)
+
+    async def post(self, url: str, priority: str = INTERACTIVE, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, priority=priority, **kwargs)
+
+    async def aclose(self):
+        """Close pooled connections (called on application shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Singleton instance
+http_client = AsyncHTTPClient()
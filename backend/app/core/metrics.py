@@ -0,0 +1,79 @@
+"""
+Lightweight in-process metrics registry
+Sliding-window latency percentiles and counters, exposed at /metrics
+"""
+
+import threading
+from collections import deque
+from typing import Dict, Any, Optional
+
+
+class MetricsRegistry:
+    """Thread-safe store for latency observations and counters"""
+
+    def __init__(self, window: int = 2048):
+        self.window = window
+        self._observations: Dict[str, deque] = {}
+        self._counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, value: float):
+        """Record one observation (e.g. a latency in milliseconds)"""
+        with self._lock:
+            series = self._observations.get(name)
+            if series is None:
+                series = self._observations[name] = deque(maxlen=self.window)
+            series.append(value)
+
+    def increment(self, name: str, amount: float = 1):
+        """Increase a counter"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def counter(self, name: str) -> float:
+        """Current value of a counter"""
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def summary(self, name: str) -> Optional[Dict[str, float]]:
+        """Count, mean and p50/p95/p99 over the recent window"""
+        with self._lock:
+            values = sorted(self._observations.get(name, ()))
+
+        if not values:
+            return None
+
+        def percentile(p: float) -> float:
+            return values[min(len(values) - 1, int(round(p * (len(values) - 1))))]
+
+        return {
+            "count": len(values),
+            "mean": round(sum(values) / len(values), 3),
+            "p50": round(percentile(0.50), 3),
+            "p95": round(percentile(0.95), 3),
+            "p99": round(percentile(0.99), 3)
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """All counters and observation summaries"""
+        with self._lock:
+            names = list(self._observations.keys())
+            counters = dict(self._counters)
+
+        # Hit ratio for every "<name>_hits" / "<name>_misses" counter pair
+        ratios = {}
+        for name, hits in counters.items():
+            if name.endswith("_hits"):
+                prefix = name[:-len("_hits")]
+                total = hits + counters.get(f"{prefix}_misses", 0)
+                ratios[f"{prefix}_hit_ratio"] = round(hits / total, 4) if total else None
+
+        return {
+            "counters": counters,
+            "ratios": ratios,
+            "latencies": {name: self.summary(name) for name in names}
+        }
+
+
+# Singleton instance
+metrics = MetricsRegistry()
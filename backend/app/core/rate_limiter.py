@@ -0,0 +1,159 @@
+"""
+Outbound rate limiter
+Token-bucket scheduler shared by every call to a quota-limited external API,
+with interactive requests served ahead of batch ingestion
+"""
+
+import asyncio
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Optional
+from urllib.parse import urlsplit
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request would have to queue longer than its max wait"""
+    pass
+
+
+class TokenBucketScheduler:
+    """
+    Token bucket with two priority queues
+
+    Tokens refill at `rate` per second up to `burst`. Waiters are served
+    FIFO within a priority; batch waiters only get a token when no
+    interactive request is waiting and the bucket stays above a reserve,
+    so ingestion soaks up spare quota but never delays user searches.
+    Usable from both threads (acquire) and coroutines (acquire_async).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        burst: int,
+        interactive_max_wait: float = 10.0,
+        batch_max_wait: float = 300.0,
+        batch_reserve_fraction: float = 0.2
+    ):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = {INTERACTIVE: interactive_max_wait, BATCH: batch_max_wait}
+        self.batch_reserve = burst * batch_reserve_fraction
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._waiting = {INTERACTIVE: deque(), BATCH: deque()}
+        self._tickets = itertools.count()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _try_take(self, priority: str, ticket: int) -> Optional[float]:
+        """Take a token for ticket; returns None if granted, else seconds to wait"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            if now < self._paused_until:
+                return self._paused_until - now
+            if self._waiting[priority][0] != ticket:
+                return 1.0 / self.rate
+            if priority == BATCH and self._waiting[INTERACTIVE]:
+                return 1.0 / self.rate
+
+            floor = self.batch_reserve if priority == BATCH else 0.0
+            if self._tokens - 1.0 >= floor:
+                self._tokens -= 1.0
+                self._waiting[priority].popleft()
+                return None
+            return (floor + 1.0 - self._tokens) / self.rate
+
+    def _enqueue(self, priority: str) -> int:
+        if priority not in self._waiting:
+            raise ValueError(f"Unknown priority: {priority}")
+        with self._lock:
+            ticket = next(self._tickets)
+            self._waiting[priority].append(ticket)
+            return ticket
+
+    def _give_up(self, priority: str, ticket: int, waited: float):
+        with self._lock:
+            self._waiting[priority].remove(ticket)
+        metrics.increment(f"{self.name}_rejected_{priority}")
+        raise RateLimitExceeded(
+            f"{self.name}: no quota within {waited:.1f}s for {priority} request"
+        )
+
+    def _granted(self, priority: str, started: float):
+        metrics.observe(f"{self.name}_queue_ms_{priority}", (time.monotonic() - started) * 1000)
+
+    def acquire(self, priority: str = INTERACTIVE, max_wait: Optional[float] = None):
+        """Block the calling thread until a token is granted"""
+        max_wait = self.max_wait[priority] if max_wait is None else max_wait
+        started = time.monotonic()
+        ticket = self._enqueue(priority)
+        while True:
+            delay = self._try_take(priority, ticket)
+            if delay is None:
+                return self._granted(priority, started)
+            waited = time.monotonic() - started
+            if waited + delay > max_wait:
+                self._give_up(priority, ticket, waited)
+            time.sleep(min(delay, 0.05))
+
+    async def acquire_async(self, priority: str = INTERACTIVE, max_wait: Optional[float] = None):
+        """Wait (without blocking the event loop) until a token is granted"""
+        max_wait = self.max_wait[priority] if max_wait is None else max_wait
+        started = time.monotonic()
+        ticket = self._enqueue(priority)
+        try:
+            while True:
+                delay = self._try_take(priority, ticket)
+                if delay is None:
+                    return self._granted(priority, started)
+                waited = time.monotonic() - started
+                if waited + delay > max_wait:
+                    self._give_up(priority, ticket, waited)
+                await asyncio.sleep(min(delay, 0.05))
+        except asyncio.CancelledError:
+            with self._lock:
+                if ticket in self._waiting[priority]:
+                    self._waiting[priority].remove(ticket)
+            raise
+
+    def penalize(self, retry_after: float):
+        """Upstream said 429: stop granting tokens for retry_after seconds"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            self._tokens = 0.0
+        metrics.increment(f"{self.name}_throttled")
+
+
+# One scheduler per quota, shared by the API and the dataset builder in this process
+_indian_kanoon_limiter = TokenBucketScheduler(
+    "indian_kanoon",
+    rate=settings.INDIAN_KANOON_RATE_PER_SECOND,
+    burst=settings.INDIAN_KANOON_BURST,
+    interactive_max_wait=settings.OUTBOUND_INTERACTIVE_MAX_WAIT_SECONDS,
+    batch_max_wait=settings.OUTBOUND_BATCH_MAX_WAIT_SECONDS
+)
+
+
+def get_rate_limiter(url: str) -> Optional[TokenBucketScheduler]:
+    """Scheduler governing the quota for url's host, or None if unlimited"""
+    host = urlsplit(url).hostname or ""
+    if host == urlsplit(settings.INDIAN_KANOON_API_URL).hostname or host.endswith("indiankanoon.org"):
+        return _indian_kanoon_limiter
+    return None
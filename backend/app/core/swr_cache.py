@@ -0,0 +1,176 @@
+"""
+Stale-while-revalidate cache
+Async cache for slow upstream calls: fresh entries are returned directly,
+stale ones are returned immediately while a background task refreshes them
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from app.core.metrics import metrics
+
+
+class SQLiteCacheStore:
+    """Optional persistent backing store (survives restarts, shared by workers)"""
+
+    def __init__(self, path: str, table: str = "swr_cache"):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.table = table
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value TEXT NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT value, fetched_at FROM {self.table} WHERE key = ?", (key,)).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def set(self, key: str, value: Any, fetched_at: float):
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, fetched_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), fetched_at)
+            )
+            self._conn.commit()
+
+    def purge(self, older_than: float):
+        """Delete entries fetched before the given timestamp"""
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE fetched_at < ?", (older_than,))
+            self._conn.commit()
+
+
+class SWRCache:
+    """
+    In-memory LRU with TTL + stale-while-revalidate window
+
+    Within ttl_seconds an entry is fresh; for a further stale_seconds it is
+    still served instantly while one background refresh runs. Concurrent
+    misses for the same key share a single upstream call.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl_seconds: float,
+        stale_seconds: float,
+        max_entries: int = 5000,
+        store: Optional[SQLiteCacheStore] = None
+    ):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self.store = store
+        # key -> (value, fetched_at wall-clock time), LRU ordered
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._background: Set[asyncio.Task] = set()
+
+    def _lookup(self, key: str) -> Optional[Tuple[Any, float]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry
+        if self.store is not None:
+            entry = self.store.get(key)
+            if entry is not None:
+                self._remember(key, *entry)
+        return entry
+
+    def _remember(self, key: str, value: Any, fetched_at: float):
+        self._entries[key] = (value, fetched_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _fetch(self, key: str, fetcher: Callable[[], Awaitable[Any]]) -> Any:
+        """Single-flight upstream call that updates the cache"""
+        future = self._inflight.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await fetcher()
+            fetched_at = time.time()
+            self._remember(key, value, fetched_at)
+            if self.store is not None:
+                self.store.set(key, value, fetched_at)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody else was waiting
+            raise
+        finally:
+            del self._inflight[key]
+
+    def _refresh_in_background(self, key: str, fetcher: Callable[[], Awaitable[Any]]):
+        if key in self._inflight:
+            return
+
+        async def refresh():
+            try:
+                await self._fetch(key, fetcher)
+                metrics.increment(f"{self.name}_refreshes")
+            except Exception as e:
+                # Keep serving the stale value; the next request retries
+                print(f"Background refresh failed for {self.name}: {str(e)}")
+                metrics.increment(f"{self.name}_refresh_failures")
+
+        task = asyncio.create_task(refresh())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetcher: Callable[[], Awaitable[Any]],
+        refresher: Optional[Callable[[], Awaitable[Any]]] = None
+    ) -> Any:
+        """
+        Cached value for key, calling fetcher only on a miss or after expiry
+
+        Args:
+            key: Cache key
+            fetcher: Zero-argument coroutine function producing a JSON-serialisable value
+            refresher: Used instead of fetcher for background refreshes (e.g. at
+                a lower priority, since nobody is waiting for the result)
+
+        Returns:
+            Fresh or stale cached value, or the fetched value on a miss
+        """
+        started = time.perf_counter()
+        entry = self._lookup(key)
+
+        if entry is not None:
+            value, fetched_at = entry
+            age = time.time() - fetched_at
+            if age < self.ttl_seconds:
+                metrics.increment(f"{self.name}_hits")
+                metrics.observe(f"{self.name}_hit_ms", (time.perf_counter() - started) * 1000)
+                return value
+            if age < self.ttl_seconds + self.stale_seconds:
+                metrics.increment(f"{self.name}_hits")
+                metrics.increment(f"{self.name}_stale_served")
+                self._refresh_in_background(key, refresher or fetcher)
+                metrics.observe(f"{self.name}_hit_ms", (time.perf_counter() - started) * 1000)
+                return value
+
+        metrics.increment(f"{self.name}_misses")
+        value = await self._fetch(key, fetcher)
+        metrics.observe(f"{self.name}_miss_ms", (time.perf_counter() - started) * 1000)
+        return value
@@ -133,18 +133,29 @@ class UploadedDocument(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    batch_id = Column(Integer, ForeignKey("document_batches.id"), nullable=True, index=True)
     
     # File details
     filename = Column(String, nullable=False)
     file_path = Column(String, nullable=False)
     file_type = Column(String, nullable=False)  # pdf, image, doc
     file_size = Column(Integer, nullable=False)
+    content_hash = Column(String(64), nullable=True, index=True)  # SHA-256 of the file; OCR cache key
     
     # OCR results
     extracted_text = Column(Text, nullable=True)
     extracted_data = Column(JSON, nullable=True)  # {petitioner, respondent, sections, dates, etc.}
     ocr_confidence = Column(Integer, nullable=True)  # 0-100
     processing_status = Column(String, default="pending")  # pending, processing, completed, failed
+    document_type = Column(String, default="general")  # fir, chargesheet, notes, general
+    pages_total = Column(Integer, nullable=True)  # Known once the PDF has been opened
+    pages_done = Column(Integer, default=0)
+    error_message = Column(Text, nullable=True)
+    
+    # OCR job queue (any worker process may claim a pending document)
+    claimed_by = Column(String, nullable=True)  # Worker id holding the job
+    claimed_at = Column(DateTime(timezone=True), nullable=True)  # Heartbeat; stale claims are re-queued
+    attempts = Column(Integer, default=0)
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -152,6 +163,22 @@ class UploadedDocument(Base):
     
     # Relationships
     user = relationship("User", back_populates="uploaded_documents")
+    batch = relationship("DocumentBatch", back_populates="documents")
+
+class DocumentBatch(Base):
+    """A case bundle (FIR, chargesheet, statements, notes) uploaded in one request"""
+    __tablename__ = "document_batches"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    name = Column(String, nullable=True)
+    file_count = Column(Integer, default=0)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    documents = relationship("UploadedDocument", back_populates="batch", order_by="UploadedDocument.id")
 
 class DraftVersion(Base):
     """Version history for drafts"""
@@ -203,6 +230,7 @@ class Precedent(Base):
     # Case details
     case_name = Column(String, nullable=False, index=True)
     citation = Column(String, nullable=False)
+    parallel_citations = Column(JSON, nullable=True)  # e.g. ["(1973) 4 SCC 225"] for AIR 1973 SC 1461
     court = Column(String, nullable=False)
     year = Column(Integer, nullable=False)
     
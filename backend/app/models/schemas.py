@@ -125,6 +125,37 @@ class CitationResponse(BaseModel):
     citations: List[Citation]
     total: int
 
+class CitationResolveRequest(BaseModel):
+    references: List[str] = Field(..., max_length=10000)
+
+class CitationResolution(BaseModel):
+    reference: str
+    canonical_key: Optional[str] = None
+    resolved: bool
+    citation: Optional[Citation] = None
+
+class CitationResolveResponse(BaseModel):
+    results: List[CitationResolution]
+    resolved: int
+    unresolved: int
+
+class CitationSpan(BaseModel):
+    start: int
+    end: int
+    text: str
+    reporter: str
+    canonical_key: str
+    status: str  # "verified" or "not_found"
+    citation: Optional[Citation] = None
+
+class CitationVerificationResponse(BaseModel):
+    draft_id: int
+    spans: List[CitationSpan]
+    total: int
+    verified: int
+    not_found: int
+    elapsed_ms: float
+
 # Document Edit Schemas
 class DocumentEditRequest(BaseModel):
     draft_id: int
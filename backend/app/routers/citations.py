@@ -5,8 +5,12 @@ Citations router
 from fastapi import APIRouter, Depends, HTTPException
 from typing import List
 
-from app.models.schemas import CitationSearch, CitationResponse, Citation
+from app.models.schemas import (
+    CitationSearch, CitationResponse, Citation,
+    CitationResolveRequest, CitationResolveResponse, CitationResolution
+)
 from app.services.citation_service import citation_service
+from app.services.citation_normalizer import normalize_citation
 from app.core.security import verify_token
 
 router = APIRouter()
@@ -33,6 +37,32 @@ async def search_citations(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error searching citations: {str(e)}")
 
+@router.post("/resolve", response_model=CitationResolveResponse)
+async def resolve_citations(
+    request: CitationResolveRequest,
+    token_data: dict = Depends(verify_token)
+):
+    """Resolve many citation references at once (AIR, SCC, SCR, SCC OnLine, neutral)"""
+    
+    resolved = citation_service.resolve_citations(request.references)
+    
+    results = [
+        CitationResolution(
+            reference=ref,
+            canonical_key=normalize_citation(ref),
+            resolved=resolved[ref] is not None,
+            citation=resolved[ref]
+        )
+        for ref in request.references
+    ]
+    resolved_count = sum(1 for r in results if r.resolved)
+    
+    return CitationResolveResponse(
+        results=results,
+        resolved=resolved_count,
+        unresolved=len(results) - resolved_count
+    )
+
 @router.get("/{citation_ref}", response_model=Citation)
 async def get_citation(
     citation_ref: str,
@@ -14,6 +14,8 @@ from app.core.database import get_db
 from app.core.security import verify_token
 from app.models.database_models import User
 from app.services.dataset_builder import LegalDatasetBuilder
+from app.services.chunking_service import aggregate_passage_scores
+from app.core.config import settings
 
 router = APIRouter()
 
@@ -127,19 +129,28 @@ async def get_recent_cases(
         
         collection = client.get_collection("indian_judgments")
         
-        # Get all documents (limited)
+        # Get documents (limited); judgments are stored as several passages
         results = collection.get(
-            limit=limit,
+            limit=limit * settings.PASSAGE_SEARCH_FANOUT,
             include=["documents", "metadatas"]
         )
         
         cases = []
-        for i, case_id in enumerate(results["ids"]):
+        seen = set()
+        for i, passage_id in enumerate(results["ids"]):
+            metadata = results["metadatas"][i] if results["metadatas"] else {}
+            case_id = metadata.get("judgment_id", passage_id)
+            if case_id in seen:
+                continue
+            seen.add(case_id)
+            
             cases.append({
                 "id": case_id,
-                "metadata": results["metadatas"][i] if results["metadatas"] else {},
+                "metadata": metadata,
                 "preview": results["documents"][i][:200] if results["documents"] else ""
             })
+            if len(cases) >= limit:
+                break
         
         return {
             "total": len(cases),
@@ -158,19 +169,21 @@ async def get_recent_cases(
 async def search_similar_cases(
     query: str,
     limit: int = 5,
+    aggregation: str = None,
     current_user: User = Depends(get_current_user)
 ):
     """
     Search for similar cases using semantic search
+    
+    Matches are found at passage level across the full judgment text and
+    aggregated per judgment ("max" passage score or "sum_top_n").
     """
     try:
         import chromadb
         from chromadb.config import Settings
-        from sentence_transformers import SentenceTransformer
         
-        # Generate query embedding
-        model = SentenceTransformer('all-MiniLM-L6-v2')
-        query_embedding = model.encode(query).tolist()
+        # Generate query embedding (model is cached on the builder)
+        query_embedding = dataset_builder.generate_embeddings(query)
         
         # Search vector database
         client = chromadb.PersistentClient(
@@ -179,19 +192,32 @@ async def search_similar_cases(
         )
         collection = client.get_collection("indian_judgments")
         
+        # Over-fetch passages so enough distinct judgments survive aggregation
         results = collection.query(
             query_embeddings=[query_embedding],
-            n_results=limit,
+            n_results=limit * settings.PASSAGE_SEARCH_FANOUT,
             include=["documents", "metadatas", "distances"]
         )
         
+        passage_hits = []
+        for i, passage_id in enumerate(results["ids"][0]):
+            metadata = results["metadatas"][0][i] if results["metadatas"] else {}
+            passage_hits.append({
+                "judgment_id": metadata.get("judgment_id", passage_id),
+                "score": 1 - results["distances"][0][i],  # Convert distance to similarity
+                "metadata": metadata,
+                "text": results["documents"][0][i] if results["documents"] else ""
+            })
+        
         cases = []
-        for i, case_id in enumerate(results["ids"][0]):
+        for judgment in aggregate_passage_scores(passage_hits, method=aggregation)[:limit]:
+            best = judgment["best_passage"]
             cases.append({
-                "id": case_id,
-                "similarity_score": 1 - results["distances"][0][i],  # Convert distance to similarity
-                "metadata": results["metadatas"][0][i] if results["metadatas"] else {},
-                "preview": results["documents"][0][i][:300] if results["documents"] else ""
+                "id": judgment["judgment_id"],
+                "similarity_score": judgment["score"],
+                "matched_passages": judgment["matched_passages"],
+                "metadata": best["metadata"],
+                "preview": best["text"][:300]
             })
         
         return {
@@ -207,6 +233,47 @@ async def search_similar_cases(
         )
 
 
+@router.post("/dataset/index/reload")
+async def reload_vector_index(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Hot-swap the legal knowledge index to the latest published snapshot
+    In-flight queries finish on the old snapshot; no restart needed
+    """
+    try:
+        from app.services.rag_service import get_rag_service
+        
+        return get_rag_service().reload()
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error reloading vector index: {str(e)}"
+        )
+
+
+@router.get("/dataset/index/status")
+async def get_vector_index_status(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get the published and loaded vector index snapshot versions
+    """
+    from app.services.index_snapshots import IndexSnapshotManager
+    from app.services import rag_service as rag_module
+    
+    manifest = IndexSnapshotManager(settings.VECTOR_DB_PATH).read_manifest() or {}
+    loaded = rag_module._rag_service_instance
+    
+    return {
+        "published_version": manifest.get("current"),
+        "published_at": manifest.get("published_at"),
+        "loaded_version": loaded.snapshot_version if loaded else None,
+        "retired_versions": sorted(manifest.get("retired", {}).keys())
+    }
+
+
 @router.get("/dataset/health")
 async def dataset_health_check():
     """
@@ -4,18 +4,28 @@ Enhanced with OCR and automatic case extraction
 """
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Tuple
+import asyncio
+import hashlib
+import json
 import os
+import time
 import uuid
+import zipfile
 from datetime import datetime
 
-from app.core.database import get_db
+from app.core.database import get_db, SessionLocal
 from app.core.security import verify_token
 from app.models.schemas import ExportRequest, ExportResponse
-from app.models.database_models import User, Draft, Export, UploadedDocument
+from app.models.database_models import User, Draft, Export, UploadedDocument, DocumentBatch
 from app.core.config import settings
 from app.services.ocr_service import ocr_service, case_extractor
+from app.services.ocr_jobs import complete_document, ocr_job_worker
+from app.services.ocr_cache import content_hash
 
 router = APIRouter()
 
@@ -189,6 +199,11 @@ async def upload_and_extract_case_info(
     - Saves to database for future reference
     
     **Time Saved:** 25-30 minutes of manual data entry ⏱️
+    
+    OCR runs in background workers: the response returns immediately with
+    status 202 and a status URL (poll it, or follow the SSE events URL) that
+    reports pages done, partial text and fields as they are extracted.
+    Files processed before are answered at once from the OCR cache.
     """
     
     # Validate file type
@@ -210,53 +225,63 @@ async def upload_and_extract_case_info(
             content = await file.read()
             f.write(content)
             file_size = len(content)
+        digest = content_hash(content)
         
-        # Create database record
+        # Create database record (this is also the OCR job)
         uploaded_doc = UploadedDocument(
             user_id=current_user.id,
             filename=file.filename,
             file_path=file_path,
             file_type=file_extension,
             file_size=file_size,
-            processing_status="processing"
+            content_hash=digest,
+            document_type=document_type,
+            processing_status="pending"
         )
         db.add(uploaded_doc)
-        db.commit()
-        db.refresh(uploaded_doc)
-        
-        # Perform OCR extraction
-        if file_extension.lower() == "pdf":
-            extracted_text, confidence = await ocr_service.extract_text_from_pdf(file_path)
-        else:
-            extracted_text, confidence = await ocr_service.extract_text_from_image(file_path)
-        
-        # Extract structured case information
-        extracted_data = await case_extractor.extract_case_info(extracted_text, document_type)
         
-        # Update database record
-        uploaded_doc.extracted_text = extracted_text
-        uploaded_doc.extracted_data = extracted_data
-        uploaded_doc.ocr_confidence = confidence
-        uploaded_doc.processing_status = "completed"
-        uploaded_doc.processed_at = datetime.utcnow()
+        # Same bytes processed before: complete inline, no job needed
+        cached = ocr_service.cached_result(digest)
+        if cached is not None:
+            extracted_text, confidence, words = cached
+            extracted_data = complete_document(uploaded_doc, extracted_text, confidence, words)
+            db.commit()
+            db.refresh(uploaded_doc)
+            
+            return {
+                "success": True,
+                "document_id": uploaded_doc.id,
+                "filename": file.filename,
+                "processing_status": "completed",
+                "ocr_confidence": confidence,
+                "ocr_cached": True,
+                "extracted_data": extracted_data,
+                "extracted_fields": extracted_data.get("extracted_fields", []),
+                "full_text": extracted_text[:500] + "..." if len(extracted_text) > 500 else extracted_text,
+                "message": f"✅ Successfully extracted {len(extracted_data.get('extracted_fields', []))} fields from document"
+            }
         
         db.commit()
         db.refresh(uploaded_doc)
+        ocr_job_worker.notify()
         
-        return {
-            "success": True,
-            "document_id": uploaded_doc.id,
-            "filename": file.filename,
-            "ocr_confidence": confidence,
-            "extracted_data": extracted_data,
-            "extracted_fields": extracted_data.get("extracted_fields", []),
-            "full_text": extracted_text[:500] + "..." if len(extracted_text) > 500 else extracted_text,
-            "message": f"✅ Successfully extracted {len(extracted_data.get('extracted_fields', []))} fields from document"
-        }
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={
+                "success": True,
+                "document_id": uploaded_doc.id,
+                "filename": file.filename,
+                "processing_status": "pending",
+                "ocr_cached": False,
+                "status_url": f"/api/documents/uploaded/{uploaded_doc.id}/status",
+                "events_url": f"/api/documents/uploaded/{uploaded_doc.id}/events",
+                "message": "📄 Document queued for extraction"
+            }
+        )
         
     except Exception as e:
         # Update status to failed
-        if 'uploaded_doc' in locals():
+        if 'uploaded_doc' in locals() and uploaded_doc.id is not None:
             uploaded_doc.processing_status = "failed"
             db.commit()
         
@@ -266,6 +291,345 @@ async def upload_and_extract_case_info(
         )
 
 
+def _job_status(doc: UploadedDocument) -> dict:
+    """Progress view of an upload's OCR job"""
+    return {
+        "document_id": doc.id,
+        "processing_status": doc.processing_status,
+        "pages_done": doc.pages_done or 0,
+        "pages_total": doc.pages_total,
+        "ocr_confidence": doc.ocr_confidence,
+        "text": doc.extracted_text or "",
+        "extracted_data": doc.extracted_data,
+        "error": doc.error_message,
+        "processed_at": doc.processed_at.isoformat() if doc.processed_at else None
+    }
+
+
+@router.get("/uploaded/{document_id}/status")
+async def get_extraction_status(
+    document_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """OCR progress: pages done/total, partial text and fields extracted so far"""
+    doc = db.query(UploadedDocument).filter(
+        UploadedDocument.id == document_id,
+        UploadedDocument.user_id == current_user.id
+    ).first()
+    
+    if not doc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found"
+        )
+    
+    return _job_status(doc)
+
+
+@router.get("/uploaded/{document_id}/events")
+async def stream_extraction_status(
+    document_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Server-sent events with the job status whenever it changes; ends when done"""
+    exists = db.query(UploadedDocument.id).filter(
+        UploadedDocument.id == document_id,
+        UploadedDocument.user_id == current_user.id
+    ).first()
+    
+    if not exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found"
+        )
+    
+    async def events():
+        # Own session: the request-scoped one may be closed while streaming
+        stream_db = SessionLocal()
+        last_state = None
+        last_sent = time.monotonic()
+        try:
+            while True:
+                doc = stream_db.query(UploadedDocument).filter(UploadedDocument.id == document_id).first()
+                if doc is None:
+                    return
+                state = (doc.processing_status, doc.pages_done, doc.pages_total)
+                if state != last_state:
+                    last_state = state
+                    last_sent = time.monotonic()
+                    yield f"event: status\ndata: {json.dumps(_job_status(doc))}\n\n"
+                    if doc.processing_status in ("completed", "failed"):
+                        return
+                elif time.monotonic() - last_sent > 15:
+                    last_sent = time.monotonic()
+                    yield ": keep-alive\n\n"
+                stream_db.expire_all()
+                await asyncio.sleep(1.0)
+        finally:
+            stream_db.close()
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# Bundle files we can OCR, by extension
+BATCH_EXTENSIONS = {"pdf", "jpg", "jpeg", "png"}
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+class FileTooLargeError(Exception):
+    pass
+
+
+def _store_stream(source, extension: str) -> tuple:
+    """
+    Copy a file-like object to UPLOAD_DIR in chunks while hashing it
+    
+    Returns:
+        (file_path, file_size, sha256 hex digest)
+    
+    Raises:
+        FileTooLargeError: More than MAX_FILE_SIZE bytes (partial file removed)
+    """
+    file_path = os.path.join(settings.UPLOAD_DIR, f"{uuid.uuid4()}.{extension}")
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        with open(file_path, "wb") as out:
+            while True:
+                chunk = source.read(STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > settings.MAX_FILE_SIZE:
+                    raise FileTooLargeError()
+                hasher.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise
+    return file_path, size, hasher.hexdigest()
+
+
+def _store_batch_files(
+    files: List[UploadFile],
+    user_id: int,
+    batch_id: int,
+    default_type: str
+) -> Tuple[List[UploadedDocument], List[dict]]:
+    """
+    Store every supported file of a bundle upload (expanding ZIP archives)
+    and build its pending document row. Blocking; run it in a thread.
+    
+    Files already in the OCR cache come back completed.
+    
+    Returns:
+        (unsaved UploadedDocument rows, skipped files with reasons)
+    """
+    created = []
+    skipped = []
+    
+    def add_file(filename: str, source):
+        filename = os.path.basename(filename)
+        extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ""
+        if extension not in BATCH_EXTENSIONS:
+            skipped.append({"filename": filename, "reason": "Only PDF and image files (JPEG, PNG) are supported"})
+            return
+        if len(created) >= settings.BATCH_MAX_FILES:
+            skipped.append({"filename": filename, "reason": f"Batch limit of {settings.BATCH_MAX_FILES} files reached"})
+            return
+        try:
+            file_path, file_size, digest = _store_stream(source, extension)
+        except FileTooLargeError:
+            skipped.append({"filename": filename, "reason": "File too large"})
+            return
+        
+        doc = UploadedDocument(
+            user_id=user_id,
+            batch_id=batch_id,
+            filename=filename,
+            file_path=file_path,
+            file_type=extension,
+            file_size=file_size,
+            content_hash=digest,
+            document_type=case_extractor.guess_document_type(filename, default_type),
+            processing_status="pending"
+        )
+        created.append(doc)
+        cached = ocr_service.cached_result(digest)
+        if cached is not None:
+            complete_document(doc, *cached)
+    
+    try:
+        for upload in files:
+            is_zip = (
+                upload.content_type in ("application/zip", "application/x-zip-compressed")
+                or (upload.filename or "").lower().endswith(".zip")
+            )
+            if not is_zip:
+                add_file(upload.filename or "upload", upload.file)
+                continue
+            
+            try:
+                with zipfile.ZipFile(upload.file) as archive:
+                    for member in archive.infolist():
+                        if member.is_dir() or member.filename.startswith("__MACOSX/"):
+                            continue
+                        if len(created) >= settings.BATCH_MAX_FILES:
+                            skipped.append({"filename": upload.filename, "reason": f"Batch limit of {settings.BATCH_MAX_FILES} files reached; remaining archive members ignored"})
+                            break
+                        if member.file_size > settings.MAX_FILE_SIZE:
+                            skipped.append({"filename": os.path.basename(member.filename), "reason": "File too large"})
+                            continue
+                        with archive.open(member) as source:
+                            add_file(member.filename, source)
+            except zipfile.BadZipFile:
+                skipped.append({"filename": upload.filename, "reason": "Not a valid ZIP archive"})
+    except BaseException:
+        for doc in created:
+            if os.path.exists(doc.file_path):
+                os.remove(doc.file_path)
+        raise
+    
+    return created, skipped
+
+
+def _batch_status(batch: DocumentBatch) -> dict:
+    """Per-file status plus the merged extracted_data of the completed files"""
+    documents = list(batch.documents)
+    counts = {}
+    for doc in documents:
+        counts[doc.processing_status] = counts.get(doc.processing_status, 0) + 1
+    
+    if counts.get("completed", 0) + counts.get("failed", 0) == len(documents):
+        overall = "failed" if counts.get("failed", 0) == len(documents) else "completed"
+    else:
+        overall = "processing" if counts.get("processing") or counts.get("completed") else "pending"
+    
+    completed = [
+        {
+            "document_id": doc.id,
+            "filename": doc.filename,
+            "document_type": doc.document_type,
+            "extracted_data": doc.extracted_data
+        }
+        for doc in documents if doc.processing_status == "completed"
+    ]
+    
+    return {
+        "batch_id": batch.id,
+        "name": batch.name,
+        "status": overall,
+        "counts": counts,
+        "files": [
+            {
+                "document_id": doc.id,
+                "filename": doc.filename,
+                "document_type": doc.document_type,
+                "processing_status": doc.processing_status,
+                "pages_done": doc.pages_done or 0,
+                "pages_total": doc.pages_total,
+                "ocr_confidence": doc.ocr_confidence,
+                "error": doc.error_message
+            }
+            for doc in documents
+        ],
+        "extracted_data": case_extractor.merge_case_info(completed),
+        "created_at": batch.created_at
+    }
+
+
+@router.post("/batch-upload")
+async def batch_upload_and_extract(
+    files: List[UploadFile] = File(...),
+    document_type: str = "general",  # Default for files whose name gives no hint
+    name: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    📦 CASE BUNDLE UPLOAD - Upload a whole bundle (FIR, chargesheet, statements, notes)
+    as several files and/or ZIP archives in one request
+    
+    Files are streamed to storage and queued for OCR; at most
+    OCR_MAX_CONCURRENT_PER_USER of a user's files are processed at a time.
+    Each file's type is guessed from its name (e.g. FIR_245.pdf → fir).
+    Poll /batch/{batch_id} for per-file status and the merged case data.
+    """
+    created = []
+    try:
+        batch = DocumentBatch(user_id=current_user.id, name=name)
+        db.add(batch)
+        db.flush()
+        
+        # Copying, hashing and unzipping up to BATCH_MAX_FILES files is blocking work
+        created, skipped = await run_in_threadpool(
+            _store_batch_files, files, current_user.id, batch.id, document_type
+        )
+        db.add_all(created)
+        
+        if not created:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"message": "No supported files in the upload", "skipped": skipped}
+            )
+        
+        batch.file_count = len(created)
+        db.commit()
+        db.refresh(batch)
+        ocr_job_worker.notify()
+        
+        result = _batch_status(batch)
+        result.update({
+            "success": True,
+            "skipped": skipped,
+            "status_url": f"/api/documents/batch/{batch.id}",
+            "message": f"📦 {len(created)} files queued for extraction"
+        })
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=jsonable_encoder(result))
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        # Nothing was recorded, so don't leave the stored files behind
+        for doc in created:
+            if os.path.exists(doc.file_path):
+                os.remove(doc.file_path)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to process batch: {str(e)}"
+        )
+
+
+@router.get("/batch/{batch_id}")
+async def get_batch_status(
+    batch_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Per-file status of a bundle and the case data merged across its completed files"""
+    batch = db.query(DocumentBatch).filter(
+        DocumentBatch.id == batch_id,
+        DocumentBatch.user_id == current_user.id
+    ).first()
+    
+    if not batch:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Batch not found"
+        )
+    
+    return _batch_status(batch)
+
+
 @router.get("/uploaded/{document_id}")
 async def get_uploaded_document(
     document_id: int,
@@ -289,7 +653,11 @@ async def get_uploaded_document(
         "filename": doc.filename,
         "file_type": doc.file_type,
         "file_size": doc.file_size,
+        "content_hash": doc.content_hash,
         "processing_status": doc.processing_status,
+        "pages_done": doc.pages_done,
+        "pages_total": doc.pages_total,
+        "error": doc.error_message,
         "ocr_confidence": doc.ocr_confidence,
         "extracted_data": doc.extracted_data,
         "created_at": doc.created_at,
@@ -5,15 +5,20 @@ Legal drafts router
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
+import time
 
 from app.core.database import get_db
 from app.core.security import verify_token
-from app.models.schemas import DraftRequest, DraftResponse, DocumentEditRequest, DocumentEditResponse
+from app.models.schemas import (
+    DraftRequest, DraftResponse, DocumentEditRequest, DocumentEditResponse,
+    CitationVerificationResponse
+)
 from app.models.database_models import User, Draft
 from app.services.ai_service import legal_ai
 from app.services.citation_service import citation_service
 from app.services.case_law_service import case_law_service
 from app.services.encryption_service import encryption_service
+from app.core.metrics import metrics
 
 router = APIRouter()
 
@@ -290,6 +295,64 @@ async def get_quality_score(
         )
 
 
+@router.post("/{draft_id}/verify-citations", response_model=CitationVerificationResponse)
+async def verify_draft_citations(
+    draft_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    ✅ CITATION CHECK - Verify every citation in a draft before filing
+    
+    Finds all AIR/SCC/SCR/SCC OnLine/neutral citations in one pass and
+    resolves them in bulk against the precedent index. Each span is
+    returned with its offsets and a "verified" / "not_found" status.
+    """
+    draft = db.query(Draft).filter(
+        Draft.id == draft_id,
+        Draft.user_id == current_user.id
+    ).first()
+    
+    if not draft:
+        raise HTTPException(status_code=404, detail="Draft not found")
+    
+    try:
+        started = time.perf_counter()
+        
+        content = draft.content or ""
+        if draft.is_encrypted:
+            if not current_user.encryption_key:
+                raise HTTPException(status_code=400, detail="No encryption key found")
+            content = encryption_service.decrypt_draft_content(
+                content,
+                current_user.encryption_key,
+                draft.encryption_iv
+            )
+        
+        spans = citation_service.verify_citations_in_text(content)
+        verified = sum(1 for span in spans if span["status"] == "verified")
+        
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        metrics.observe("draft_citation_verify_ms", elapsed_ms)
+        
+        return CitationVerificationResponse(
+            draft_id=draft_id,
+            spans=spans,
+            total=len(spans),
+            verified=verified,
+            not_found=len(spans) - verified,
+            elapsed_ms=round(elapsed_ms, 2)
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error verifying citations: {str(e)}"
+        )
+
+
 @router.post("/validate-draft")
 async def validate_draft_data(
     document_type: str,
@@ -566,18 +629,22 @@ async def search_case_law(
     max_results: int = Query(10, ge=1, le=20, description="Maximum results to return"),
     court: Optional[str] = Query(None, description="Filter by court"),
     case_type: Optional[str] = Query(None, description="Filter by case type"),
+    year_from: Optional[int] = Query(None, description="Earliest judgment year"),
+    year_to: Optional[int] = Query(None, description="Latest judgment year"),
     current_user: User = Depends(get_current_user)
 ):
     """
     Search Indian case law database
-    Returns relevant cases with citations
+    Returns relevant cases with citations (local mirror first, Indian Kanoon for the rest)
     """
     try:
-        cases = case_law_service.search_cases(
+        cases = await case_law_service.search_cases(
             query=query,
             max_results=max_results,
             court=court,
-            case_type=case_type
+            case_type=case_type,
+            year_from=year_from,
+            year_to=year_to
         )
         
         return {
@@ -166,48 +166,42 @@ class AnalyticsService:
         """
         Get citation analytics - most cited judgments, trending cases
         
-        NOTE: This requires the dataset builder to be running and populating data.
-        For now, returns mock data structure.
+        Reads the citation graph and authority scores precomputed by the
+        dataset builder (see citation_graph.py); nothing is computed per request.
         """
         try:
-            # TODO: Integrate with ChromaDB to get actual citation data
-            # from vector database and judgment metadata
+            from app.services.citation_graph import get_citation_graph
+            
+            graph = get_citation_graph()
+            most_cited = graph.most_cited(limit=10)
+            
+            for case in most_cited:
+                case["importance"] = "landmark" if case["authority_score"] >= 0.5 else "precedent"
+            
+            # Trending: most citations from judgments of the last 90 days
+            since = (datetime.utcnow() - timedelta(days=90)).strftime("%Y-%m-%d")
+            recent_counts = graph.citations_since(since)
+            top_recent = max(recent_counts.values()) if recent_counts else 1
+            trending = sorted(recent_counts.items(), key=lambda item: item[1], reverse=True)[:5]
+            
+            citation_by_category = Counter()
+            for i, node in enumerate(graph.nodes):
+                info = graph.node_info.get(node, {})
+                category = info.get("case_type") or info.get("category") or "uncategorised"
+                citation_by_category[category.title()] += graph.in_degree[i]
             
-            # Mock structure for now
             return {
-                "most_cited_judgments": [
-                    {
-                        "case_name": "Kesavananda Bharati v. State of Kerala",
-                        "citation_count": 1247,
-                        "year": 1973,
-                        "importance": "landmark"
-                    },
-                    {
-                        "case_name": "Maneka Gandhi v. Union of India",
-                        "citation_count": 892,
-                        "year": 1978,
-                        "importance": "landmark"
-                    },
-                    {
-                        "case_name": "Vishaka v. State of Rajasthan",
-                        "citation_count": 645,
-                        "year": 1997,
-                        "importance": "precedent"
-                    }
-                ],
+                "most_cited_judgments": most_cited,
                 "trending_cases": [
                     {
-                        "case_name": "Recent Supreme Court Case on Privacy",
-                        "trend_score": 85,
-                        "category": "constitutional"
+                        "case_name": graph.node_info.get(node, {}).get("title") or graph.node_info.get(node, {}).get("citation") or node,
+                        "trend_score": round(100 * count / top_recent),
+                        "category": graph.node_info.get(node, {}).get("case_type")
                     }
+                    for node, count in trending
                 ],
-                "citation_by_category": {
-                    "Constitutional": 3245,
-                    "Criminal": 2156,
-                    "Civil": 1823,
-                    "Corporate": 892
-                }
+                "citation_by_category": {k: v for k, v in citation_by_category.items() if v},
+                "computed_at": graph.computed_at
             }
         
         except Exception as e:
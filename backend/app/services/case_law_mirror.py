@@ -0,0 +1,417 @@
+"""
+Local Case-Law Mirror
+SQLite FTS5 full-text index over precedents, ingested judgments and cached
+Indian Kanoon results, so case-law search works offline and in milliseconds
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from typing import List, Dict, Optional, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.database_models import Precedent
+from app.services.citation_index import tokenize
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cases (
+    id INTEGER PRIMARY KEY,
+    source_key TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    citation TEXT,
+    parallel_citations TEXT,
+    court TEXT,
+    year INTEGER,
+    case_type TEXT,
+    date TEXT,
+    url TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_cases_citation ON cases(citation);
+CREATE INDEX IF NOT EXISTS idx_cases_year ON cases(year);
+CREATE VIRTUAL TABLE IF NOT EXISTS cases_fts USING fts5(
+    title, citation, summary, body,
+    tokenize = 'porter unicode61'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS cases_vocab USING fts5vocab(cases_fts, 'row');
+"""
+
+# bm25() column weights: title, citation, summary, body
+BM25_WEIGHTS = (5.0, 3.0, 2.0, 1.0)
+
+# Terms in more than this share of cases ("court", "appeal") are dropped from
+# queries: they barely affect ranking but make bm25 score nearly every row
+MAX_DOCUMENT_FREQUENCY = 0.5
+
+
+class CaseLawMirror:
+    """
+    Offline-first case-law store
+
+    Rows live in `cases` (filterable columns) and `cases_fts` (full text,
+    same rowid). Writes go through one lock; reads use a connection per
+    thread so concurrent searches never wait on each other.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or settings.CASE_LAW_MIRROR_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        # Term -> number of cases containing it; refreshed when the mirror grows
+        self._doc_frequencies: Dict[str, int] = {}
+        self._doc_frequencies_total = 0
+        # Set when an older mirror was upgraded and its precedent rows need rewriting
+        self.needs_resync = False
+        with self._write_lock:
+            conn = self._connection()
+            conn.executescript(SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(cases)")}
+            if "parallel_citations" not in columns:
+                conn.execute("ALTER TABLE cases ADD COLUMN parallel_citations TEXT")
+                self.needs_resync = True
+            conn.commit()
+            # Kept up to date by our own writes (rows written by other processes
+            # only show up here on restart; it just sizes the common-term filter)
+            self._case_count = conn.execute("SELECT COUNT(*) FROM cases").fetchone()[0]
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM cases").fetchone()[0]
+
+    def precedent_count(self) -> int:
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM cases WHERE source_key LIKE 'precedent:%'"
+        ).fetchone()[0]
+
+    # ========== WRITES ==========
+
+    def upsert_many(self, cases: Iterable[Dict]):
+        """
+        Insert or replace cases in one transaction
+
+        Args:
+            cases: Dicts with source_key, title and optionally citation (the
+                primary one), parallel_citations, court, year, case_type, date,
+                url, summary and body (full text)
+        """
+        with self._write_lock:
+            added = 0
+            conn = self._connection()
+            with conn:
+                for case in cases:
+                    row = conn.execute("SELECT id FROM cases WHERE source_key = ?", (case["source_key"],)).fetchone()
+                    if row:
+                        conn.execute("DELETE FROM cases_fts WHERE rowid = ?", (row["id"],))
+                        conn.execute("DELETE FROM cases WHERE id = ?", (row["id"],))
+                    else:
+                        added += 1
+                    parallel = list(case.get("parallel_citations") or [])
+                    cursor = conn.execute(
+                        "INSERT INTO cases (source_key, title, citation, parallel_citations, court, year, case_type, date, url) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (case["source_key"], case["title"], case.get("citation"),
+                         json.dumps(parallel) if parallel else None, case.get("court"),
+                         case.get("year"), (case.get("case_type") or "").lower() or None,
+                         case.get("date"), case.get("url"))
+                    )
+                    # Parallel citations are searchable alongside the primary one
+                    conn.execute(
+                        "INSERT INTO cases_fts (rowid, title, citation, summary, body) VALUES (?, ?, ?, ?, ?)",
+                        (cursor.lastrowid, case["title"], " ".join(filter(None, [case.get("citation")] + parallel)),
+                         case.get("summary") or "", case.get("body") or "")
+                    )
+            self._case_count += added
+
+    def upsert(self, case: Dict):
+        self.upsert_many([case])
+
+    def remove(self, source_key: str):
+        with self._write_lock:
+            conn = self._connection()
+            with conn:
+                row = conn.execute("SELECT id FROM cases WHERE source_key = ?", (source_key,)).fetchone()
+                if row:
+                    conn.execute("DELETE FROM cases_fts WHERE rowid = ?", (row["id"],))
+                    conn.execute("DELETE FROM cases WHERE id = ?", (row["id"],))
+                    self._case_count -= 1
+
+    def sync_precedents(self, db: Session, batch_size: int = 500) -> int:
+        """Mirror every Precedent row, dropping precedents that no longer exist"""
+        with self._write_lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM cases_fts WHERE rowid IN (SELECT id FROM cases WHERE source_key LIKE 'precedent:%')")
+                removed = conn.execute("DELETE FROM cases WHERE source_key LIKE 'precedent:%'").rowcount
+            self._case_count -= removed
+            self.needs_resync = False
+
+        count = 0
+        batch = []
+        for precedent in db.query(Precedent).yield_per(batch_size):
+            batch.append(precedent_to_case(precedent))
+            if len(batch) >= batch_size:
+                self.upsert_many(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            self.upsert_many(batch)
+            count += len(batch)
+        return count
+
+    # ========== SEARCH ==========
+
+    def _document_frequencies(self, terms: List[str], total: int) -> Dict[str, int]:
+        """Cached per-term document counts (lookups on common terms are slow)"""
+        if abs(total - self._doc_frequencies_total) > 0.05 * max(self._doc_frequencies_total, 1):
+            self._doc_frequencies = {}
+            self._doc_frequencies_total = total
+        conn = self._connection()
+        for term in terms:
+            if term not in self._doc_frequencies:
+                row = conn.execute("SELECT doc FROM cases_vocab WHERE term = ?", (term,)).fetchone()
+                self._doc_frequencies[term] = row[0] if row else 0
+        return {term: self._doc_frequencies[term] for term in terms}
+
+    def _match_expressions(self, query: str) -> List[str]:
+        """
+        Free text -> FTS5 queries of quoted terms: all terms first (small
+        posting intersection, fast), then any term if that finds too little
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        total = self._case_count
+        if total > 20:
+            frequencies = self._document_frequencies(terms, total)
+            selective = [t for t in terms if frequencies[t] <= MAX_DOCUMENT_FREQUENCY * total]
+            terms = selective or terms
+
+        quoted = [f'"{term}"' for term in terms]
+        if len(quoted) == 1:
+            return quoted
+        return [" AND ".join(quoted), " OR ".join(quoted)]
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        court: Optional[str] = None,
+        case_type: Optional[str] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Ranked full-text search with filters and highlighted snippets
+
+        Returns:
+            Cases in the CaseLawService result format, source "local"
+        """
+        rows = []
+        for match in self._match_expressions(query):
+            rows = self._search_rows(match, limit, court, case_type, year_from, year_to)
+            if len(rows) >= limit:
+                break
+        if not rows:
+            return []
+
+        # bm25() is lower-is-better; scale to the 0-100 relevance used by the API results
+        best = rows[0]["rank"] or -1.0
+        return [
+            {
+                "title": row["title"],
+                "citation": row["citation"] or "",
+                "parallel_citations": json.loads(row["parallel_citations"]) if row["parallel_citations"] else [],
+                "court": row["court"] or "",
+                "date": row["date"] or (str(row["year"]) if row["year"] else ""),
+                "excerpt": row["excerpt"],
+                "url": row["url"] or "",
+                "relevance_score": round(100 * row["rank"] / best) if best else 0,
+                "source": "local"
+            }
+            for row in rows
+        ]
+
+    def _search_rows(
+        self,
+        match: str,
+        limit: int,
+        court: Optional[str],
+        case_type: Optional[str],
+        year_from: Optional[int],
+        year_to: Optional[int]
+    ) -> List[Dict]:
+        # Rank first without snippets: snippet() is by far the costliest part
+        # of the query, so it is computed afterwards for the top rows only
+        sql = [
+            f"SELECT c.id, bm25(cases_fts, {', '.join(str(w) for w in BM25_WEIGHTS)}) AS rank",
+            "FROM cases_fts JOIN cases c ON c.id = cases_fts.rowid",
+            "WHERE cases_fts MATCH ?"
+        ]
+        params: List = [match]
+        if court:
+            sql.append("AND c.court LIKE ?")
+            params.append(f"%{court}%")
+        if case_type:
+            sql.append("AND c.case_type = ?")
+            params.append(case_type.lower())
+        if year_from:
+            sql.append("AND c.year >= ?")
+            params.append(year_from)
+        if year_to:
+            sql.append("AND c.year <= ?")
+            params.append(year_to)
+        sql.append("ORDER BY rank LIMIT ?")
+        params.append(limit)
+
+        conn = self._connection()
+        ranked = conn.execute("\n".join(sql), params).fetchall()
+        if not ranked:
+            return []
+
+        ids = [row["id"] for row in ranked]
+        details = {
+            row["id"]: row for row in conn.execute(
+                "SELECT c.id, c.title, c.citation, c.parallel_citations, c.court, c.year, c.case_type, c.date, c.url, "
+                "snippet(cases_fts, -1, '<mark>', '</mark>', '...', 24) AS excerpt "
+                "FROM cases_fts JOIN cases c ON c.id = cases_fts.rowid "
+                f"WHERE cases_fts MATCH ? AND cases_fts.rowid IN ({', '.join('?' * len(ids))})",
+                [match] + ids
+            )
+        }
+        return [dict(details[row["id"]], rank=row["rank"]) for row in ranked if row["id"] in details]
+
+
+def precedent_to_case(precedent: Precedent) -> Dict:
+    """Convert a Precedent row into a mirror case"""
+    return {
+        "source_key": f"precedent:{precedent.id}",
+        "title": precedent.case_name,
+        "citation": precedent.citation,
+        "parallel_citations": list(precedent.parallel_citations or []),
+        "court": precedent.court,
+        "year": precedent.year,
+        "case_type": precedent.case_type,
+        "summary": " ".join(filter(None, [precedent.headnote, precedent.summary, " ".join(precedent.keywords or [])])),
+        "body": precedent.full_text
+    }
+
+
+def judgment_to_case(judgment_info: Dict, text: str) -> Dict:
+    """Convert an ingested judgment (dataset builder metadata + text) into a mirror case"""
+    date = judgment_info.get("date") or ""
+    return {
+        "source_key": f"judgment:{judgment_info.get('tid', 'unknown')}",
+        "title": judgment_info.get("title") or "Untitled Case",
+        "citation": judgment_info.get("citation"),
+        "court": judgment_info.get("court"),
+        "year": int(date[:4]) if date[:4].isdigit() else None,
+        "case_type": judgment_info.get("category"),
+        "date": date,
+        "url": f"https://indiankanoon.org/doc/{judgment_info['tid']}/" if judgment_info.get("tid") else None,
+        "summary": " ".join(judgment_info.get("sections") or []),
+        "body": text
+    }
+
+
+def remote_to_case(case: Dict) -> Dict:
+    """Convert an Indian Kanoon search result into a mirror case (kept for offline use)"""
+    date = case.get("date") or ""
+    return {
+        "source_key": f"kanoon:{case.get('url') or case.get('citation') or case['title']}",
+        "title": case["title"],
+        "citation": case.get("citation"),
+        "court": case.get("court"),
+        "year": int(date[:4]) if date[:4].isdigit() else None,
+        "date": date,
+        "url": case.get("url"),
+        "summary": case.get("excerpt")
+    }
+
+
+# Lazy singleton instance
+_case_law_mirror_instance = None
+_case_law_mirror_lock = threading.Lock()
+
+def get_case_law_mirror() -> CaseLawMirror:
+    """Get or create the mirror; populated from the Precedent table on first use"""
+    global _case_law_mirror_instance
+    if _case_law_mirror_instance is None:
+        with _case_law_mirror_lock:
+            if _case_law_mirror_instance is None:
+                mirror = CaseLawMirror()
+                db = SessionLocal()
+                try:
+                    # Full resync only when rows were added/removed while the app was down
+                    # (or the mirror predates a schema change)
+                    if mirror.needs_resync or mirror.precedent_count() != db.query(Precedent).count():
+                        mirror.sync_precedents(db)
+                finally:
+                    db.close()
+                _case_law_mirror_instance = mirror
+    return _case_law_mirror_instance
+
+
+# ========== INCREMENTAL UPDATES ==========
+# Same pattern as the citation index: queue at flush, apply after commit
+
+_PENDING_KEY = "case_law_mirror_changes"
+
+
+def _queue_change(target: Precedent, case: Optional[Dict]):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, []).append((f"precedent:{target.id}", case))
+
+
+@event.listens_for(Precedent, "after_insert")
+@event.listens_for(Precedent, "after_update")
+def _on_precedent_saved(mapper, connection, target):
+    _queue_change(target, precedent_to_case(target))
+
+
+@event.listens_for(Precedent, "after_delete")
+def _on_precedent_deleted(mapper, connection, target):
+    _queue_change(target, None)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending_changes(session):
+    changes = session.info.pop(_PENDING_KEY, None)
+    if not changes or _case_law_mirror_instance is None:
+        return
+
+    for source_key, case in changes:
+        if case is None:
+            _case_law_mirror_instance.remove(source_key)
+        else:
+            _case_law_mirror_instance.upsert(case)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_changes(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
+
+
+# Standalone execution: (re)build the mirror from the database
+if __name__ == "__main__":
+    mirror = CaseLawMirror()
+    db = SessionLocal()
+    try:
+        print(f"Mirrored {mirror.sync_precedents(db)} precedents into {mirror.path} ({len(mirror)} cases total)")
+    finally:
+        db.close()
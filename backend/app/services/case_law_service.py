@@ -1,61 +1,128 @@
 """
 Case Law Research Service
-Integrates with Indian Kanoon API for legal case search
+Searches the local case-law mirror first; Indian Kanoon API fills the gaps
 """
 
-import requests
+import time
 from typing import List, Dict, Optional
 from app.core.config import settings
+from app.core.http_client import http_client
+from app.core.metrics import metrics
+from app.core.rate_limiter import INTERACTIVE, BATCH
+from app.core.swr_cache import SWRCache, SQLiteCacheStore
+from app.services.case_law_mirror import get_case_law_mirror, remote_to_case
 
 class CaseLawService:
     """Service for searching Indian case law"""
     
+    # Results fetched per API call regardless of max_results, so one cache entry serves every page size
+    REMOTE_PAGE_SIZE = 20
+    
     def __init__(self):
-        self.base_url = "https://api.indiankanoon.org/search/"
-        # Indian Kanoon API key (requires registration at https://api.indiankanoon.org)
-        # For demo purposes, using free tier endpoint
+        # Indian Kanoon API token (requires registration at https://api.indiankanoon.org)
+        # Without a token, only the local mirror is searched (mock data if it is empty)
+        self.base_url = settings.INDIAN_KANOON_API_URL.rstrip("/")
+        self.api_token = settings.INDIAN_KANOON_API_TOKEN
+        
+        # API results keyed by _build_search_query (stale-while-revalidate)
+        store = None
+        if settings.CASE_LAW_CACHE_PATH:
+            store = SQLiteCacheStore(settings.CASE_LAW_CACHE_PATH, table="case_law_results")
+            store.purge(time.time() - settings.CASE_LAW_CACHE_TTL_SECONDS - settings.CASE_LAW_CACHE_STALE_SECONDS)
+        self.remote_cache = SWRCache(
+            "case_law_cache",
+            ttl_seconds=settings.CASE_LAW_CACHE_TTL_SECONDS,
+            stale_seconds=settings.CASE_LAW_CACHE_STALE_SECONDS,
+            max_entries=settings.CASE_LAW_CACHE_MAX_ENTRIES,
+            store=store
+        )
         
-    def search_cases(
+    async def search_cases(
         self,
         query: str,
         max_results: int = 10,
         court: Optional[str] = None,
-        case_type: Optional[str] = None
+        case_type: Optional[str] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None
     ) -> List[Dict]:
         """
         Search for relevant case law
         
+        The local mirror (precedents, ingested judgments and earlier API
+        results) answers first; the Indian Kanoon API is only called when it
+        has fewer than max_results matches, and an API outage just means
+        local results are returned.
+        
         Args:
             query: Search query (facts, legal provisions, etc.)
             max_results: Maximum number of results to return
             court: Filter by court (Supreme Court, High Court, etc.)
             case_type: Filter by case type (civil, criminal, etc.)
+            year_from: Earliest judgment year
+            year_to: Latest judgment year
             
         Returns:
             List of case law results with citations
         """
+        cases = []
         try:
-            # Build search query
-            search_query = self._build_search_query(query, court, case_type)
-            
-            # Call Indian Kanoon API
-            # Note: This is a simplified version. In production, you'd need proper API authentication
-            params = {
-                'formInput': search_query,
-                'pagenum': 0
-            }
-            
-            # For demo: Return mock data (replace with actual API call in production)
-            return self._get_mock_cases(query, max_results, court)
-            
-            # Actual API call (uncomment when API key is available):
-            # response = requests.get(self.base_url, params=params, timeout=10)
-            # response.raise_for_status()
-            # return self._parse_response(response.json(), max_results)
-            
+            cases = get_case_law_mirror().search(
+                query, limit=max_results, court=court, case_type=case_type,
+                year_from=year_from, year_to=year_to
+            )
+        except Exception as e:
+            print(f"Local case law search error: {str(e)}")
+        
+        if len(cases) >= max_results:
+            metrics.increment("case_law_local_only")
+            return cases
+        
+        # For demo: Return mock data until an API token is configured
+        if not self.api_token:
+            return cases or self._get_mock_cases(query, max_results, court)
+        
+        search_query = self._build_search_query(query, court, case_type)
+        try:
+            remote = await self.remote_cache.get_or_fetch(
+                search_query,
+                lambda: self._fetch_remote(search_query),
+                refresher=lambda: self._fetch_remote(search_query, priority=BATCH)
+            )
         except Exception as e:
             print(f"Case law search error: {str(e)}")
-            return []
+            metrics.increment("case_law_remote_failures")
+            return cases
+        
+        # Fill the gaps in local results
+        seen = {case["citation"] or case["url"] or case["title"] for case in cases}
+        for case in remote:
+            key = case["citation"] or case["url"] or case["title"]
+            if key not in seen and len(cases) < max_results:
+                seen.add(key)
+                cases.append({**case, "source": "indian_kanoon"})
+        return cases
+    
+    async def _search_remote(self, search_query: str, max_results: int, priority: str = INTERACTIVE) -> List[Dict]:
+        """Indian Kanoon API search over the shared pooled (and rate-limited) client"""
+        response = await http_client.post(
+            f"{self.base_url}/search/",
+            priority=priority,
+            params={'formInput': search_query, 'pagenum': 0},
+            headers={'Authorization': f"Token {self.api_token}", 'Accept': 'application/json'}
+        )
+        response.raise_for_status()
+        return self._parse_response(response.json(), max_results)
+    
+    async def _fetch_remote(self, search_query: str, priority: str = INTERACTIVE) -> List[Dict]:
+        """Upstream call behind the cache; results are also kept in the local mirror"""
+        remote = await self._search_remote(search_query, self.REMOTE_PAGE_SIZE, priority)
+        if remote:
+            try:
+                get_case_law_mirror().upsert_many(remote_to_case(case) for case in remote)
+            except Exception as e:
+                print(f"Case law mirror update error: {str(e)}")
+        return remote
     
     def _build_search_query(
         self,
@@ -82,10 +149,10 @@ class CaseLawService:
             cases.append({
                 'title': doc.get('title', 'Untitled Case'),
                 'citation': doc.get('citation', ''),
-                'court': doc.get('court', ''),
-                'date': doc.get('date', ''),
-                'excerpt': doc.get('headline', '')[:200] + '...',
-                'url': doc.get('link', ''),
+                'court': doc.get('court') or doc.get('docsource', ''),
+                'date': doc.get('date') or doc.get('publishdate', ''),
+                'excerpt': (doc.get('headline') or '')[:200] + '...',
+                'url': doc.get('link') or (f"https://indiankanoon.org/doc/{doc['tid']}/" if doc.get('tid') else ''),
                 'relevance_score': doc.get('score', 0)
             })
         
@@ -0,0 +1,201 @@
+"""
+Passage Chunking Service
+Splits full judgments into overlapping, paragraph-aligned passages for semantic indexing
+"""
+
+import re
+from typing import List, Dict, Tuple, Optional
+from app.core.config import settings
+
+
+class JudgmentChunker:
+    """Split long judgment texts into passages that fit the embedding model window"""
+
+    # Blank lines separate paragraphs in text extracted by PyMuPDF
+    PARAGRAPH_SPLIT = re.compile(r"\n\s*\n")
+    SENTENCE_END = re.compile(r"(?<=[.;:?!])\s+")
+
+    def __init__(
+        self,
+        max_chars: Optional[int] = None,
+        overlap_chars: Optional[int] = None
+    ):
+        self.max_chars = max_chars or settings.PASSAGE_MAX_CHARS
+        self.overlap_chars = overlap_chars if overlap_chars is not None else settings.PASSAGE_OVERLAP_CHARS
+
+    def _split_paragraphs(self, text: str) -> List[Tuple[int, int]]:
+        """Return (start, end) offsets of non-empty paragraphs"""
+        spans = []
+        position = 0
+
+        for match in self.PARAGRAPH_SPLIT.finditer(text):
+            spans.append((position, match.start()))
+            position = match.end()
+        spans.append((position, len(text)))
+
+        paragraphs = []
+        for start, end in spans:
+            # Trim surrounding whitespace while keeping offsets into the original text
+            while start < end and text[start].isspace():
+                start += 1
+            while end > start and text[end - 1].isspace():
+                end -= 1
+            if end > start:
+                paragraphs.extend(self._split_long_paragraph(text, start, end))
+
+        return paragraphs
+
+    def _split_long_paragraph(self, text: str, start: int, end: int) -> List[Tuple[int, int]]:
+        """Break a paragraph longer than max_chars at sentence (or word) boundaries"""
+        pieces = []
+        piece_start = start
+        # Leave room for the overlap carried in front of each piece
+        piece_chars = max(self.max_chars - self.overlap_chars, self.max_chars // 2)
+
+        while end - piece_start > self.max_chars:
+            limit = piece_start + piece_chars
+            cut, resume = None, None
+
+            # Prefer the last sentence boundary inside the window
+            for match in self.SENTENCE_END.finditer(text, piece_start, limit):
+                cut, resume = match.start(), match.end()
+
+            # OCR text often has no punctuation - fall back to a word boundary
+            if cut is None or cut <= piece_start:
+                cut = text.rfind(" ", piece_start, limit)
+                if cut <= piece_start:
+                    cut = limit
+                resume = cut
+
+            pieces.append((piece_start, cut))
+            piece_start = resume
+            while piece_start < end and text[piece_start].isspace():
+                piece_start += 1
+
+        if end > piece_start:
+            pieces.append((piece_start, end))
+
+        return pieces
+
+    def chunk(self, text: str) -> List[Dict]:
+        """
+        Chunk judgment text into overlapping passages
+
+        Args:
+            text: Full judgment text
+
+        Returns:
+            List of passages with index, text and character offsets
+        """
+        if not text or not text.strip():
+            return []
+
+        paragraphs = self._split_paragraphs(text)
+        passages = []
+        first = 0
+        start_char = paragraphs[0][0]
+
+        while first < len(paragraphs):
+            # Greedily pack whole paragraphs up to max_chars
+            last = first
+            while (
+                last + 1 < len(paragraphs)
+                and paragraphs[last + 1][1] - start_char <= self.max_chars
+            ):
+                last += 1
+
+            end_char = paragraphs[last][1]
+            passages.append({
+                "passage_index": len(passages),
+                "text": text[start_char:end_char],
+                "start_char": start_char,
+                "end_char": end_char
+            })
+
+            if last + 1 >= len(paragraphs):
+                break
+
+            # The next passage starts at the overlap, then continues with new paragraphs
+            start_char = self._overlap_start(text, paragraphs, first, last, start_char)
+            first = last + 1
+
+        return passages
+
+    def _overlap_start(
+        self,
+        text: str,
+        paragraphs: List[Tuple[int, int]],
+        first: int,
+        last: int,
+        passage_start: int
+    ) -> int:
+        """
+        Where the passage after paragraphs[first..last] begins: up to
+        overlap_chars of the passage's tail, as whole trailing paragraphs
+        when they fit, else the last sentences (or words) of the final one
+        """
+        next_start, next_end = paragraphs[last + 1]
+        end_char = paragraphs[last][1]
+        # Never carry the whole passage over, and leave room for the next paragraph
+        earliest = max(end_char - self.overlap_chars, next_end - self.max_chars, passage_start + 1)
+        if earliest >= end_char:
+            return next_start
+
+        overlap_first = last + 1
+        while overlap_first - 1 > first and paragraphs[overlap_first - 1][0] >= earliest:
+            overlap_first -= 1
+        if overlap_first <= last:
+            return paragraphs[overlap_first][0]
+
+        # Judgment paragraphs rarely fit the budget: take a tail of the last one
+        sentence = self.SENTENCE_END.search(text, earliest, end_char)
+        if sentence and sentence.end() < end_char:
+            return sentence.end()
+        space = text.find(" ", earliest, end_char)
+        tail_start = space + 1 if space != -1 else earliest
+        while tail_start < end_char and text[tail_start].isspace():
+            tail_start += 1
+        return tail_start if tail_start < end_char else next_start
+
+
+def aggregate_passage_scores(
+    passage_hits: List[Dict],
+    method: Optional[str] = None,
+    top_n: Optional[int] = None
+) -> List[Dict]:
+    """
+    Aggregate passage-level similarity scores into judgment-level scores
+
+    Args:
+        passage_hits: Dicts with judgment_id, score and optional passage/metadata fields
+        method: "max" (best passage) or "sum_top_n" (sum of the n best passages)
+        top_n: Number of passages summed for "sum_top_n"
+
+    Returns:
+        Judgments sorted by aggregated score, each with its best passage
+    """
+    method = method or settings.PASSAGE_SCORE_AGGREGATION
+    top_n = top_n or settings.PASSAGE_SCORE_TOP_N
+
+    grouped: Dict[str, List[Dict]] = {}
+    for hit in passage_hits:
+        grouped.setdefault(hit["judgment_id"], []).append(hit)
+
+    judgments = []
+    for judgment_id, hits in grouped.items():
+        hits.sort(key=lambda h: h["score"], reverse=True)
+
+        if method == "sum_top_n":
+            score = sum(h["score"] for h in hits[:top_n])
+        else:
+            score = hits[0]["score"]
+
+        judgments.append({
+            "judgment_id": judgment_id,
+            "score": score,
+            "best_passage": hits[0],
+            "matched_passages": len(hits)
+        })
+
+    judgments.sort(key=lambda j: j["score"], reverse=True)
+    return judgments
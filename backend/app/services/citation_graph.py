@@ -0,0 +1,308 @@
+"""
+Citation Graph Service
+Builds a judgment citation graph from ingested texts and precomputes
+in-degree and PageRank-style authority scores (offline job)
+"""
+
+import json
+import os
+import sys
+import threading
+from array import array
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple
+
+from app.services.citation_normalizer import find_citations, citation_keys
+
+GRAPH_PATH = "data/metadata/citation_graph.json"
+
+
+class CitationGraph:
+    """
+    Directed citation graph: judgment -> precedents it cites
+
+    Raw edges are kept per citing judgment so new judgments can be added
+    incrementally. `recompute()` freezes them into compact CSR arrays
+    (indptr/indices) and computes in-degree and PageRank authority, warm
+    started from the previous scores so incremental updates converge fast.
+    """
+
+    DAMPING = 0.85
+    TOLERANCE = 1e-8
+    MAX_ITERATIONS = 100
+
+    def __init__(self, path: str = GRAPH_PATH):
+        self.path = path
+        self._lock = threading.RLock()
+
+        # Incremental state: citing node -> cited nodes, plus node details
+        self.edges: Dict[str, List[str]] = {}
+        self.node_info: Dict[str, Dict] = {}
+
+        # Precomputed (CSR) state
+        self.nodes: List[str] = []
+        self.node_index: Dict[str, int] = {}
+        self.indptr = array("l", [0])
+        self.indices = array("l")
+        self.in_degree = array("l")
+        self.authority = array("d")
+        self.top_authority = 0.0
+        self.computed_at: Optional[str] = None
+        self._loaded_mtime = 0.0
+
+    # ========== BUILDING ==========
+
+    @staticmethod
+    def node_id(citation: Optional[str], fallback: str) -> str:
+        """Node id: canonical key of the primary citation, else a fallback id"""
+        keys = citation_keys(citation)
+        return keys[0] if keys else fallback
+
+    def add_judgment(self, judgment_info: Dict, text: str, resolver=None) -> str:
+        """
+        Add (or replace) one judgment's outgoing citations
+
+        Args:
+            judgment_info: Judgment metadata (tid, title, citation, date, category)
+            text: Full judgment text (output of extract_text_from_pdf)
+            resolver: Optional callable mapping canonical keys to index records,
+                so parallel citations of one precedent collapse into one node
+
+        Returns:
+            The judgment's node id
+        """
+        source = self.node_id(judgment_info.get("citation"), f"judgment:{judgment_info.get('tid', 'unknown')}")
+        spans = find_citations(text)
+        resolved = resolver({s["key"] for s in spans}) if resolver else {}
+
+        targets = []
+        seen = set()
+        target_info = {}  # node -> metadata learned from this judgment, merged under the lock
+        for span in spans:
+            record = resolved.get(span["key"])
+            target = self.node_id(record["citation"], span["key"]) if record else span["key"]
+            if target == source or target in seen:
+                continue
+            seen.add(target)
+            targets.append(target)
+            info = target_info[target] = {"citation": record["citation"] if record else span["text"]}
+            if record:
+                info.update({
+                    "title": record.get("title"),
+                    "year": record.get("year"),
+                    "case_type": record.get("case_type")
+                })
+
+        date = judgment_info.get("date") or ""
+        with self._lock:
+            for target, info in target_info.items():
+                if target in self.node_info:
+                    # Keep the known citation; only resolved metadata refreshes it
+                    info.pop("citation")
+                self.node_info.setdefault(target, {}).update(info)
+            self.edges[source] = targets
+            self.node_info.setdefault(source, {}).update({
+                "title": judgment_info.get("title"),
+                "citation": judgment_info.get("citation"),
+                "year": int(date[:4]) if date[:4].isdigit() else None,
+                "date": judgment_info.get("date"),
+                "category": judgment_info.get("category")
+            })
+
+        return source
+
+    def recompute(self):
+        """Freeze edges into CSR arrays and compute in-degree and authority"""
+        with self._lock:
+            previous = {node: self.authority[i] for i, node in enumerate(self.nodes)} if self.authority else {}
+
+            nodes = sorted(set(self.edges) | {t for targets in self.edges.values() for t in targets})
+            node_index = {node: i for i, node in enumerate(nodes)}
+            n = len(nodes)
+
+            indptr = array("l", [0] * (n + 1))
+            indices = array("l")
+            in_degree = array("l", [0] * n)
+            for i, node in enumerate(nodes):
+                for target in self.edges.get(node, ()):
+                    j = node_index[target]
+                    indices.append(j)
+                    in_degree[j] += 1
+                indptr[i + 1] = len(indices)
+
+            self.nodes, self.node_index = nodes, node_index
+            self.indptr, self.indices, self.in_degree = indptr, indices, in_degree
+            self.authority = self._pagerank(previous)
+            self.top_authority = max(self.authority) if self.authority else 0.0
+            self.computed_at = datetime.utcnow().isoformat()
+
+    def _pagerank(self, warm_start: Dict[str, float]) -> array:
+        """Power iteration over the CSR arrays (dangling mass spread uniformly)"""
+        n = len(self.nodes)
+        if n == 0:
+            return array("d")
+
+        rank = array("d", (warm_start.get(node, 1.0 / n) for node in self.nodes))
+        total = sum(rank)
+        rank = array("d", (r / total for r in rank))
+        base = (1.0 - self.DAMPING) / n
+
+        for _ in range(self.MAX_ITERATIONS):
+            next_rank = array("d", [0.0] * n)
+            dangling = 0.0
+            for i in range(n):
+                start, end = self.indptr[i], self.indptr[i + 1]
+                if start == end:
+                    dangling += rank[i]
+                    continue
+                share = rank[i] / (end - start)
+                for k in range(start, end):
+                    next_rank[self.indices[k]] += share
+
+            spread = base + self.DAMPING * dangling / n
+            delta = 0.0
+            for i in range(n):
+                value = spread + self.DAMPING * next_rank[i]
+                delta += abs(value - rank[i])
+                next_rank[i] = value
+            rank = next_rank
+            if delta < self.TOLERANCE:
+                break
+
+        return rank
+
+    # ========== QUERIES ==========
+
+    def authority_score(self, citation: Optional[str]) -> float:
+        """
+        Authority of a precedent, normalised so the top node scores 1.0
+
+        A plain lookup, cheap enough to call per search candidate; callers
+        check for a newer graph file once (reload_if_changed) beforehand.
+        """
+        index = self.node_index.get(self.node_id(citation, ""))
+        if index is None or not self.top_authority:
+            return 0.0
+        return self.authority[index] / self.top_authority
+
+    def most_cited(self, limit: int = 10) -> List[Dict]:
+        """Nodes ordered by in-degree, with authority"""
+        self.reload_if_changed()
+        top_authority = self.top_authority or 1.0
+        ranked = sorted(range(len(self.nodes)), key=lambda i: (self.in_degree[i], self.authority[i]), reverse=True)
+        results = []
+        for i in ranked[:limit]:
+            if self.in_degree[i] == 0:
+                break
+            info = self.node_info.get(self.nodes[i], {})
+            results.append({
+                "node": self.nodes[i],
+                "case_name": info.get("title") or info.get("citation") or self.nodes[i],
+                "citation": info.get("citation"),
+                "citation_count": self.in_degree[i],
+                "authority_score": round(self.authority[i] / top_authority, 4),
+                "year": info.get("year"),
+                "case_type": info.get("case_type")
+            })
+        return results
+
+    def citations_since(self, since_date: str) -> Dict[str, int]:
+        """In-degree counted only from judgments dated on/after since_date"""
+        counts: Dict[str, int] = {}
+        for source, targets in self.edges.items():
+            if (self.node_info.get(source, {}).get("date") or "") >= since_date:
+                for target in targets:
+                    counts[target] = counts.get(target, 0) + 1
+        return counts
+
+    # ========== PERSISTENCE ==========
+
+    def save(self):
+        """Atomically write the graph and precomputed scores"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._lock:
+            payload = {
+                "computed_at": self.computed_at,
+                "edges": self.edges,
+                "node_info": self.node_info,
+                "nodes": self.nodes,
+                "indptr": self.indptr.tolist(),
+                "indices": self.indices.tolist(),
+                "in_degree": self.in_degree.tolist(),
+                "authority": self.authority.tolist()
+            }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, self.path)
+        self._loaded_mtime = os.stat(self.path).st_mtime
+
+    def load(self) -> bool:
+        """Load a previously saved graph; False if none exists"""
+        try:
+            mtime = os.stat(self.path).st_mtime
+            with open(self.path, "r") as f:
+                payload = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+
+        with self._lock:
+            self.edges = payload.get("edges", {})
+            self.node_info = payload.get("node_info", {})
+            self.nodes = payload.get("nodes", [])
+            self.node_index = {node: i for i, node in enumerate(self.nodes)}
+            self.indptr = array("l", payload.get("indptr", [0]))
+            self.indices = array("l", payload.get("indices", []))
+            self.in_degree = array("l", payload.get("in_degree", []))
+            self.authority = array("d", payload.get("authority", []))
+            self.top_authority = max(self.authority) if self.authority else 0.0
+            self.computed_at = payload.get("computed_at")
+            self._loaded_mtime = mtime
+        return True
+
+    def reload_if_changed(self):
+        """Pick up scores written by the offline job"""
+        try:
+            if os.stat(self.path).st_mtime != self._loaded_mtime:
+                self.load()
+        except FileNotFoundError:
+            pass
+
+
+# Lazy singleton instance
+_citation_graph_instance = None
+
+def get_citation_graph() -> CitationGraph:
+    """Get or create the citation graph singleton (loaded from disk)"""
+    global _citation_graph_instance
+    if _citation_graph_instance is None:
+        _citation_graph_instance = CitationGraph()
+        _citation_graph_instance.load()
+    return _citation_graph_instance
+
+
+def resolve_with_citation_index(keys) -> Dict[str, Optional[Dict]]:
+    """Resolver for add_judgment backed by the precedent citation index"""
+    from app.services.citation_index import citation_index, init_citation_index
+    if not citation_index.loaded:
+        init_citation_index()
+    return citation_index.resolve_keys(keys)
+
+
+# Standalone execution: offline rebuild from downloaded judgments
+if __name__ == "__main__":
+    from app.services.dataset_builder import LegalDatasetBuilder
+
+    builder = LegalDatasetBuilder()
+    graph = CitationGraph()
+    graph.load()
+
+    if "--rescan" in sys.argv:
+        for filename in sorted(os.listdir(builder.data_dir)):
+            if filename.endswith(".pdf"):
+                text = builder.extract_text_from_pdf(os.path.join(builder.data_dir, filename))
+                graph.add_judgment({"tid": filename.split("_")[0]}, text, resolver=resolve_with_citation_index)
+
+    graph.recompute()
+    graph.save()
+    print(f"Citation graph: {len(graph.nodes)} nodes, {len(graph.indices)} edges")
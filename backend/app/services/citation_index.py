@@ -0,0 +1,358 @@
+"""
+Citation Inverted Index
+In-memory BM25 index over precedent titles, keywords and summaries,
+loaded at startup and kept in sync with the Precedent table
+"""
+
+import math
+import re
+import threading
+import heapq
+from typing import List, Dict, Optional, Tuple, Iterable, Union
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.core.database import SessionLocal
+from app.models.database_models import Precedent
+from app.services.citation_normalizer import normalize_citation, citation_keys
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+    "of", "on", "or", "that", "the", "to", "v", "vs", "was", "with"
+}
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase alphanumeric tokens without stopwords"""
+    if not text:
+        return []
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def precedent_to_record(precedent: Precedent) -> Dict:
+    """Convert a Precedent row into an index record"""
+    return {
+        "precedent_id": precedent.id,
+        "title": precedent.case_name,
+        "citation": precedent.citation,
+        "parallel_citations": list(precedent.parallel_citations or []),
+        "court": precedent.court,
+        "year": precedent.year,
+        "summary": precedent.summary or precedent.headnote,
+        "keywords": list(precedent.keywords or []),
+        "sections": list(precedent.sections_cited or []),
+        "case_type": precedent.case_type
+    }
+
+
+class CitationIndex:
+    """
+    BM25F-style inverted index
+
+    Query cost depends only on the postings of the query terms, so latency
+    stays flat as the corpus grows. Terms present in most documents carry
+    almost no BM25 weight and are skipped outright.
+    """
+
+    FIELD_WEIGHTS = {"title": 2.0, "keywords": 1.5, "sections": 1.5, "summary": 1.0}
+    K1 = 1.2
+    B = 0.75
+    MAX_DOCUMENT_FREQUENCY = 0.5
+
+    def __init__(self):
+        self._records: Dict[str, Dict] = {}
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._doc_terms: Dict[str, Dict[str, float]] = {}
+        self._doc_lengths: Dict[str, float] = {}
+        self._by_citation: Dict[str, str] = {}
+        # Canonical citation key -> record key (parallel citations share a record)
+        self._by_canonical: Dict[str, str] = {}
+        self._total_length = 0.0
+        self._lock = threading.RLock()
+        self.loaded = False
+        # True while the built-in sample records stand in for an empty table
+        self.samples_loaded = False
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def _weighted_terms(self, record: Dict) -> Dict[str, float]:
+        """Field-weighted term frequencies for one record"""
+        terms: Dict[str, float] = {}
+        fields = {
+            "title": tokenize(record.get("title")),
+            "keywords": [t for k in record.get("keywords") or [] for t in tokenize(k)],
+            "sections": [t for k in record.get("sections") or [] for t in tokenize(k)],
+            "summary": tokenize(record.get("summary"))
+        }
+        for field, tokens in fields.items():
+            weight = self.FIELD_WEIGHTS[field]
+            for token in tokens:
+                terms[token] = terms.get(token, 0.0) + weight
+        return terms
+
+    def _remove_locked(self, key: str):
+        terms = self._doc_terms.pop(key, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(key, 0.0)
+        record = self._records.pop(key)
+        if self._by_citation.get(record.get("citation")) == key:
+            del self._by_citation[record["citation"]]
+        for canonical in self._canonical_keys(record):
+            if self._by_canonical.get(canonical) == key:
+                del self._by_canonical[canonical]
+
+    @staticmethod
+    def _canonical_keys(record: Dict) -> List[str]:
+        """Canonical keys for a record's citation and its parallel citations"""
+        keys = citation_keys(record.get("citation"))
+        for parallel in record.get("parallel_citations") or []:
+            keys.extend(citation_keys(parallel))
+        return keys
+
+    def upsert(self, key: str, record: Dict):
+        """Add or replace one record"""
+        with self._lock:
+            self._remove_locked(key)
+            terms = self._weighted_terms(record)
+            for term, tf in terms.items():
+                self._postings.setdefault(term, {})[key] = tf
+            self._records[key] = record
+            self._doc_terms[key] = terms
+            self._doc_lengths[key] = sum(terms.values())
+            self._total_length += self._doc_lengths[key]
+            if record.get("citation"):
+                self._by_citation[record["citation"]] = key
+            for canonical in self._canonical_keys(record):
+                self._by_canonical[canonical] = key
+            self.version += 1
+
+    def remove(self, key: str):
+        """Remove one record"""
+        with self._lock:
+            if key in self._records:
+                self._remove_locked(key)
+                self.version += 1
+
+    def remove_prefix(self, prefix: str) -> int:
+        """Remove every record whose key starts with prefix; returns how many"""
+        with self._lock:
+            keys = [k for k in self._records if k.startswith(prefix)]
+            for key in keys:
+                self._remove_locked(key)
+            if keys:
+                self.version += 1
+            return len(keys)
+
+    def load(self, records: Iterable[Tuple[str, Dict]]):
+        """Replace the index contents with the given (key, record) pairs"""
+        with self._lock:
+            self._records.clear()
+            self._postings.clear()
+            self._doc_terms.clear()
+            self._doc_lengths.clear()
+            self._by_citation.clear()
+            self._by_canonical.clear()
+            self._total_length = 0.0
+            for key, record in records:
+                self.upsert(key, record)
+            self.loaded = True
+            self.version += 1
+
+    def load_from_db(self, db: Session, fallback: Optional[List[Dict]] = None) -> int:
+        """
+        Build the index from the Precedent table
+
+        Args:
+            db: Database session
+            fallback: Records indexed when the table is empty (built-in samples)
+
+        Returns:
+            Number of indexed records
+        """
+        rows = db.query(Precedent).yield_per(1000)
+        records = [(f"precedent:{p.id}", precedent_to_record(p)) for p in rows]
+
+        use_samples = not records and bool(fallback)
+        if use_samples:
+            records = [(f"sample:{i}", dict(r)) for i, r in enumerate(fallback)]
+
+        self.load(records)
+        self.samples_loaded = use_samples
+        return len(records)
+
+    def keywords(self) -> List[str]:
+        """Distinct keyword phrases across all records"""
+        with self._lock:
+            return sorted({k.lower() for r in self._records.values() for k in r.get("keywords") or []})
+
+    def get(self, key: str) -> Optional[Dict]:
+        return self._records.get(key)
+
+    def find_by_citation(self, citation: str) -> Optional[Dict]:
+        """Exact citation string lookup"""
+        key = self._by_citation.get(citation)
+        return self._records.get(key) if key else None
+
+    def resolve(self, reference: str) -> Optional[Dict]:
+        """
+        Resolve any spelling of a citation (or a parallel citation) in O(1)
+
+        "A.I.R. 1973 S.C. 1461" and "(1973) 4 SCC 225" both resolve to
+        Kesavananda Bharati.
+        """
+        canonical = normalize_citation(reference)
+        key = self._by_canonical.get(canonical) if canonical else None
+        if key is None:
+            key = self._by_citation.get(reference.strip())
+        return self._records.get(key) if key else None
+
+    def resolve_keys(self, canonical_keys: Iterable[str]) -> Dict[str, Optional[Dict]]:
+        """Bulk lookup of already-normalised canonical keys"""
+        with self._lock:
+            result = {}
+            for canonical in canonical_keys:
+                key = self._by_canonical.get(canonical)
+                result[canonical] = self._records.get(key) if key else None
+            return result
+
+    def resolve_many(self, references: Iterable[str]) -> Dict[str, Optional[Dict]]:
+        """Resolve many references at once (duplicates are normalised once)"""
+        result = {}
+        for reference in references:
+            if reference not in result:
+                result[reference] = self.resolve(reference)
+        return result
+
+    def search(
+        self,
+        query: Union[str, Dict[str, float]],
+        limit: int = 5,
+        case_type: Optional[str] = None
+    ) -> List[Tuple[Dict, float]]:
+        """
+        Rank records for a query
+
+        Args:
+            query: Query text, or {term: weight} for weighted queries
+            limit: Maximum number of results
+            case_type: Drop records whose case_type is set and differs
+
+        Returns:
+            (record, relevance) pairs, relevance normalised to 0-1
+        """
+        if isinstance(query, str):
+            query_terms: Dict[str, float] = {}
+            for token in tokenize(query):
+                query_terms[token] = query_terms.get(token, 0.0) + 1.0
+        else:
+            query_terms = {}
+            for phrase, weight in query.items():
+                for token in tokenize(phrase):
+                    query_terms[token] = query_terms.get(token, 0.0) + weight
+
+        with self._lock:
+            total_docs = len(self._records)
+            if not total_docs or not query_terms:
+                return []
+
+            avg_length = self._total_length / total_docs
+            scores: Dict[str, float] = {}
+            max_score = 0.0
+
+            for term, query_weight in query_terms.items():
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                df = len(postings)
+                if total_docs > 20 and df / total_docs > self.MAX_DOCUMENT_FREQUENCY:
+                    continue
+
+                idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+                max_score += query_weight * idf * (self.K1 + 1)
+
+                for key, tf in postings.items():
+                    norm = self.K1 * (1 - self.B + self.B * self._doc_lengths[key] / avg_length)
+                    scores[key] = scores.get(key, 0.0) + query_weight * idf * tf * (self.K1 + 1) / (tf + norm)
+
+            if case_type:
+                scores = {
+                    key: score for key, score in scores.items()
+                    if not self._records[key].get("case_type") or self._records[key]["case_type"] == case_type
+                }
+
+            top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            return [(self._records[key], min(score / max_score, 1.0)) for key, score in top]
+
+
+# Singleton instance
+citation_index = CitationIndex()
+
+
+def init_citation_index(fallback: Optional[List[Dict]] = None) -> int:
+    """Load the citation index from the database (called at startup)"""
+    db = SessionLocal()
+    try:
+        return citation_index.load_from_db(db, fallback=fallback)
+    finally:
+        db.close()
+
+
+# ========== INCREMENTAL UPDATES ==========
+# Row changes are captured at flush time and applied only after the
+# transaction commits, so rolled-back changes never reach the index.
+# Only this process's sessions are seen: precedents written by other
+# processes (e.g. an offline import) appear after the next restart.
+
+_PENDING_KEY = "citation_index_changes"
+
+
+def _queue_change(target: Precedent, record: Optional[Dict]):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, []).append((f"precedent:{target.id}", record))
+
+
+@event.listens_for(Precedent, "after_insert")
+@event.listens_for(Precedent, "after_update")
+def _on_precedent_saved(mapper, connection, target):
+    _queue_change(target, precedent_to_record(target))
+
+
+@event.listens_for(Precedent, "after_delete")
+def _on_precedent_deleted(mapper, connection, target):
+    _queue_change(target, None)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending_changes(session):
+    changes = session.info.pop(_PENDING_KEY, None)
+    if not changes or not citation_index.loaded:
+        return
+
+    # The first real precedent replaces the built-in sample records
+    if citation_index.samples_loaded:
+        citation_index.remove_prefix("sample:")
+        citation_index.samples_loaded = False
+
+    for key, record in changes:
+        if record is None:
+            citation_index.remove(key)
+        else:
+            citation_index.upsert(key, record)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_changes(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,116 @@
+"""
+Citation Normalizer
+Parses Indian law report citations (AIR, SCC, SCR, SCC OnLine, neutral) into canonical keys
+"""
+
+import re
+from typing import List, Dict, Optional
+
+# Long court names used in place of reporter abbreviations
+COURT_ALIASES = {
+    "supremecourt": "sc",
+    "delhi": "del",
+    "bombay": "bom",
+    "calcutta": "cal",
+    "madras": "mad",
+    "allahabad": "all",
+    "kerala": "ker",
+    "karnataka": "kant",
+    "gujarat": "guj",
+    "rajasthan": "raj",
+    "patna": "pat",
+    "orissa": "ori",
+    "punjab": "pnh",
+}
+
+_VOLUME = r"(?:Supp\.?\s*\(?\d{1,2}\)?|Supp\.?|\(?\d{1,2}\)?)"
+_COURT = r"[A-Za-z][A-Za-z.&]*(?:\s+[A-Za-z][A-Za-z.&]*){0,2}"
+
+CITATION_PATTERN = re.compile(
+    r"(?<![A-Za-z0-9])(?:"
+    # 2023 SCC OnLine SC 123 (must precede SCC)
+    r"(?P<ol_year>\d{4})\s+S\.?\s?C\.?\s?C\.?\s+On\s?-?Line\s+(?P<ol_court>" + _COURT + r")\s+(?P<ol_page>\d{1,6})"
+    # AIR 1973 SC 1461 / A.I.R. 1973 S.C. 1461
+    r"|A\.?\s?I\.?\s?R\.?\s+\(?(?P<air_year>\d{4})\)?\s+(?P<air_court>" + _COURT + r")\s+(?P<air_page>\d{1,5})"
+    # (1973) 4 SCC 225 / 1973 (4) SCC 225 / (1994) Supp (3) SCC 5
+    r"|(?:\((?P<scc_year>\d{4})\)|(?P<scc_year_bare>\d{4}))\s*(?P<scc_vol>" + _VOLUME + r")\s*S\.?\s?C\.?\s?C\.?\s+(?P<scc_page>\d{1,5})"
+    # [1973] Supp SCR 1 / [1978] 2 SCR 621 / [1950] SCR 88
+    r"|(?:\[(?P<scr_year>\d{4})\]|(?P<scr_year_bare>\d{4}))\s*(?:(?P<scr_vol>" + _VOLUME + r")\s*)?S\.?\s?C\.?\s?R\.?\s+(?P<scr_page>\d{1,5})"
+    # 2023 INSC 123 (Supreme Court neutral citation)
+    r"|(?P<insc_year>\d{4})\s+INSC\s+(?P<insc_no>\d{1,6})"
+    # 2023:DHC:1234 / 2024:BHC-AS:1234-DB (High Court neutral citation)
+    r"|(?P<hc_year>\d{4}):(?P<hc_court>[A-Z]{2,6}(?:-[A-Z]{1,4})?):(?P<hc_no>\d{1,6})(?:-(?:DB|FB))?"
+    r")(?![A-Za-z0-9])",
+    re.IGNORECASE
+)
+
+
+def _court_code(court: str) -> str:
+    code = re.sub(r"[^a-z]", "", court.lower())
+    return COURT_ALIASES.get(code, code)
+
+
+def _volume_code(volume: Optional[str]) -> str:
+    return re.sub(r"[^a-z0-9]", "", (volume or "").lower())
+
+
+def _canonical_key(match: re.Match) -> Optional[Dict[str, str]]:
+    """Build (reporter, canonical key) from a CITATION_PATTERN match"""
+    groups = match.groupdict()
+
+    if groups["ol_year"]:
+        return {"reporter": "SCC OnLine",
+                "key": f"scconline:{groups['ol_year']}:{_court_code(groups['ol_court'])}:{int(groups['ol_page'])}"}
+    if groups["air_year"]:
+        return {"reporter": "AIR",
+                "key": f"air:{groups['air_year']}:{_court_code(groups['air_court'])}:{int(groups['air_page'])}"}
+    if groups["scc_page"]:
+        year = groups["scc_year"] or groups["scc_year_bare"]
+        return {"reporter": "SCC",
+                "key": f"scc:{year}:{_volume_code(groups['scc_vol'])}:{int(groups['scc_page'])}"}
+    if groups["scr_page"]:
+        year = groups["scr_year"] or groups["scr_year_bare"]
+        return {"reporter": "SCR",
+                "key": f"scr:{year}:{_volume_code(groups['scr_vol'])}:{int(groups['scr_page'])}"}
+    if groups["insc_year"]:
+        return {"reporter": "INSC", "key": f"insc:{groups['insc_year']}:{int(groups['insc_no'])}"}
+    if groups["hc_year"]:
+        return {"reporter": "Neutral",
+                "key": f"neutral:{groups['hc_court'].lower()}:{groups['hc_year']}:{int(groups['hc_no'])}"}
+    return None
+
+
+def find_citations(text: str) -> List[Dict]:
+    """
+    Find every citation-like span in text in a single regex pass
+
+    Returns:
+        Dicts with start, end, text, reporter and canonical key
+    """
+    spans = []
+    for match in CITATION_PATTERN.finditer(text or ""):
+        parsed = _canonical_key(match)
+        if parsed:
+            spans.append({
+                "start": match.start(),
+                "end": match.end(),
+                "text": match.group(0),
+                **parsed
+            })
+    return spans
+
+
+def normalize_citation(reference: str) -> Optional[str]:
+    """
+    Canonical key for a single citation reference
+
+    "AIR 1973 SC 1461" and "A.I.R. 1973 S.C. 1461" both give "air:1973:sc:1461";
+    "(1973) 4 SCC 225" gives "scc:1973:4:225". Returns None if unrecognised.
+    """
+    spans = find_citations(reference)
+    return spans[0]["key"] if spans else None
+
+
+def citation_keys(citation_field: Optional[str]) -> List[str]:
+    """All canonical keys in a citation field that may list parallel citations"""
+    return [span["key"] for span in find_citations(citation_field or "")]
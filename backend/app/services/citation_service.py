@@ -2,13 +2,38 @@
 Citation Service for finding and suggesting legal citations
 """
 
-from typing import List, Dict, Optional
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Dict, Optional, Union, Tuple, Hashable
+from app.core.config import settings
+from app.core.metrics import metrics
 from app.services.rag_service import rag_service
+from app.services.citation_index import citation_index, init_citation_index
+from app.services.phrase_matcher import AhoCorasickMatcher
+from app.services.legal_vocabulary import build_legal_phrases
+from app.services.citation_graph import get_citation_graph
+from app.services.citation_normalizer import find_citations, citation_keys
 from app.models.schemas import Citation, CaseType
 
+# "section 438 crpc", "u/s 302 IPC", "Art. 21", "S. 13(1)(ia) HMA"
+STATUTORY_REFERENCE_PATTERN = re.compile(
+    r"^\s*(?:section|sec\.?|s\.|u/s\.?|article|art\.?)\s*\d+[a-z]?\b",
+    re.IGNORECASE
+)
+
 class CitationService:
     """Service for managing legal citations"""
     
+    PHRASE_MATCHER_REFRESH_SECONDS = 300
+    MAX_DRAFT_QUERY_TERMS = 12
+    # Share of the final score taken from precomputed citation authority
+    AUTHORITY_WEIGHT = 0.2
+    # Reciprocal rank fusion constant and candidates fetched per retriever (x limit)
+    RRF_K = 60
+    FUSION_CANDIDATE_MULTIPLIER = 3
+    
     def __init__(self):
         self.rag_service = rag_service
         
@@ -17,6 +42,7 @@ class CitationService:
             {
                 "title": "Kesavananda Bharati v. State of Kerala",
                 "citation": "AIR 1973 SC 1461",
+                "parallel_citations": ["(1973) 4 SCC 225", "[1973] Supp SCR 1"],
                 "court": "Supreme Court of India",
                 "year": 1973,
                 "summary": "Landmark case establishing the basic structure doctrine of the Constitution",
@@ -25,6 +51,7 @@ class CitationService:
             {
                 "title": "Maneka Gandhi v. Union of India",
                 "citation": "AIR 1978 SC 597",
+                "parallel_citations": ["(1978) 1 SCC 248", "[1978] 2 SCR 621"],
                 "court": "Supreme Court of India",
                 "year": 1978,
                 "summary": "Expanded interpretation of Article 21 - Right to Life and Personal Liberty",
@@ -33,105 +60,311 @@ class CitationService:
             {
                 "title": "Vishaka v. State of Rajasthan",
                 "citation": "AIR 1997 SC 3011",
+                "parallel_citations": ["(1997) 6 SCC 241"],
                 "court": "Supreme Court of India",
                 "year": 1997,
                 "summary": "Guidelines for prevention of sexual harassment at workplace",
                 "keywords": ["sexual harassment", "workplace", "women's rights"]
             },
         ]
+        
+        # Precedent-backed inverted index (samples are used while the table is empty)
+        self.index = citation_index
+        if not self.index.loaded:
+            init_citation_index(fallback=self.sample_citations)
+        
+        # (normalized query, case_type, limit) -> results for the current corpus version, LRU ordered
+        self._search_cache: "OrderedDict[Tuple, List[Citation]]" = OrderedDict()
+        self._search_cache_version = None
+        self._search_cache_lock = threading.Lock()
+        
+        self._phrase_matcher = None
+        self._matcher_index_version = None
+        self._matcher_built_at = 0.0
+    
+    @staticmethod
+    def _normalize_query(query: Union[str, Dict[str, float]]) -> Hashable:
+        """Cache key form of a query: collapsed lowercase text or sorted weighted terms"""
+        if isinstance(query, str):
+            return " ".join(query.lower().split())
+        return tuple(sorted((term.lower(), round(weight, 3)) for term, weight in query.items()))
+    
+    def _corpus_version(self) -> Tuple:
+        """
+        Changes whenever precedents, the vector snapshot or authority scores change
+        
+        Checks for a newly published snapshot or graph file first (mtime
+        checks), since cache hits never reach the searches that would.
+        """
+        self.rag_service.watch_for_new_snapshot()  # Swaps in the background
+        graph = get_citation_graph()
+        graph.reload_if_changed()
+        return (
+            self.index.version,
+            self.rag_service.snapshot_version,
+            graph.computed_at
+        )
     
     def search_citations(
         self,
-        query: str,
+        query: Union[str, Dict[str, float]],
         case_type: Optional[CaseType] = None,
         limit: int = 5
     ) -> List[Citation]:
-        """Search for relevant legal citations"""
+        """
+        Search for relevant legal citations (query text or {term: weight})
         
-        # Search in RAG service
-        rag_results = self.rag_service.search_case_laws(
-            query,
-            case_type=case_type.value if case_type else None,
-            k=limit
-        )
+        Results are cached per (normalized query, case_type, limit) and the
+        whole cache is dropped as soon as the corpus version moves on.
+        """
+        started = time.perf_counter()
+        key = (self._normalize_query(query), case_type.value if case_type else None, limit)
+        version = self._corpus_version()
+        
+        with self._search_cache_lock:
+            if version != self._search_cache_version:
+                self._search_cache.clear()
+                self._search_cache_version = version
+            cached = self._search_cache.get(key)
+            if cached is not None:
+                self._search_cache.move_to_end(key)
+        
+        if cached is not None:
+            metrics.increment("citation_search_cache_hits")
+            metrics.observe("citation_search_cached_ms", (time.perf_counter() - started) * 1000)
+            return [citation.model_copy() for citation in cached]
+        
+        metrics.increment("citation_search_cache_misses")
+        results = self._search_uncached(query, case_type, limit)
+        
+        with self._search_cache_lock:
+            if version == self._search_cache_version:
+                self._search_cache[key] = results
+                while len(self._search_cache) > settings.CITATION_CACHE_SIZE:
+                    self._search_cache.popitem(last=False)
+        
+        metrics.observe("citation_search_uncached_ms", (time.perf_counter() - started) * 1000)
+        return [citation.model_copy() for citation in results]
+    
+    def _search_uncached(
+        self,
+        query: Union[str, Dict[str, float]],
+        case_type: Optional[CaseType],
+        limit: int
+    ) -> List[Citation]:
+        """
+        Fused keyword + vector ranking (no caching)
+        
+        Exact citation lookups are answered from the index alone and section
+        or article references skip the vector search. Otherwise BM25 and RAG
+        hits are merged by reciprocal rank fusion, deduplicated by canonical
+        citation, and blended with citation authority.
+        """
+        case_type_value = case_type.value if case_type else None
+        
+        # "AIR 1973 SC 1461": resolve directly, no ranking needed
+        if isinstance(query, str):
+            exact = self._resolve_exact_citations(query, case_type_value)
+            if exact:
+                metrics.increment("citation_search_vector_skipped")
+                return [self._to_citation(record, 1.0) for record in exact[:limit]]
+        
+        candidates = limit * self.FUSION_CANDIDATE_MULTIPLIER
+        
+        # Keyword matching via the BM25 inverted index
+        keyword_hits = [
+            record for record, _ in self.index.search(query, limit=candidates, case_type=case_type_value)
+        ]
+        
+        # Semantic matching via the vector store (pointless for statutory references)
+        vector_hits = []
+        if self._is_statutory_reference(query):
+            metrics.increment("citation_search_vector_skipped")
+        else:
+            rag_results = self.rag_service.search_case_laws(
+                query if isinstance(query, str) else " ".join(query),
+                case_type=case_type_value,
+                k=candidates
+            )
+            vector_hits = [
+                record for record in (self._rag_result_to_record(r, case_type_value) for r in rag_results)
+                if record
+            ]
         
-        # Combine with sample citations (keyword matching)
-        query_lower = query.lower()
-        matching_citations = []
-        
-        for cite in self.sample_citations:
-            relevance = 0.0
-            
-            # Check title match
-            if query_lower in cite["title"].lower():
-                relevance += 0.5
-            
-            # Check keyword match
-            for keyword in cite["keywords"]:
-                if keyword in query_lower or query_lower in keyword:
-                    relevance += 0.3
-            
-            # Check summary match
-            if query_lower in cite["summary"].lower():
-                relevance += 0.2
-            
-            if relevance > 0:
-                matching_citations.append({
-                    **cite,
-                    "relevance_score": min(relevance, 1.0)
-                })
-        
-        # Sort by relevance
-        matching_citations.sort(key=lambda x: x["relevance_score"], reverse=True)
-        
-        # Convert to Citation objects
-        citations = []
-        for cite in matching_citations[:limit]:
-            citations.append(Citation(
-                title=cite["title"],
-                citation=cite["citation"],
-                court=cite["court"],
-                year=cite["year"],
-                relevance_score=cite["relevance_score"],
-                summary=cite.get("summary")
+        # Reciprocal rank fusion, deduplicated by canonical citation
+        fused: Dict[str, List] = {}
+        for ranking in (keyword_hits, vector_hits):
+            for rank, record in enumerate(ranking):
+                key = self._dedupe_key(record)
+                entry = fused.setdefault(key, [record, 0.0])
+                entry[1] += 1.0 / (self.RRF_K + rank + 1)
+        
+        # Normalise by the best score the record could have reached: rank 1 in
+        # every retriever that returned hits and can hold it (a skipped or empty
+        # vector search doesn't count; vector-only records aren't in the keyword
+        # index). A keyword hit missing from non-empty vector results stays
+        # capped at 0.5 by design: it can't be told apart from a poor semantic
+        # match. Then blend in authority (how often the precedent is itself cited)
+        best_rank_score = 1.0 / (self.RRF_K + 1)
+        graph = get_citation_graph()  # Reloaded by _corpus_version
+        scored = []
+        for record, score in fused.values():
+            retrievers = (1 if keyword_hits and not record.get("vector_only") else 0) + (1 if vector_hits else 0)
+            relevance = min(score / (max(retrievers, 1) * best_rank_score), 1.0)
+            scored.append((
+                record,
+                (1 - self.AUTHORITY_WEIGHT) * relevance
+                + self.AUTHORITY_WEIGHT * graph.authority_score(record["citation"])
             ))
+        scored.sort(key=lambda item: item[1], reverse=True)
+        
+        return [self._to_citation(record, round(score, 4)) for record, score in scored[:limit]]
+    
+    def _resolve_exact_citations(self, query: str, case_type: Optional[str]) -> List[Dict]:
+        """Records for a query that is (almost) nothing but citation references"""
+        spans = find_citations(query)
+        covered = sum(span["end"] - span["start"] for span in spans)
+        if not spans or covered < 0.6 * len(query.strip()):
+            return []
+        
+        resolved = self.index.resolve_keys(span["key"] for span in spans)
+        records, seen = [], set()
+        for span in spans:
+            record = resolved.get(span["key"])
+            if record and id(record) not in seen and (
+                not case_type or not record.get("case_type") or record["case_type"] == case_type
+            ):
+                seen.add(id(record))
+                records.append(record)
+        return records
+    
+    @staticmethod
+    def _is_statutory_reference(query: Union[str, Dict[str, float]]) -> bool:
+        """True for queries like "section 438 crpc" or "Art. 21" (or only such terms)"""
+        if isinstance(query, str):
+            return bool(STATUTORY_REFERENCE_PATTERN.match(query)) and len(query.split()) <= 8
+        return bool(query) and all(term.startswith(("section ", "article ")) for term in query)
+    
+    def _rag_result_to_record(self, result: Dict, case_type: Optional[str]) -> Optional[Dict]:
+        """Map a vector hit to an index record (or a record built from its metadata)"""
+        metadata = result.get("metadata") or {}
+        citation = metadata.get("citation")
+        if not citation:
+            return None
         
-        return citations
+        record = self.index.resolve(citation)
+        if record:
+            if case_type and record.get("case_type") and record["case_type"] != case_type:
+                return None
+            return record
+        
+        year = metadata.get("year") or str(metadata.get("date") or "")[:4]
+        if not str(year).isdigit():
+            return None
+        return {
+            "title": metadata.get("title") or metadata.get("case_name") or citation,
+            "citation": citation,
+            "court": metadata.get("court") or "",
+            "year": int(year),
+            "summary": metadata.get("summary") or result.get("content", "")[:300],
+            "case_type": metadata.get("case_type"),
+            "vector_only": True  # Not in the keyword index
+        }
+    
+    @staticmethod
+    def _dedupe_key(record: Dict) -> str:
+        """Canonical citation key, so parallel spellings of one judgment merge"""
+        keys = citation_keys(record.get("citation"))
+        return keys[0] if keys else (record.get("citation") or record["title"]).lower()
+    
+    def _to_citation(self, record: Dict, relevance_score: float) -> Citation:
+        """Convert an index record into a Citation"""
+        return Citation(
+            title=record["title"],
+            citation=record["citation"],
+            court=record["court"],
+            year=record["year"],
+            relevance_score=relevance_score,
+            summary=record.get("summary")
+        )
     
     def get_citation_by_reference(self, citation_ref: str) -> Optional[Citation]:
-        """Get citation details by reference number"""
-        for cite in self.sample_citations:
-            if cite["citation"] == citation_ref:
-                return Citation(
-                    title=cite["title"],
-                    citation=cite["citation"],
-                    court=cite["court"],
-                    year=cite["year"],
-                    relevance_score=1.0,
-                    summary=cite.get("summary")
-                )
-        return None
+        """Get citation details by reference (any AIR/SCC/SCR/neutral spelling)"""
+        record = self.index.resolve(citation_ref)
+        return self._to_citation(record, 1.0) if record else None
     
-    def suggest_citations_for_draft(self, draft_content: str, case_type: CaseType) -> List[Citation]:
-        """Suggest relevant citations based on draft content"""
-        # Extract key phrases from draft (simplified approach)
-        words = draft_content.lower().split()
+    def resolve_citations(self, citation_refs: List[str]) -> Dict[str, Optional[Citation]]:
+        """Bulk-resolve references, e.g. every citation in a draft"""
+        return {
+            ref: self._to_citation(record, 1.0) if record else None
+            for ref, record in self.index.resolve_many(citation_refs).items()
+        }
+    
+    def verify_citations_in_text(self, text: str) -> List[Dict]:
+        """
+        Find and resolve every citation in a document
         
-        # Common legal terms to search for
-        legal_terms = [
-            "fundamental rights", "constitution", "contract", "tort",
-            "criminal", "civil", "property", "evidence", "procedure"
-        ]
+        One regex pass finds all citation spans; their canonical keys are then
+        resolved in a single bulk lookup against the precedent index.
+        
+        Args:
+            text: Full document text
         
-        relevant_terms = [term for term in legal_terms if term in draft_content.lower()]
+        Returns:
+            Spans (start, end, text, reporter, canonical_key) with a status of
+            "verified" or "not_found" and the matched Citation
+        """
+        spans = find_citations(text)
+        resolved = self.index.resolve_keys({span["key"] for span in spans})
+        
+        results = []
+        for span in spans:
+            record = resolved.get(span["key"])
+            results.append({
+                "start": span["start"],
+                "end": span["end"],
+                "text": span["text"],
+                "reporter": span["reporter"],
+                "canonical_key": span["key"],
+                "status": "verified" if record else "not_found",
+                "citation": self._to_citation(record, 1.0) if record else None
+            })
+        return results
+    
+    def _get_phrase_matcher(self) -> AhoCorasickMatcher:
+        """
+        Build the legal phrase automaton once; rebuilt (at most every
+        PHRASE_MATCHER_REFRESH_SECONDS) when precedent keywords change
+        """
+        stale = (
+            self._matcher_index_version != self.index.version
+            and time.monotonic() - self._matcher_built_at > self.PHRASE_MATCHER_REFRESH_SECONDS
+        )
+        if self._phrase_matcher is None or stale:
+            phrases = build_legal_phrases()
+            phrases.extend((keyword, keyword, 1.0) for keyword in self.index.keywords())
+            self._phrase_matcher = AhoCorasickMatcher(phrases)
+            self._matcher_index_version = self.index.version
+            self._matcher_built_at = time.monotonic()
+        return self._phrase_matcher
+    
+    def extract_legal_phrases(self, text: str) -> Dict[str, Dict[str, float]]:
+        """All legal phrases, section references and doctrines in text, with counts"""
+        return self._get_phrase_matcher().extract(text)
+    
+    def suggest_citations_for_draft(self, draft_content: str, case_type: CaseType) -> List[Citation]:
+        """Suggest relevant citations based on draft content"""
+        # One linear pass over the draft extracts every known legal phrase
+        weighted_terms = self._get_phrase_matcher().weighted_query(
+            draft_content,
+            max_terms=self.MAX_DRAFT_QUERY_TERMS
+        )
         
-        if not relevant_terms:
+        if not weighted_terms:
             # Fallback to case type
-            search_query = case_type.value
-        else:
-            search_query = " ".join(relevant_terms[:3])
+            return self.search_citations(case_type.value, case_type, limit=5)
         
-        return self.search_citations(search_query, case_type, limit=5)
+        return self.search_citations(weighted_terms, case_type, limit=5)
 
 # Lazy singleton instance
 _citation_service_instance = None
@@ -11,6 +11,12 @@ from datetime import datetime
 from typing import List, Dict
 import logging
 
+from app.core.config import settings
+from app.core.rate_limiter import BATCH, get_rate_limiter
+from app.services.chunking_service import JudgmentChunker
+from app.services.citation_graph import get_citation_graph, resolve_with_citation_index
+from app.services.case_law_mirror import get_case_law_mirror, judgment_to_case
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -23,6 +29,8 @@ class LegalDatasetBuilder:
         self.supreme_court_api = "https://api.sci.gov.in"  # Placeholder
         self.data_dir = "data/judgments"
         self.processed_cases = set()
+        self.chunker = JudgmentChunker()
+        self._embedding_model = None
         
         # Create directories
         os.makedirs(self.data_dir, exist_ok=True)
@@ -47,7 +55,7 @@ class LegalDatasetBuilder:
             judgments = []
             
             # Mock data for demonstration
-            # In production, replace with actual API call:
+            # In production, replace with actual API call (after self._throttle(url)):
             # response = requests.get(
             #     f"{self.indian_kanoon_base}/search",
             #     params={"fromdate": start_date, "todate": end_date},
@@ -75,6 +83,12 @@ class LegalDatasetBuilder:
             logger.error(f"Error fetching judgments: {str(e)}")
             return []
     
+    def _throttle(self, url: str):
+        """Wait for outbound quota on rate-limited hosts (Indian Kanoon)"""
+        limiter = get_rate_limiter(url)
+        if limiter is not None:
+            limiter.acquire(priority=BATCH)
+    
     def download_pdf(self, url: str, case_id: str) -> str:
         """
         Download PDF judgment to local storage
@@ -93,7 +107,8 @@ class LegalDatasetBuilder:
             filename = f"{case_id}_{datetime.now().strftime('%Y%m%d')}.pdf"
             filepath = os.path.join(self.data_dir, filename)
             
-            # Download PDF
+            # Download PDF (batch priority: waits behind user searches on the same quota)
+            self._throttle(url)
             response = requests.get(url, stream=True, timeout=30)
             response.raise_for_status()
             
@@ -209,21 +224,25 @@ class LegalDatasetBuilder:
             logger.error(f"Error extracting metadata: {str(e)}")
             return judgment_info
     
+    def _get_embedding_model(self):
+        """Load the sentence-transformer once and reuse it across judgments"""
+        if self._embedding_model is None:
+            from sentence_transformers import SentenceTransformer
+            self._embedding_model = SentenceTransformer(settings.EMBEDDING_MODEL)
+        return self._embedding_model
+    
     def generate_embeddings(self, text: str) -> List[float]:
         """
         Generate embeddings for semantic search
         
         Args:
-            text: Text to embed
+            text: Text to embed (a query or a single passage)
             
         Returns:
             Embedding vector
         """
         try:
-            from sentence_transformers import SentenceTransformer
-            
-            # Use a pre-trained model (already installed)
-            model = SentenceTransformer('all-MiniLM-L6-v2')
+            model = self._get_embedding_model()
             
             # Truncate text if too long (max 512 tokens)
             max_chars = 2000
@@ -239,15 +258,85 @@ class LegalDatasetBuilder:
             logger.error(f"Error generating embeddings: {str(e)}")
             return []
     
-    def store_in_vector_db(self, case_id: str, text: str, metadata: Dict, embedding: List[float]):
+    def chunk_judgment(self, text: str) -> List[Dict]:
         """
-        Store case in vector database (ChromaDB)
+        Split full judgment text into overlapping, paragraph-aligned passages
         
         Args:
-            case_id: Unique case identifier
             text: Full judgment text
+            
+        Returns:
+            List of passages with index, text and character offsets
+        """
+        passages = self.chunker.chunk(text)
+        logger.info(f"Split judgment into {len(passages)} passages")
+        return passages
+    
+    def generate_passage_embeddings(self, passages: List[Dict]) -> List[List[float]]:
+        """
+        Embed passages in batches so every page of the judgment is searchable
+        
+        Args:
+            passages: Passages produced by chunk_judgment
+            
+        Returns:
+            One embedding vector per passage (empty list on failure)
+        """
+        try:
+            model = self._get_embedding_model()
+            
+            embeddings = model.encode(
+                [p["text"] for p in passages],
+                batch_size=settings.EMBEDDING_BATCH_SIZE,
+                show_progress_bar=False
+            )
+            
+            logger.info(f"Generated {len(embeddings)} passage embeddings")
+            return [e.tolist() for e in embeddings]
+            
+        except Exception as e:
+            logger.error(f"Error generating passage embeddings: {str(e)}")
+            return []
+    
+    def _passage_metadata(self, case_id: str, metadata: Dict, passage: Dict, passage_count: int) -> Dict:
+        """Build per-passage metadata (ChromaDB only accepts scalar values)"""
+        flat = {}
+        for key, value in metadata.items():
+            if value is None:
+                continue
+            if isinstance(value, (list, tuple)):
+                value = "; ".join(str(v) for v in value)
+            elif not isinstance(value, (str, int, float, bool)):
+                value = str(value)
+            flat[key] = value
+        
+        flat.update({
+            "judgment_id": case_id,
+            "passage_index": passage["passage_index"],
+            "passage_count": passage_count,
+            "start_char": passage["start_char"],
+            "end_char": passage["end_char"]
+        })
+        return flat
+    
+    def store_in_vector_db(
+        self,
+        case_id: str,
+        passages: List[Dict],
+        metadata: Dict,
+        embeddings: List[List[float]]
+    ):
+        """
+        Store judgment passages in vector database (ChromaDB)
+        
+        Each passage is stored as its own document with id "<case_id>::p<n>"
+        and a judgment_id metadata field mapping it back to the judgment.
+        
+        Args:
+            case_id: Unique case identifier
+            passages: Passages produced by chunk_judgment
             metadata: Extracted metadata
-            embedding: Vector embedding
+            embeddings: One vector per passage
         """
         try:
             import chromadb
@@ -265,15 +354,26 @@ class LegalDatasetBuilder:
                 metadata={"description": "Indian legal judgments database"}
             )
             
-            # Add document
-            collection.add(
-                documents=[text[:1000]],  # Store first 1000 chars as document
-                metadatas=[metadata],
-                ids=[case_id],
-                embeddings=[embedding] if embedding else None
-            )
+            # Drop passages from a previous ingestion of the same judgment
+            collection.delete(where={"judgment_id": case_id})
+            
+            ids = [f"{case_id}::p{p['passage_index']}" for p in passages]
+            metadatas = [
+                self._passage_metadata(case_id, metadata, p, len(passages))
+                for p in passages
+            ]
+            
+            # Add passages in batches to bound request size
+            batch_size = settings.EMBEDDING_BATCH_SIZE
+            for i in range(0, len(passages), batch_size):
+                collection.add(
+                    documents=[p["text"] for p in passages[i:i + batch_size]],
+                    metadatas=metadatas[i:i + batch_size],
+                    ids=ids[i:i + batch_size],
+                    embeddings=embeddings[i:i + batch_size] if embeddings else None
+                )
             
-            logger.info(f"Stored case {case_id} in vector database")
+            logger.info(f"Stored case {case_id} as {len(passages)} passages in vector database")
             
         except Exception as e:
             logger.error(f"Error storing in vector database: {str(e)}")
@@ -345,11 +445,18 @@ class LegalDatasetBuilder:
                 # Extract metadata
                 metadata = self.extract_metadata(text, judgment)
                 
-                # Generate embeddings
-                embedding = self.generate_embeddings(text)
+                # Split the full judgment into passages and embed them
+                passages = self.chunk_judgment(text)
+                embeddings = self.generate_passage_embeddings(passages)
                 
                 # Store in vector database
-                self.store_in_vector_db(case_id, text, metadata, embedding)
+                self.store_in_vector_db(case_id, passages, metadata, embeddings)
+                
+                # Make it searchable offline in the local case-law mirror
+                get_case_law_mirror().upsert(judgment_to_case(judgment, text))
+                
+                # Record the precedents this judgment cites
+                get_citation_graph().add_judgment(judgment, text, resolver=resolve_with_citation_index)
                 
                 # Mark as processed
                 self.mark_processed(case_id)
@@ -361,6 +468,13 @@ class LegalDatasetBuilder:
                 logger.error(f"❌ Error processing case {case_id}: {str(e)}")
                 continue
         
+        # Recompute citation authority scores for the new edges
+        if processed_count:
+            graph = get_citation_graph()
+            graph.recompute()
+            graph.save()
+            logger.info(f"Citation graph updated: {len(graph.nodes)} nodes, {len(graph.indices)} edges")
+        
         logger.info("=" * 50)
         logger.info(f"Daily update complete!")
         logger.info(f"Processed: {processed_count} | Skipped: {skipped_count}")
@@ -0,0 +1,128 @@
+"""
+OCR Image Preprocessing
+Cleans up photographed/scanned pages before OCR: downscale, grayscale,
+adaptive binarization, deskew and border crop. Pure Pillow, runs inside
+the OCR worker processes.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image, ImageChops, ImageFilter, ImageOps
+
+from app.core.config import settings
+
+PREPROCESS_STEPS = ("downscale", "grayscale", "binarize", "deskew", "crop")
+
+# Long side of an A4 page in inches; used when an image carries no DPI metadata
+A4_LONG_SIDE_INCHES = 11.69
+# Local-mean window (as a fraction of the long side) and darkness offset for binarization
+BINARIZE_WINDOW_FRACTION = 1 / 60
+BINARIZE_OFFSET = 10
+# Deskew is estimated on a thumbnail this wide
+DESKEW_THUMBNAIL_WIDTH = 800
+DESKEW_STEP_DEGREES = 0.5
+CROP_MARGIN_PIXELS = 10
+
+
+def _downscale(img: Image.Image, target_dpi: int) -> Image.Image:
+    """Shrink images rendered/photographed above target_dpi (never upscales)"""
+    dpi = img.info.get("dpi")
+    if dpi and dpi[0] and dpi[0] > 1:
+        scale = target_dpi / float(dpi[0])
+    else:
+        # Phone photos: assume the image spans a full A4 page
+        scale = (target_dpi * A4_LONG_SIDE_INCHES) / max(img.size)
+    if scale >= 1.0:
+        return img
+    size = (max(1, int(img.width * scale)), max(1, int(img.height * scale)))
+    return img.resize(size, Image.LANCZOS)
+
+
+def _binarize(img: Image.Image) -> Image.Image:
+    """
+    Adaptive (local mean) threshold: a pixel is ink when it is darker than
+    its neighbourhood by BINARIZE_OFFSET, which copes with uneven lighting
+    where a single global threshold would not
+    """
+    radius = max(2, int(max(img.size) * BINARIZE_WINDOW_FRACTION))
+    local_mean = img.filter(ImageFilter.BoxBlur(radius))
+    darkness = ImageChops.subtract(local_mean, img)  # > 0 where darker than surroundings
+    ink = darkness.point(lambda v: 255 if v > BINARIZE_OFFSET else 0)
+    return ImageOps.invert(ink)  # Black text on white
+
+
+def _row_profile_score(img: Image.Image) -> float:
+    """Variance of row ink density; peaks when text lines are horizontal"""
+    rows = list(img.resize((1, img.height), Image.BOX).getdata())
+    mean = sum(rows) / len(rows)
+    return sum((v - mean) ** 2 for v in rows) / len(rows)
+
+
+def estimate_skew(img: Image.Image, max_degrees: float) -> float:
+    """Rotation (degrees, counter-clockwise) that best straightens the text lines"""
+    thumbnail = img.convert("L")
+    if thumbnail.width > DESKEW_THUMBNAIL_WIDTH:
+        ratio = DESKEW_THUMBNAIL_WIDTH / thumbnail.width
+        thumbnail = thumbnail.resize((DESKEW_THUMBNAIL_WIDTH, max(1, int(thumbnail.height * ratio))), Image.BOX)
+    thumbnail = ImageOps.invert(thumbnail)  # Ink bright, rotation fill (0) blank
+
+    best_angle, best_score = 0.0, _row_profile_score(thumbnail)
+    steps = int(max_degrees / DESKEW_STEP_DEGREES)
+    for i in range(-steps, steps + 1):
+        angle = i * DESKEW_STEP_DEGREES
+        if angle == 0:
+            continue
+        score = _row_profile_score(thumbnail.rotate(angle, resample=Image.BILINEAR))
+        if score > best_score:
+            best_angle, best_score = angle, score
+    return best_angle
+
+
+def _crop_borders(img: Image.Image) -> Image.Image:
+    """Trim blank margins around the content"""
+    bbox = ImageOps.invert(img.convert("L")).getbbox()
+    if not bbox:
+        return img
+    left, top, right, bottom = bbox
+    bbox = (
+        max(0, left - CROP_MARGIN_PIXELS),
+        max(0, top - CROP_MARGIN_PIXELS),
+        min(img.width, right + CROP_MARGIN_PIXELS),
+        min(img.height, bottom + CROP_MARGIN_PIXELS)
+    )
+    return img.crop(bbox)
+
+
+def preprocess_image(img: Image.Image, steps: Optional[List[str]] = None) -> Tuple[Image.Image, Dict]:
+    """
+    Run the configured preprocessing steps in a fixed order
+
+    Args:
+        img: Page or photo to clean up
+        steps: Subset of PREPROCESS_STEPS (defaults to OCR_PREPROCESS_STEPS)
+
+    Returns:
+        (processed image, report of what each applied step did)
+    """
+    steps = settings.OCR_PREPROCESS_STEPS if steps is None else steps
+    report = {"original_size": list(img.size)}
+
+    if "downscale" in steps:
+        img = _downscale(img, settings.OCR_PREPROCESS_TARGET_DPI)
+    if "grayscale" in steps or "binarize" in steps:
+        img = img.convert("L")
+    if "binarize" in steps:
+        img = _binarize(img)
+    if "deskew" in steps:
+        angle = estimate_skew(img, settings.OCR_PREPROCESS_MAX_SKEW_DEGREES)
+        if angle:
+            if img.mode not in ("L", "RGB"):
+                img = img.convert("RGB")
+            fill = 255 if img.mode == "L" else (255, 255, 255)
+            img = img.rotate(angle, resample=Image.BICUBIC, expand=True, fillcolor=fill)
+        report["skew_degrees"] = angle
+    if "crop" in steps:
+        img = _crop_borders(img)
+
+    report["size"] = list(img.size)
+    return img, report
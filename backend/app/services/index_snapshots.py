@@ -0,0 +1,223 @@
+"""
+Versioned Vector Index Snapshots
+Immutable snapshot directories plus an atomically swapped manifest pointer
+"""
+
+import json
+import os
+import shutil
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional
+
+
+class SnapshotConflictError(Exception):
+    """Raised when another writer published a snapshot since ours was based"""
+    pass
+
+
+class IndexSnapshotManager:
+    """
+    Manage versioned FAISS index snapshots under a vector store root
+
+    Layout:
+        <root>/CURRENT.json              manifest: current version + retired versions
+        <root>/snapshots/<version>/      immutable index files (index.faiss, index.pkl)
+
+    Snapshots are never modified after publishing. Publishing writes the
+    manifest to a temp file and os.replace()s it, so readers always see
+    either the old or the new pointer, never a partial one. Manifest
+    writers (in any process) serialise on a lock file next to it.
+    """
+
+    MANIFEST_NAME = "CURRENT.json"
+    LOCK_NAME = ".manifest.lock"
+    LEGACY_INDEX_FILE = "index.faiss"
+    # A lock file older than this was left by a crashed writer
+    STALE_LOCK_SECONDS = 60.0
+
+    def __init__(self, root: str):
+        self.root = root
+        self.snapshots_dir = os.path.join(root, "snapshots")
+        self.manifest_path = os.path.join(root, self.MANIFEST_NAME)
+        self.lock_path = os.path.join(root, self.LOCK_NAME)
+        os.makedirs(self.snapshots_dir, exist_ok=True)
+
+    @contextmanager
+    def manifest_lock(self, timeout: float = 30.0):
+        """Cross-process exclusive lock for read-modify-write of the manifest"""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - os.stat(self.lock_path).st_mtime > self.STALE_LOCK_SECONDS:
+                        os.remove(self.lock_path)
+                        continue
+                except FileNotFoundError:
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Timed out waiting for {self.lock_path}")
+                time.sleep(0.05)
+        try:
+            yield
+        finally:
+            os.close(fd)
+            try:
+                os.remove(self.lock_path)
+            except FileNotFoundError:
+                pass
+
+    def _new_version(self) -> str:
+        return f"v{datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')}"
+
+    def read_manifest(self) -> Optional[Dict]:
+        """Return the manifest, or None if no snapshot was published yet"""
+        try:
+            with open(self.manifest_path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def manifest_mtime(self) -> float:
+        """Cheap change detection for file-watch polling"""
+        try:
+            return os.stat(self.manifest_path).st_mtime
+        except FileNotFoundError:
+            return 0.0
+
+    def current_version(self) -> Optional[str]:
+        manifest = self.read_manifest()
+        return manifest.get("current") if manifest else None
+
+    def snapshot_path(self, version: str) -> str:
+        return os.path.join(self.snapshots_dir, version)
+
+    def staging_dir(self) -> str:
+        """Create a private directory to build the next snapshot in"""
+        path = os.path.join(self.snapshots_dir, f".staging-{uuid.uuid4().hex}")
+        os.makedirs(path)
+        return path
+
+    def publish(self, staging_path: str, base_version: Optional[str] = None, check_base: bool = False) -> str:
+        """
+        Promote a fully written staging directory to the current snapshot
+
+        Args:
+            staging_path: Directory containing the new index files
+            base_version: Snapshot the new index was built from
+            check_base: Refuse to publish unless base_version is still current
+
+        Returns:
+            The new snapshot version
+
+        Raises:
+            SnapshotConflictError: check_base is set and another snapshot was
+                published in the meantime (the staging directory is left in place)
+        """
+        with self.manifest_lock():
+            manifest = self.read_manifest() or {}
+            if check_base and manifest.get("current") != base_version:
+                raise SnapshotConflictError(
+                    f"Snapshot {manifest.get('current')} was published after {base_version}"
+                )
+
+            version = self._new_version()
+            os.rename(staging_path, self.snapshot_path(version))
+
+            retired = manifest.get("retired", {})
+            if manifest.get("current"):
+                retired[manifest["current"]] = time.time()
+
+            new_manifest = {
+                "current": version,
+                "published_at": datetime.utcnow().isoformat(),
+                "retired": retired
+            }
+
+            # Atomic pointer swap
+            tmp_path = f"{self.manifest_path}.{uuid.uuid4().hex}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(new_manifest, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.manifest_path)
+
+        return version
+
+    def migrate_legacy_index(self) -> Optional[str]:
+        """Adopt an index saved directly at the root (pre-snapshot layout)"""
+        legacy_index = os.path.join(self.root, self.LEGACY_INDEX_FILE)
+        if self.read_manifest() or not os.path.exists(legacy_index):
+            return None
+
+        staging = self.staging_dir()
+        for name in ("index.faiss", "index.pkl"):
+            source = os.path.join(self.root, name)
+            if os.path.exists(source):
+                shutil.copy2(source, os.path.join(staging, name))
+        return self.publish(staging)
+
+    def garbage_collect(self, grace_seconds: float) -> int:
+        """
+        Delete retired snapshots (and abandoned staging dirs) older than the grace period
+
+        The grace period lets in-flight queries finish on the old snapshot.
+
+        Returns:
+            Number of directories removed
+        """
+        manifest = self.read_manifest()
+        if not manifest:
+            return 0
+
+        now = time.time()
+        removed = 0
+        retired = manifest.get("retired", {})
+
+        for version, retired_at in list(retired.items()):
+            if now - retired_at < grace_seconds or version == manifest.get("current"):
+                continue
+            shutil.rmtree(self.snapshot_path(version), ignore_errors=True)
+            removed += 1
+
+        for name in os.listdir(self.snapshots_dir):
+            path = os.path.join(self.snapshots_dir, name)
+            if name.startswith(".staging-") and now - os.stat(path).st_mtime > grace_seconds:
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+
+        if removed:
+            # Re-read under the lock so a concurrent publish is not overwritten
+            with self.manifest_lock():
+                latest = self.read_manifest() or manifest
+                latest["retired"] = {
+                    v: t for v, t in latest.get("retired", {}).items()
+                    if os.path.exists(self.snapshot_path(v))
+                }
+                tmp_path = f"{self.manifest_path}.{uuid.uuid4().hex}.tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(latest, f)
+                os.replace(tmp_path, self.manifest_path)
+
+        return removed
+
+
+# Standalone execution: publish an index built offline
+if __name__ == "__main__":
+    from app.core.config import settings
+
+    if len(sys.argv) != 3 or sys.argv[1] != "publish":
+        print("Usage: python -m app.services.index_snapshots publish <index_dir>")
+        sys.exit(1)
+
+    manager = IndexSnapshotManager(settings.VECTOR_DB_PATH)
+    staging = manager.staging_dir()
+    for name in os.listdir(sys.argv[2]):
+        shutil.copy2(os.path.join(sys.argv[2], name), os.path.join(staging, name))
+    print(f"Published snapshot {manager.publish(staging)}")
@@ -0,0 +1,101 @@
+"""
+Legal Phrase Vocabulary
+Doctrines, legal concepts and statutory references recognised in drafts
+"""
+
+from typing import List, Tuple
+
+# Doctrines and legal concepts: weight reflects how strongly they point to precedent
+DOCTRINES = [
+    "basic structure", "judicial review", "separation of powers", "rule of law", "natural justice",
+    "audi alteram partem", "nemo judex in causa sua", "res judicata", "res sub judice", "constructive res judicata",
+    "promissory estoppel", "legitimate expectation", "proportionality", "wednesbury unreasonableness",
+    "doctrine of eclipse", "doctrine of severability", "pith and substance", "colourable legislation",
+    "doctrine of pleasure", "harmonious construction", "purposive interpretation", "reading down",
+    "absolute liability", "strict liability", "vicarious liability", "res ipsa loquitur", "volenti non fit injuria",
+    "public interest litigation", "locus standi", "writ of mandamus", "writ of certiorari", "habeas corpus",
+    "quo warranto", "writ of prohibition", "curative petition", "review petition", "special leave petition",
+    "fundamental rights", "directive principles", "personal liberty", "right to life", "right to privacy",
+    "right to equality", "freedom of speech", "freedom of expression", "right to livelihood", "right to education",
+    "right to shelter", "right to health", "right to die with dignity", "right to speedy trial",
+    "reasonable classification", "manifest arbitrariness", "creamy layer", "gender equality",
+    "sexual harassment", "workplace harassment", "custodial death", "custodial violence", "police excesses",
+    "anticipatory bail", "regular bail", "default bail", "interim bail", "bail is the rule",
+    "presumption of innocence", "burden of proof", "reverse burden", "benefit of doubt",
+    "proof beyond reasonable doubt", "preponderance of probabilities", "circumstantial evidence",
+    "chain of circumstances", "last seen theory", "dying declaration", "extra judicial confession",
+    "hostile witness", "interested witness", "sole eyewitness", "test identification parade",
+    "recovery of weapon", "motive", "mens rea", "actus reus", "common intention", "common object",
+    "criminal conspiracy", "abetment", "grave and sudden provocation", "private defence", "right of private defence",
+    "culpable homicide", "rarest of rare", "death sentence", "life imprisonment", "sentencing policy",
+    "quashing of fir", "inherent powers", "abuse of process", "compounding of offences", "plea bargaining",
+    "cheque bounce", "dishonour of cheque", "legally enforceable debt", "statutory notice",
+    "free consent", "undue influence", "misrepresentation", "coercion", "fraud", "frustration of contract",
+    "specific performance", "liquidated damages", "breach of contract", "quantum meruit", "restitution",
+    "adverse possession", "easementary right", "partition suit", "coparcenary", "hindu undivided family",
+    "daughter as coparcener", "stridhan", "maintenance", "domestic violence", "dowry death", "cruelty",
+    "irretrievable breakdown", "restitution of conjugal rights", "custody of child", "welfare of the child",
+    "arbitration agreement", "seat of arbitration", "patent illegality", "public policy", "kompetenz kompetenz",
+    "limitation", "condonation of delay", "sufficient cause", "territorial jurisdiction", "cause of action",
+    "temporary injunction", "prima facie case", "balance of convenience", "irreparable injury",
+    "environmental protection", "polluter pays", "precautionary principle", "sustainable development",
+    "public trust doctrine", "land acquisition", "fair compensation", "eminent domain",
+    "service jurisprudence", "equal pay for equal work", "regularisation", "disciplinary proceedings",
+    "industrial dispute", "retrenchment", "workmen compensation", "minimum wages",
+    "tax evasion", "tax avoidance", "reassessment", "input tax credit", "corporate veil",
+    "lifting the corporate veil", "oppression and mismanagement", "insolvency resolution", "moratorium",
+    "narcotic drugs", "conscious possession", "commercial quantity", "section 50 compliance",
+    "electronic evidence", "certificate under section 65b", "digital privacy", "data protection",
+]
+
+# Broad areas of law - weak signals, but better than falling back to the case type
+GENERAL_TERMS = [
+    "constitution", "contract", "tort", "criminal", "civil", "property", "evidence", "procedure",
+]
+
+# (abbreviation used in the canonical term, spellings used in drafts, section range)
+STATUTES = [
+    ("ipc", ["ipc", "i p c", "indian penal code", "penal code"], 511),
+    ("crpc", ["crpc", "cr p c", "code of criminal procedure"], 484),
+    ("cpc", ["cpc", "c p c", "code of civil procedure"], 158),
+    ("evidence act", ["evidence act", "indian evidence act"], 167),
+    ("contract act", ["contract act", "indian contract act"], 238),
+    ("ndps act", ["ndps act", "ndps"], 83),
+    ("ni act", ["ni act", "negotiable instruments act"], 147),
+    ("it act", ["it act", "information technology act"], 90),
+    ("hindu marriage act", ["hindu marriage act", "hma"], 30),
+    ("arbitration act", ["arbitration act", "arbitration and conciliation act"], 87),
+]
+
+CONSTITUTION_ARTICLES = 395
+
+DOCTRINE_WEIGHT = 2.0
+GENERAL_WEIGHT = 0.5
+SECTION_WEIGHT = 1.5
+ARTICLE_WEIGHT = 1.5
+
+
+def build_legal_phrases() -> List[Tuple[str, str, float]]:
+    """
+    Build the (phrase, canonical term, weight) vocabulary
+
+    Statutory references are expanded over their full section ranges and
+    common spellings ("section 438 crpc", "u/s 438 of the code of criminal
+    procedure", "s. 438 cr.p.c."), giving tens of thousands of patterns.
+    """
+    phrases = [(doctrine, doctrine, DOCTRINE_WEIGHT) for doctrine in DOCTRINES]
+    phrases.extend((term, term, GENERAL_WEIGHT) for term in GENERAL_TERMS)
+
+    for abbreviation, spellings, last_section in STATUTES:
+        for number in range(1, last_section + 1):
+            term = f"section {number} {abbreviation}"
+            for spelling in spellings:
+                for prefix in ("section", "sec", "s", "u s"):
+                    phrases.append((f"{prefix} {number} {spelling}", term, SECTION_WEIGHT))
+
+    for number in range(1, CONSTITUTION_ARTICLES + 1):
+        term = f"article {number} constitution"
+        for prefix in ("article", "art"):
+            phrases.append((f"{prefix} {number}", term, ARTICLE_WEIGHT))
+
+    return phrases
@@ -0,0 +1,101 @@
+"""
+OCR Result Cache
+Content-addressed store of OCR output so re-uploaded documents (and PDFs
+sharing pages) are not OCR'd again
+"""
+
+import hashlib
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.swr_cache import SQLiteCacheStore
+
+
+def content_hash(data: bytes) -> str:
+    """SHA-256 hex digest of raw bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class OCRResultCache:
+    """
+    Document- and page-level OCR results keyed by content hash
+
+    Keys are prefixed with the OCR engine signature (engine, languages,
+    render DPI, pipeline version), so changing any of them never serves
+    results produced under different settings.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_age_days: Optional[float] = None):
+        path = path or settings.OCR_CACHE_PATH
+        max_age_days = settings.OCR_CACHE_MAX_AGE_DAYS if max_age_days is None else max_age_days
+        self.documents = SQLiteCacheStore(path, table="ocr_documents")
+        self.pages = SQLiteCacheStore(path, table="ocr_pages")
+        if max_age_days:
+            cutoff = time.time() - max_age_days * 86400
+            self.documents.purge(cutoff)
+            self.pages.purge(cutoff)
+
+    def get_document(self, signature: str, digest: str) -> Optional[Tuple[str, int, List[Dict]]]:
+        """
+        Cached result for a whole uploaded file
+
+        Returns:
+            (extracted_text, confidence_score, word_boxes) or None on a miss
+        """
+        entry = self.documents.get(f"{signature}:{digest}")
+        metrics.increment("ocr_document_cache_hits" if entry else "ocr_document_cache_misses")
+        if entry is None:
+            return None
+        value, _ = entry
+        return value["text"], value["confidence"], value["words"]
+
+    def set_document(self, signature: str, digest: str, result: Tuple[str, int, List[Dict]], pages: List[int]):
+        """
+        Store a whole-file result
+
+        Args:
+            signature: OCR engine signature
+            digest: SHA-256 of the uploaded bytes
+            result: (extracted_text, confidence_score, word_boxes)
+            pages: Per-page confidences, in page order
+        """
+        text, confidence, words = result
+        self.documents.set(
+            f"{signature}:{digest}",
+            {"text": text, "confidence": confidence, "words": words, "pages": pages},
+            time.time()
+        )
+
+    def get_page(self, signature: str, digest: str) -> Optional[Tuple[str, int, List[Dict]]]:
+        """Cached OCR result for one rendered page image"""
+        entry = self.pages.get(f"{signature}:{digest}")
+        metrics.increment("ocr_page_cache_hits" if entry else "ocr_page_cache_misses")
+        if entry is None:
+            return None
+        value, _ = entry
+        return value["text"], value["confidence"], value["words"]
+
+    def set_page(self, signature: str, digest: str, result: Tuple[str, int, List[Dict]]):
+        text, confidence, words = result
+        self.pages.set(
+            f"{signature}:{digest}",
+            {"text": text, "confidence": confidence, "words": words},
+            time.time()
+        )
+
+
+# Lazy singleton instance
+_ocr_cache_instance = None
+_ocr_cache_lock = threading.Lock()
+
+def get_ocr_cache() -> OCRResultCache:
+    """Get or create the OCR result cache"""
+    global _ocr_cache_instance
+    if _ocr_cache_instance is None:
+        with _ocr_cache_lock:
+            if _ocr_cache_instance is None:
+                _ocr_cache_instance = OCRResultCache()
+    return _ocr_cache_instance
@@ -0,0 +1,259 @@
+"""
+OCR Process Pool
+Runs CPU-bound OCR in dedicated worker processes so uploads never block
+the API event loop
+"""
+
+import asyncio
+import importlib
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+
+class OCRQueueFullError(Exception):
+    """Raised when more OCR tasks are pending than OCR_MAX_QUEUE allows"""
+    pass
+
+
+class OCRTimeoutError(Exception):
+    """Raised when an OCR task exceeds its time limit"""
+    pass
+
+
+# Module whose import loads the OCR models (see OCR_PRELOAD_MODELS)
+PRELOAD_MODULE = "app.services.ocr_preload"
+
+
+def _init_worker():
+    """Keep Tesseract single-threaded: parallelism comes from the pool itself"""
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+
+def _warm_up_worker():
+    """Load the models now rather than on the first document (no-op if inherited via fork)"""
+    importlib.import_module(PRELOAD_MODULE)
+
+
+class OCRExecutor:
+    """
+    Bounded process pool for OCR tasks
+
+    At most `max_pending` tasks may be queued or running; beyond that new
+    uploads are rejected immediately instead of piling up. Each task is
+    awaited with its own timeout, and a task that overruns gets the pool
+    recycled (its worker processes killed), since a future cannot be
+    cancelled once a worker has started it. Engines (EasyOCR/Tesseract) are
+    created lazily inside each worker process and reused for every task it runs.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        task_timeout: Optional[float] = None,
+        start_method: Optional[str] = None
+    ):
+        self.workers = workers or settings.OCR_WORKERS
+        self.max_pending = max_pending or settings.OCR_MAX_QUEUE
+        self.task_timeout = task_timeout or settings.OCR_TASK_TIMEOUT_SECONDS
+        self.start_method = start_method or settings.OCR_START_METHOD
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                context = multiprocessing.get_context(self.start_method)
+                if settings.OCR_PRELOAD_MODELS:
+                    self._preload(context)
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=context,
+                    initializer=_init_worker
+                )
+            return self._pool
+
+    def _preload(self, context):
+        """Load models once in the process the workers are forked from"""
+        if self.start_method == "forkserver":
+            # The fork server (not the API process) holds the single copy
+            context.set_forkserver_preload([PRELOAD_MODULE])
+        elif self.start_method == "fork":
+            # Workers fork from the API process itself, which therefore loads the models
+            importlib.import_module(PRELOAD_MODULE)
+        else:
+            print("[!] OCR_PRELOAD_MODELS needs OCR_START_METHOD=forkserver or fork; each worker loads its own models")
+
+    async def start(self):
+        """
+        Start every worker process now and load its models, so the first
+        upload does not pay for it (used when OCR_PRELOAD_MODELS is on)
+        """
+        started = time.perf_counter()
+        pool = self._get_pool()
+        await asyncio.gather(*[
+            asyncio.wrap_future(pool.submit(_warm_up_worker)) for _ in range(self.workers)
+        ])
+        metrics.observe("ocr_pool_start_ms", (time.perf_counter() - started) * 1000)
+
+    def _discard_pool(self, pool: ProcessPoolExecutor, kill: bool = False):
+        """
+        Drop a broken or stuck pool; the next task starts a fresh one
+
+        Args:
+            pool: The pool to drop
+            kill: Also terminate its worker processes. Tasks still running
+                in them fail with BrokenProcessPool (and are retried by the job queue)
+        """
+        with self._pool_lock:
+            if self._pool is pool:
+                self._pool = None
+        # Taken before shutdown(), which forgets the process table
+        processes = list((getattr(pool, "_processes", None) or {}).values()) if kill else []
+        pool.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            if process.is_alive():
+                process.kill()
+        if processes:
+            metrics.increment("ocr_pool_recycled")
+
+    def _reserve_slot(self):
+        with self._pending_lock:
+            if self._pending >= self.max_pending:
+                metrics.increment("ocr_rejected")
+                raise OCRQueueFullError(
+                    f"OCR queue is full ({self._pending} documents pending); please retry shortly"
+                )
+            self._pending += 1
+
+    def _release_slot(self):
+        with self._pending_lock:
+            self._pending -= 1
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def _gather(
+        self,
+        func: Callable,
+        arg_tuples: List[Tuple],
+        timeout: Optional[float],
+        on_result: Optional[Callable[[int, Any], None]] = None
+    ) -> List[Any]:
+        """
+        Run one task per argument tuple and return the results in order
+
+        At most `workers` tasks of the batch are submitted at a time, so a
+        task starts on a worker (roughly) when it is submitted and its
+        timeout measures its own run, not the time spent queued behind its
+        siblings.
+        """
+        timeout = timeout or self.task_timeout
+        self._reserve_slot()
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        pool = self._get_pool()
+        results: List[Any] = [None] * len(arg_tuples)
+        in_flight = {}  # future -> (index, deadline)
+        next_index = 0
+        try:
+            while next_index < len(arg_tuples) or in_flight:
+                while next_index < len(arg_tuples) and len(in_flight) < self.workers:
+                    future = asyncio.wrap_future(pool.submit(func, *arg_tuples[next_index]))
+                    in_flight[future] = (next_index, loop.time() + timeout)
+                    next_index += 1
+
+                nearest_deadline = min(deadline for _, deadline in in_flight.values())
+                done, _ = await asyncio.wait(
+                    in_flight,
+                    timeout=max(0.0, nearest_deadline - loop.time()),
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    # The task can't be cancelled inside its worker; kill the workers instead
+                    metrics.increment("ocr_timeouts")
+                    self._discard_pool(pool, kill=True)
+                    raise OCRTimeoutError(f"OCR did not finish within {timeout:g}s")
+
+                for future in done:
+                    index, _ = in_flight.pop(future)
+                    results[index] = future.result()
+                    if on_result is not None:
+                        on_result(index, results[index])
+            return results
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); replace the pool for later tasks
+            self._discard_pool(pool)
+            raise
+        finally:
+            # Drop queued siblings of a failed task so they don't hold workers
+            for future in in_flight:
+                future.cancel()
+            self._release_slot()
+            metrics.observe("ocr_task_ms", (time.perf_counter() - started) * 1000)
+
+    async def run(self, func: Callable, *args, timeout: Optional[float] = None) -> Any:
+        """
+        Run func(*args) in a worker process and await the result
+
+        Args:
+            func: Module-level (picklable) function
+            *args: Picklable arguments
+            timeout: Seconds to wait (defaults to OCR_TASK_TIMEOUT_SECONDS)
+
+        Raises:
+            OCRQueueFullError: Too many tasks pending
+            OCRTimeoutError: The task did not finish in time
+        """
+        results = await self._gather(func, [args], timeout)
+        return results[0]
+
+    async def map(
+        self,
+        func: Callable,
+        arg_tuples: Iterable[Tuple],
+        timeout: Optional[float] = None,
+        on_result: Optional[Callable[[int, Any], None]] = None
+    ) -> List[Any]:
+        """
+        Run func over several inputs in parallel (e.g. the pages of one PDF)
+
+        The whole batch counts as one entry against OCR_MAX_QUEUE; each call
+        has its own timeout. Results come back in input order.
+
+        Args:
+            func: Module-level (picklable) function
+            arg_tuples: One tuple of picklable arguments per call
+            timeout: Seconds each call may run (defaults to OCR_TASK_TIMEOUT_SECONDS)
+            on_result: Called with (index, result) as each call finishes, in
+                completion order (e.g. to report progress)
+
+        Returns:
+            List of results, in the same order as arg_tuples
+        """
+        arg_tuples = list(arg_tuples)
+        if not arg_tuples:
+            return []
+        return await self._gather(func, arg_tuples, timeout, on_result)
+
+    def shutdown(self):
+        """Stop worker processes (called on application shutdown)"""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Singleton instance (worker processes start on the first OCR task)
+ocr_executor = OCRExecutor()
@@ -0,0 +1,278 @@
+"""
+OCR Job Queue
+Uploads are stored as pending UploadedDocument rows; background workers
+claim them, run OCR + case extraction and record per-page progress.
+Any number of worker processes (in the API or standalone) can share the
+queue, since claims are atomic updates on the documents table.
+"""
+
+import asyncio
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional, Set
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import aliased
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.metrics import metrics
+from app.models.database_models import UploadedDocument, User
+from app.services.ocr_executor import OCRQueueFullError, OCRTimeoutError
+from app.services.ocr_service import ocr_service, case_extractor
+
+# Partial results are written at most this often (the final page always is)
+PROGRESS_WRITE_INTERVAL_SECONDS = 1.0
+PAGE_BREAK = "\n\n--- Page Break ---\n\n"
+
+
+def complete_document(doc: UploadedDocument, extracted_text: str, confidence: int, words: list) -> dict:
+    """Store final OCR + extraction results on a document row (caller commits)"""
+    extracted_data = case_extractor.extract(extracted_text, doc.document_type or "general", words)
+    doc.extracted_text = extracted_text
+    doc.extracted_data = extracted_data
+    doc.ocr_confidence = confidence
+    doc.pages_total = doc.pages_total or 1
+    doc.pages_done = doc.pages_total
+    doc.processing_status = "completed"
+    doc.error_message = None
+    doc.claimed_by = None
+    doc.processed_at = datetime.utcnow()
+    return extracted_data
+
+
+class OCRJobWorker:
+    """
+    Polls for pending documents and processes up to `concurrency` at once
+
+    A claim stamps the row with this worker's id and a heartbeat
+    (claimed_at) that is refreshed on every progress write. Rows whose
+    heartbeat is older than OCR_JOB_STALE_SECONDS belong to a dead worker
+    and are claimed again, up to OCR_JOB_MAX_ATTEMPTS times.
+    """
+
+    def __init__(self, concurrency: Optional[int] = None, poll_interval: Optional[float] = None):
+        self.concurrency = concurrency or settings.OCR_JOB_CONCURRENCY
+        self.poll_interval = poll_interval or settings.OCR_JOB_POLL_SECONDS
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._active: Set[asyncio.Task] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+
+    def notify(self):
+        """Wake the worker loop now instead of at the next poll (same process only)"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _claimable(self, stale_before: datetime):
+        return and_(
+            UploadedDocument.attempts < settings.OCR_JOB_MAX_ATTEMPTS,
+            or_(
+                UploadedDocument.processing_status == "pending",
+                and_(
+                    UploadedDocument.processing_status == "processing",
+                    UploadedDocument.claimed_at < stale_before
+                )
+            )
+        )
+
+    def _running_for_user(self, stale_before: datetime):
+        """Live claims of the candidate row's user, as a correlated subquery"""
+        running = aliased(UploadedDocument)
+        return select(func.count(running.id)).where(
+            running.user_id == UploadedDocument.user_id,
+            running.processing_status == "processing",
+            running.claimed_at >= stale_before
+        ).correlate(UploadedDocument).scalar_subquery()
+
+    def claim(self, limit: int) -> List[int]:
+        """Atomically take up to `limit` jobs; returns the claimed document ids"""
+        db = SessionLocal()
+        try:
+            stale_before = datetime.utcnow() - timedelta(seconds=settings.OCR_JOB_STALE_SECONDS)
+
+            # Dead-worker jobs that have used up their attempts
+            db.query(UploadedDocument).filter(
+                UploadedDocument.processing_status == "processing",
+                UploadedDocument.claimed_at < stale_before,
+                UploadedDocument.attempts >= settings.OCR_JOB_MAX_ATTEMPTS
+            ).update({
+                UploadedDocument.processing_status: "failed",
+                UploadedDocument.error_message: "OCR worker stopped responding",
+                UploadedDocument.claimed_by: None
+            }, synchronize_session=False)
+            db.commit()
+
+            # Per-user cap, so one clerk's 50-file bundle doesn't hold every worker.
+            # This snapshot only pre-filters candidates; the claim itself re-checks it
+            per_user_cap = settings.OCR_MAX_CONCURRENT_PER_USER
+            running = dict(db.query(UploadedDocument.user_id, func.count(UploadedDocument.id)).filter(
+                UploadedDocument.processing_status == "processing",
+                UploadedDocument.claimed_at >= stale_before
+            ).group_by(UploadedDocument.user_id).all())
+            capped_users = [user_id for user_id, count in running.items() if count >= per_user_cap]
+
+            query = db.query(UploadedDocument.id, UploadedDocument.user_id).filter(self._claimable(stale_before))
+            if capped_users:
+                query = query.filter(UploadedDocument.user_id.notin_(capped_users))
+            candidates = query.order_by(UploadedDocument.id).limit(limit * 4).all()
+
+            claimed = []
+            for document_id, user_id in candidates:
+                if len(claimed) >= limit:
+                    break
+                if running.get(user_id, 0) >= per_user_cap:
+                    continue
+                # Serialise claims per user (row lock on PostgreSQL; SQLite
+                # writes are serialised anyway) so the count below is current
+                db.query(User.id).filter(User.id == user_id).with_for_update().first()
+                # Compare-and-set: only one worker's update matches the row, and
+                # only while the user is under the cap across all workers
+                updated = db.query(UploadedDocument).filter(
+                    UploadedDocument.id == document_id,
+                    self._claimable(stale_before),
+                    self._running_for_user(stale_before) < per_user_cap
+                ).update({
+                    UploadedDocument.processing_status: "processing",
+                    UploadedDocument.claimed_by: self.worker_id,
+                    UploadedDocument.claimed_at: datetime.utcnow(),
+                    UploadedDocument.attempts: UploadedDocument.attempts + 1
+                }, synchronize_session=False)
+                db.commit()
+                if updated:
+                    claimed.append(document_id)
+                    running[user_id] = running.get(user_id, 0) + 1
+            return claimed
+        finally:
+            db.close()
+
+    async def process(self, document_id: int):
+        """Run OCR + extraction for one claimed document"""
+        db = SessionLocal()
+        started = time.perf_counter()
+        try:
+            doc = db.query(UploadedDocument).filter(UploadedDocument.id == document_id).first()
+            if not doc or doc.claimed_by != self.worker_id:
+                return
+
+            last_write = 0.0
+
+            def on_progress(page_results):
+                nonlocal last_write
+                done = sum(1 for page in page_results if page is not None)
+                now = time.monotonic()
+                if done < len(page_results) and now - last_write < PROGRESS_WRITE_INTERVAL_SECONDS:
+                    return
+                last_write = now
+                partial_text = PAGE_BREAK.join(page[0] for page in page_results if page is not None)
+                doc.pages_total = len(page_results)
+                doc.pages_done = done
+                doc.extracted_text = partial_text
+                doc.extracted_data = case_extractor.extract(partial_text, doc.document_type or "general")
+                doc.claimed_at = datetime.utcnow()
+                db.commit()
+
+            cached = ocr_service.cached_result(doc.content_hash) if doc.content_hash else None
+            if cached is not None:
+                extracted_text, confidence, words = cached
+            elif (doc.file_type or "").lower() == "pdf":
+                extracted_text, confidence, words = await ocr_service.extract_text_from_pdf(
+                    doc.file_path, doc.content_hash, on_progress
+                )
+            else:
+                doc.pages_total = 1
+                extracted_text, confidence, words = await ocr_service.extract_text_from_image(
+                    doc.file_path, doc.content_hash
+                )
+
+            complete_document(doc, extracted_text, confidence, words)
+            db.commit()
+            metrics.increment("ocr_jobs_completed")
+
+        except asyncio.CancelledError:
+            # Shutting down: hand the job back rather than waiting for the stale timeout
+            self._release(db, document_id, "pending", None, count_attempt=False)
+            raise
+        except OCRQueueFullError:
+            # Pool busy with other work; retry later without using up an attempt
+            self._release(db, document_id, "pending", None, count_attempt=False)
+        except Exception as e:
+            print(f"OCR job {document_id} failed: {str(e)}")
+            metrics.increment("ocr_jobs_failed")
+            retry = not isinstance(e, OCRTimeoutError)
+            self._release(db, document_id, "pending" if retry else "failed", str(e))
+        finally:
+            metrics.observe("ocr_job_ms", (time.perf_counter() - started) * 1000)
+            db.close()
+
+    def _release(self, db, document_id: int, status: str, error: Optional[str], count_attempt: bool = True):
+        """Give a claimed job back to the queue (or fail it once attempts run out)"""
+        try:
+            db.rollback()
+            doc = db.query(UploadedDocument).filter(UploadedDocument.id == document_id).first()
+            if not doc or doc.claimed_by != self.worker_id:
+                return
+            if not count_attempt:
+                doc.attempts = max((doc.attempts or 1) - 1, 0)
+            if status == "pending" and doc.attempts >= settings.OCR_JOB_MAX_ATTEMPTS:
+                status = "failed"
+            doc.processing_status = status
+            doc.error_message = error
+            doc.claimed_by = None
+            db.commit()
+        except Exception as e:
+            print(f"Could not release OCR job {document_id}: {str(e)}")
+
+    async def run(self):
+        """Worker loop; returns after stop()"""
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        print(f"[+] OCR job worker {self.worker_id} started (concurrency {self.concurrency})")
+
+        while not self._stopping:
+            free = self.concurrency - len(self._active)
+            if free > 0:
+                try:
+                    claimed = self.claim(free)
+                except Exception as e:
+                    print(f"OCR job claim failed: {str(e)}")
+                    claimed = []
+                for document_id in claimed:
+                    task = asyncio.create_task(self.process(document_id))
+                    self._active.add(task)
+                    task.add_done_callback(self._job_finished)
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def _job_finished(self, task: asyncio.Task):
+        self._active.discard(task)
+        self.notify()  # A slot opened up; look for more work
+
+    async def stop(self):
+        """Stop claiming jobs and hand in-flight ones back to the queue"""
+        self._stopping = True
+        self.notify()
+        for task in list(self._active):
+            task.cancel()
+        if self._active:
+            await asyncio.gather(*self._active, return_exceptions=True)
+
+
+# Singleton instance (started from the API lifespan when OCR_JOB_WORKER_ENABLED)
+ocr_job_worker = OCRJobWorker()
+
+
+if __name__ == "__main__":
+    # Standalone worker: python -m app.services.ocr_jobs
+    # Needs the same DATABASE_URL and UPLOAD_DIR (shared storage) as the API
+    try:
+        asyncio.run(ocr_job_worker.run())
+    except KeyboardInterrupt:
+        pass
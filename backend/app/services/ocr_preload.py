@@ -0,0 +1,10 @@
+"""
+OCR Model Preload
+Imported by the OCR fork server when OCR_PRELOAD_MODELS is enabled: the
+EasyOCR model is loaded once there, and every worker process forked from
+it shares those pages copy-on-write instead of loading its own copy
+"""
+
+from app.services.ocr_service import _get_easyocr_reader
+
+_get_easyocr_reader()
@@ -3,104 +3,485 @@ OCR and Document Extraction Service
 Extracts case information from uploaded FIRs, chargesheets, and notes
 """
 
+import asyncio
+import importlib.util
 import re
 import os
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 import pytesseract
 from PIL import Image
 import pdf2image
 from io import BytesIO
 
-# Make EasyOCR completely optional
-EASYOCR_AVAILABLE = False
-try:
-    import easyocr
-    EASYOCR_AVAILABLE = True
-except (ImportError, Exception) as e:
-    print(f"[!] EasyOCR not available (using Tesseract only): {e}")
-    EASYOCR_AVAILABLE = False
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.ocr_cache import content_hash, get_ocr_cache
+from app.services.ocr_executor import ocr_executor
+from app.services.image_preprocessing import PREPROCESS_STEPS, preprocess_image
+
+# Make EasyOCR completely optional. Only check that it is installed here:
+# importing it pulls in torch, so the import (and the model) are deferred
+# to the OCR worker processes that actually use it.
+EASYOCR_AVAILABLE = settings.OCR_USE_EASYOCR and importlib.util.find_spec("easyocr") is not None
+if not EASYOCR_AVAILABLE:
+    print("[!] EasyOCR not available (using Tesseract only)")
+
+
+# (text, confidence, word_boxes) for one page or image
+PageResult = Tuple[str, int, List[Dict]]
+# Receives per-page results in page order, None for pages still pending
+ProgressCallback = Callable[[List[Optional[PageResult]]], None]
+
+# Bump when text reconstruction or page selection changes, so cached results are not reused
+OCR_PIPELINE_VERSION = 1
+
+
+def ocr_engine_signature() -> str:
+    """Identifies everything that shapes OCR output; part of every OCR cache key"""
+    engine = "easyocr" if EASYOCR_AVAILABLE else "tesseract"
+    color = "gray" if settings.OCR_PDF_GRAYSCALE else "rgb"
+    preprocess = "+".join(step for step in PREPROCESS_STEPS if step in settings.OCR_PREPROCESS_STEPS) or "raw"
+    if "downscale" in settings.OCR_PREPROCESS_STEPS:
+        preprocess += f"@{settings.OCR_PREPROCESS_TARGET_DPI}"
+    return (
+        f"{engine}:eng+hin:{settings.OCR_PDF_DPI}dpi-{color}:{preprocess}:v{OCR_PIPELINE_VERSION}"
+    )
+
+
+# ========== WORKER-SIDE OCR ==========
+# These run inside OCR worker processes (see ocr_executor.py); each process
+# builds its own engine on first use and keeps it for later tasks.
+
+_easyocr_reader = None
+_easyocr_failed = False
+
+
+def _get_easyocr_reader():
+    """Per-process EasyOCR reader, created on first use (or preloaded, see ocr_preload.py)"""
+    global _easyocr_reader, _easyocr_failed
+    if _easyocr_reader is None and EASYOCR_AVAILABLE and not _easyocr_failed:
+        try:
+            import easyocr
+            _easyocr_reader = easyocr.Reader(['en', 'hi'], gpu=False)
+        except Exception as e:
+            # Don't retry the (slow) load for every page; Tesseract takes over
+            _easyocr_failed = True
+            print(f"[!] EasyOCR initialization failed: {e}")
+    return _easyocr_reader
+
+
+def _tesseract_extract(img) -> Tuple[str, int, List[Dict]]:
+    """
+    One image_to_data pass: rebuild the text layout and word confidences
+    from the same result instead of running image_to_string as well
+    """
+    data = pytesseract.image_to_data(
+        img,
+        lang='eng+hin',
+        output_type=pytesseract.Output.DICT,
+        timeout=settings.OCR_TASK_TIMEOUT_SECONDS  # Killed after this so the worker is freed
+    )
+    
+    words = []
+    paragraphs: List[List[List[str]]] = []  # paragraph -> lines -> words
+    last_paragraph = last_line = None
+    line_index = -1
+    
+    for i, word in enumerate(data['text']):
+        conf = float(data['conf'][i])
+        word = word.strip()
+        if conf < 0 or not word:
+            continue  # Block/paragraph/line rows and empty detections
+        
+        paragraph_key = (data['block_num'][i], data['par_num'][i])
+        line_key = paragraph_key + (data['line_num'][i],)
+        if paragraph_key != last_paragraph:
+            paragraphs.append([])
+            last_paragraph = paragraph_key
+            last_line = None
+        if line_key != last_line:
+            paragraphs[-1].append([])
+            last_line = line_key
+            line_index += 1
+        paragraphs[-1][-1].append(word)
+        
+        words.append({
+            "text": word,
+            "conf": int(conf),
+            "left": data['left'][i],
+            "top": data['top'][i],
+            "width": data['width'][i],
+            "height": data['height'][i],
+            "line": line_index
+        })
+    
+    # Same layout as image_to_string: lines joined by newlines, paragraphs by a blank line
+    text = "\n\n".join("\n".join(" ".join(line) for line in lines) for lines in paragraphs)
+    avg_confidence = sum(w["conf"] for w in words) / len(words) if words else 0
+    
+    return text, int(avg_confidence), words
+
+
+def _easyocr_extract(reader, image_data: bytes) -> Tuple[str, int, List[Dict]]:
+    """EasyOCR detections as text, confidence and boxes"""
+    results = reader.readtext(image_data)
+    words = []
+    for bbox, word, conf in results:
+        xs = [point[0] for point in bbox]
+        ys = [point[1] for point in bbox]
+        words.append({
+            "text": word,
+            "conf": int(conf * 100),
+            "left": int(min(xs)),
+            "top": int(min(ys)),
+            "width": int(max(xs) - min(xs)),
+            "height": int(max(ys) - min(ys)),
+            "line": len(words)
+        })
+    
+    text = "\n".join([res[1] for res in results])
+    avg_confidence = sum([res[2] for res in results]) / len(results) if results else 0
+    return text, int(avg_confidence * 100), words
+
+
+def ocr_image_bytes(image_data: bytes, steps: Optional[List[str]] = None) -> Tuple[str, int, List[Dict]]:
+    """
+    Preprocess and extract text from encoded image bytes (runs in a worker process)
+    Returns: (extracted_text, confidence_score, word_boxes)
+    
+    Each word box is {"text", "conf", "left", "top", "width", "height", "line"}
+    in pixels of the preprocessed image, so later field extraction can locate values.
+    steps overrides OCR_PREPROCESS_STEPS ([] disables preprocessing).
+    """
+    try:
+        with Image.open(BytesIO(image_data)) as original:
+            img, _ = preprocess_image(original, steps)
+            
+            # Try EasyOCR first (better for Indian documents)
+            reader = _get_easyocr_reader()
+            if reader:
+                buffer = BytesIO()
+                img.save(buffer, 'PNG', compress_level=1)
+                return _easyocr_extract(reader, buffer.getvalue())
+            
+            # Fallback to Tesseract
+            return _tesseract_extract(img)
+        
+    except Exception as e:
+        print(f"[!] OCR extraction failed: {e}")
+        return "", 0, []
+
+
+def ocr_image_file(image_path: str) -> Tuple[str, int, List[Dict]]:
+    """
+    Extract text from an image file (runs in a worker process)
+    Returns: (extracted_text, confidence_score, word_boxes)
+    """
+    try:
+        with open(image_path, "rb") as f:
+            return ocr_image_bytes(f.read())
+    except OSError as e:
+        print(f"[!] OCR extraction failed: {e}")
+        return "", 0, []
+
+
+# A text layer shorter than this on a page that also carries images is
+# treated as a scan with a stray caption/stamp and OCR'd instead
+TEXT_LAYER_MIN_CHARS = 40
+# Minimum share of letters, digits, whitespace and common punctuation;
+# broken font encodings produce symbol soup that falls below this
+TEXT_LAYER_MIN_CLEAN_RATIO = 0.85
+TEXT_LAYER_PUNCTUATION = set(".,;:!?'\"()[]{}-/\\&%@#*+=<>_|§₹°")
+
+
+def _text_layer_usable(text: str, has_images: bool) -> bool:
+    """Whether an embedded page text layer can replace OCR"""
+    stripped = text.strip()
+    if len(stripped) < TEXT_LAYER_MIN_CHARS:
+        # Short text is only trustworthy when nothing on the page needs OCR
+        return bool(stripped) and not has_images
+    
+    clean = sum(
+        1 for ch in stripped
+        if ch.isalnum() or ch.isspace() or ch in TEXT_LAYER_PUNCTUATION
+        or '\u0900' <= ch <= '\u097F'  # Devanagari vowel signs are not isalnum
+    )
+    if clean / len(stripped) < TEXT_LAYER_MIN_CLEAN_RATIO:
+        return False
+    
+    # Glyphs without a Unicode mapping come out as U+FFFD or private-use codepoints
+    bad = sum(1 for ch in stripped if ch == '\ufffd' or '\ue000' <= ch <= '\uf8ff')
+    return bad / len(stripped) < 0.01
+
+
+def read_pdf_text_layer(pdf_path: str) -> List[Optional[str]]:
+    """
+    Embedded text per page, or None where the page needs OCR (runs in a worker process)
+    Uses PyMuPDF when installed, else PyPDF2; returns [] if the PDF can't be parsed
+    """
+    try:
+        import fitz  # PyMuPDF
+        
+        pages = []
+        with fitz.open(pdf_path) as doc:
+            for page in doc:
+                text = page.get_text()
+                has_images = bool(page.get_images(full=False))
+                if not text.strip() and not has_images:
+                    pages.append("")  # Blank page: nothing to OCR
+                else:
+                    pages.append(text if _text_layer_usable(text, has_images) else None)
+        return pages
+    except ImportError:
+        pass
+    except Exception as e:
+        print(f"[!] PDF text layer read failed: {e}")
+        return []
+    
+    try:
+        from PyPDF2 import PdfReader
+        
+        reader = PdfReader(pdf_path)
+        pages = []
+        for page in reader.pages:
+            text = page.extract_text() or ""
+            # PyPDF2 can't cheaply tell whether a page has images; assume it might
+            pages.append(text if _text_layer_usable(text, has_images=True) else None)
+        return pages
+    except Exception as e:
+        print(f"[!] PDF text layer read failed: {e}")
+        return []
+
+
+def _contiguous_runs(page_numbers: List[int]) -> List[Tuple[int, int]]:
+    """[1, 2, 3, 7, 9, 10] -> [(1, 3), (7, 7), (9, 10)]"""
+    runs = []
+    for number in sorted(page_numbers):
+        if runs and number == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], number)
+        else:
+            runs.append((number, number))
+    return runs
+
+
+def count_pdf_pages(pdf_path: str) -> int:
+    """Page count via poppler, for PDFs PyMuPDF/PyPDF2 could not parse (runs in a worker process)"""
+    try:
+        return int(pdf2image.pdfinfo_from_path(pdf_path)["Pages"])
+    except Exception as e:
+        print(f"[!] PDF page count failed: {e}")
+        return 0
+
+
+def render_pdf_pages(pdf_path: str, page_numbers: List[int]) -> List[bytes]:
+    """
+    Rasterize a window of PDF pages to PNG bytes (runs in a worker process)
+    Pages stay in memory so concurrent uploads never share temp files; only
+    this window is ever decoded, so memory does not grow with document length
+    
+    Args:
+        pdf_path: Path to PDF file
+        page_numbers: 1-based pages to render
+    
+    Returns:
+        PNG bytes per rendered page, in page order ([] if rendering failed)
+    """
+    pages = []
+    try:
+        for first, last in _contiguous_runs(page_numbers):
+            images = pdf2image.convert_from_path(
+                pdf_path,
+                dpi=settings.OCR_PDF_DPI,
+                grayscale=settings.OCR_PDF_GRAYSCALE,
+                first_page=first,
+                last_page=last,
+                thread_count=settings.OCR_WORKERS
+            )
+            for image in images:
+                buffer = BytesIO()
+                # Light compression: these bytes only travel between local processes
+                image.save(buffer, 'PNG', compress_level=1)
+                image.close()
+                pages.append(buffer.getvalue())
+            del images
+    except Exception as e:
+        print(f"[!] PDF rendering failed: {e}")
+        return []
+    
+    return pages
+
+
+def _report_progress(on_progress: Optional[ProgressCallback], page_results: List[Optional[PageResult]]):
+    """Invoke a progress callback without letting its errors abort OCR"""
+    if on_progress is None or not page_results:
+        return
+    try:
+        on_progress(page_results)
+    except Exception as e:
+        print(f"[!] OCR progress callback failed: {e}")
+
+
+def combine_page_results(page_results: List[Tuple[str, int, List[Dict]]]) -> Tuple[str, int, List[Dict]]:
+    """Join per-page OCR results (in page order) into one text, confidence and word list"""
+    all_text = [text for text, _, _ in page_results]
+    all_confidences = [confidence for _, confidence, _ in page_results]
+    all_words = [
+        dict(word, page=page_number)
+        for page_number, (_, _, words) in enumerate(page_results, start=1)
+        for word in words
+    ]
+    
+    combined_text = "\n\n--- Page Break ---\n\n".join(all_text)
+    avg_confidence = sum(all_confidences) / len(all_confidences) if all_confidences else 0
+    
+    return combined_text, int(avg_confidence), all_words
 
 
 class OCRService:
     """Handle OCR extraction from images and PDFs"""
     
     def __init__(self):
-        self.reader = None
-        if EASYOCR_AVAILABLE:
-            try:
-                self.reader = easyocr.Reader(['en', 'hi'], gpu=False)
-            except Exception as e:
-                print(f"[!] EasyOCR initialization failed: {e}")
-    
-    async def extract_text_from_image(self, image_path: str) -> Tuple[str, int]:
+        # OCR engines live in the worker processes, not in the API process
+        self.executor = ocr_executor
+    
+    def cached_result(self, digest: str) -> Optional[Tuple[str, int, List[Dict]]]:
         """
-        Extract text from image using OCR
-        Returns: (extracted_text, confidence_score)
+        Previously extracted result for identical file bytes
+        
+        Args:
+            digest: SHA-256 of the uploaded file (see ocr_cache.content_hash)
+        
+        Returns:
+            (extracted_text, confidence_score, word_boxes) or None
         """
-        try:
-            # Try EasyOCR first (better for Indian documents)
-            if self.reader:
-                results = self.reader.readtext(image_path)
-                text = "\n".join([res[1] for res in results])
-                avg_confidence = sum([res[2] for res in results]) / len(results) if results else 0
-                confidence = int(avg_confidence * 100)
-                return text, confidence
-            
-            # Fallback to Tesseract
-            img = Image.open(image_path)
-            text = pytesseract.image_to_string(img, lang='eng+hin')
-            
-            # Get confidence from Tesseract
-            data = pytesseract.image_to_data(img, output_type=pytesseract.Output.DICT)
-            confidences = [int(conf) for conf in data['conf'] if conf != '-1']
-            avg_confidence = sum(confidences) / len(confidences) if confidences else 0
-            
-            return text, int(avg_confidence)
-            
-        except Exception as e:
-            print(f"[!] OCR extraction failed: {e}")
-            return "", 0
+        return get_ocr_cache().get_document(ocr_engine_signature(), digest)
     
-    async def extract_text_from_pdf(self, pdf_path: str) -> Tuple[str, int]:
+    async def extract_text_from_image(self, image_path: str, digest: Optional[str] = None) -> Tuple[str, int, List[Dict]]:
+        """
+        Extract text from image using OCR (in the OCR process pool)
+        Returns: (extracted_text, confidence_score, word_boxes)
+        
+        When digest is given the result is cached under it.
         """
-        Extract text from PDF (convert to images first, then OCR)
-        Returns: (extracted_text, confidence_score)
+        result = await self.executor.run(ocr_image_file, image_path)
+        if digest and result[0]:
+            get_ocr_cache().set_document(ocr_engine_signature(), digest, result, [result[1]])
+        return result
+    
+    async def extract_text_from_pdf(
+        self,
+        pdf_path: str,
+        digest: Optional[str] = None,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> Tuple[str, int, List[Dict]]:
+        """
+        Extract text from PDF: use the embedded text layer where it is good,
+        OCR the remaining pages in parallel across the pool, and reassemble
+        everything in page order
+        Returns: (extracted_text, confidence_score, word_boxes)
+        
+        Word boxes carry a 1-based "page" and are only produced for OCR'd pages.
+        Rendered pages already OCR'd in another PDF are served from the page
+        cache; when digest is given the whole result is cached under it.
+        on_progress receives the per-page results (None while a page is
+        pending) each time pages complete.
         """
+        text_layer = await self.executor.run(read_pdf_text_layer, pdf_path)
+        ocr_page_numbers = [number for number, text in enumerate(text_layer, start=1) if text is None]
+        metrics.increment("ocr_pages_text_layer", len(text_layer) - len(ocr_page_numbers))
+        
+        if text_layer:
+            page_results: List[Optional[PageResult]] = [
+                None if text is None else (text, 100, []) for text in text_layer
+            ]
+        else:
+            # Unparseable by PyMuPDF/PyPDF2: fall back to OCR of every page
+            page_results = [None] * await self.executor.run(count_pdf_pages, pdf_path)
+            ocr_page_numbers = list(range(1, len(page_results) + 1))
+        _report_progress(on_progress, page_results)
+        
+        # Render and OCR in windows, rendering the next window while this one is
+        # OCR'd, so at most two windows of page images exist at any time
+        window_size = max(1, settings.OCR_RENDER_WINDOW_PAGES)
+        windows = [ocr_page_numbers[i:i + window_size] for i in range(0, len(ocr_page_numbers), window_size)]
+        next_render = None
         try:
-            # Convert PDF to images
-            images = pdf2image.convert_from_path(pdf_path)
-            
-            all_text = []
-            all_confidences = []
-            
-            for i, image in enumerate(images):
-                # Save temporary image
-                temp_path = f"/tmp/page_{i}.png"
-                image.save(temp_path, 'PNG')
-                
-                # Extract text
-                text, confidence = await self.extract_text_from_image(temp_path)
-                all_text.append(text)
-                all_confidences.append(confidence)
-                
-                # Clean up
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
-            
-            combined_text = "\n\n--- Page Break ---\n\n".join(all_text)
-            avg_confidence = sum(all_confidences) / len(all_confidences) if all_confidences else 0
-            
-            return combined_text, int(avg_confidence)
-            
-        except Exception as e:
-            print(f"[!] PDF OCR extraction failed: {e}")
-            return "", 0
+            for k, window in enumerate(windows):
+                if next_render is None:
+                    pages = await self.executor.run(render_pdf_pages, pdf_path, window)
+                else:
+                    pages = await next_render
+                next_render = (
+                    asyncio.create_task(self.executor.run(render_pdf_pages, pdf_path, windows[k + 1]))
+                    if k + 1 < len(windows) else None
+                )
+                await self._ocr_pages(pages, window[:len(pages)], page_results, on_progress)
+                del pages
+        finally:
+            if next_render is not None:
+                next_render.cancel()
+        
+        # Pages that failed to render count as empty
+        page_results = [page or ("", 0, []) for page in page_results]
+        result = combine_page_results(page_results)
+        if digest and result[0]:
+            page_confidences = [confidence for _, confidence, _ in page_results]
+            get_ocr_cache().set_document(ocr_engine_signature(), digest, result, page_confidences)
+        return result
+    
+    async def _ocr_pages(
+        self,
+        pages: List[bytes],
+        page_numbers: List[int],
+        page_results: List[Optional[PageResult]],
+        on_progress: Optional[ProgressCallback]
+    ):
+        """
+        OCR rendered page images into page_results (in place), reusing
+        page-cache hits and caching the rest as each page finishes
+        """
+        cache = get_ocr_cache()
+        signature = ocr_engine_signature()
+        digests = [content_hash(page) for page in pages]
+        
+        missing = []
+        for i, (number, digest) in enumerate(zip(page_numbers, digests)):
+            cached = cache.get_page(signature, digest)
+            if cached is None:
+                missing.append(i)
+            else:
+                page_results[number - 1] = cached
+        _report_progress(on_progress, page_results)
+        
+        def page_done(index: int, result: PageResult):
+            i = missing[index]
+            page_results[page_numbers[i] - 1] = result
+            if result[0]:
+                cache.set_page(signature, digests[i], result)
+            _report_progress(on_progress, page_results)
+        
+        await self.executor.map(ocr_image_bytes, [(pages[i],) for i in missing], on_result=page_done)
+        metrics.increment("ocr_pages_ocr", len(missing))
 
 
 class CaseExtractor:
     """Extract structured case information from raw text"""
     
+    # Which document wins when a bundle's files disagree on a field
+    DOCUMENT_PRIORITY = {"fir": 0, "chargesheet": 1, "statement": 2, "notes": 3, "general": 4}
+    # Filename hints for the document type of bundle files
+    FILENAME_TYPE_HINTS = (
+        ("chargesheet", "chargesheet"), ("charge_sheet", "chargesheet"), ("charge-sheet", "chargesheet"),
+        ("fir", "fir"), ("statement", "statement"), ("note", "notes"),
+    )
+    
+    # Single-value fields that can be mapped back to OCR word boxes
+    LOCATABLE_FIELDS = (
+        "petitioner", "respondent", "accused", "complainant",
+        "fir_number", "police_station", "place"
+    )
+    
     def __init__(self):
         # Common Indian legal sections patterns
         self.section_patterns = [
@@ -118,11 +499,23 @@ class CaseExtractor:
         # Name patterns (common in FIRs)
         self.name_pattern = r'(?:Name|Accused|Complainant|Petitioner|Respondent)\s*:?\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'
     
-    async def extract_case_info(self, text: str, document_type: str = "general") -> Dict:
+    async def extract_case_info(
+        self,
+        text: str,
+        document_type: str = "general",
+        words: Optional[List[Dict]] = None
+    ) -> Dict:
         """
         Extract structured information from OCR text
         Returns dictionary with extracted fields
+        
+        When OCR word boxes are given, single-value fields also get a
+        "field_locations" entry (page, box and lowest word confidence).
         """
+        return self.extract(text, document_type, words)
+    
+    def extract(self, text: str, document_type: str = "general", words: Optional[List[Dict]] = None) -> Dict:
+        """Synchronous extract_case_info (pure regex work, safe to call from callbacks)"""
         extracted_data = {
             "petitioner": None,
             "respondent": None,
@@ -173,8 +566,118 @@ class CaseExtractor:
             extracted_data["facts"] = facts
             extracted_data["extracted_fields"].append("facts")
         
+        if words:
+            extracted_data["field_locations"] = self._locate_fields(extracted_data, words)
+        
         return extracted_data
     
+    def _locate_fields(self, extracted_data: Dict, words: List[Dict]) -> Dict[str, Dict]:
+        """Find each extracted value's word run in the OCR boxes"""
+        def normalize(token: str) -> str:
+            return re.sub(r'[^\w/]', '', token).lower()
+        
+        normalized = [normalize(word["text"]) for word in words]
+        locations = {}
+        
+        for field in self.LOCATABLE_FIELDS:
+            value = extracted_data.get(field)
+            if not value:
+                continue
+            tokens = [normalize(token) for token in str(value).split()]
+            tokens = [token for token in tokens if token]
+            if not tokens:
+                continue
+            
+            for start in range(len(words) - len(tokens) + 1):
+                run = words[start:start + len(tokens)]
+                if normalized[start:start + len(tokens)] != tokens:
+                    continue
+                if len({word.get("page", 1) for word in run}) > 1:
+                    continue
+                left = min(word["left"] for word in run)
+                top = min(word["top"] for word in run)
+                locations[field] = {
+                    "page": run[0].get("page", 1),
+                    "left": left,
+                    "top": top,
+                    "width": max(word["left"] + word["width"] for word in run) - left,
+                    "height": max(word["top"] + word["height"] for word in run) - top,
+                    "conf": min(word["conf"] for word in run)
+                }
+                break
+        
+        return locations
+    
+    def guess_document_type(self, filename: str, default: str = "general") -> str:
+        """Document type from a bundle file's name (e.g. 'FIR_245.pdf' -> 'fir')"""
+        name = os.path.basename(filename).lower()
+        tokens = set(re.split(r'[^a-z]+', name))
+        for hint, document_type in self.FILENAME_TYPE_HINTS:
+            if hint in tokens or (len(hint) > 3 and hint in name):
+                return document_type
+        return default
+    
+    def merge_case_info(self, documents: List[Dict]) -> Dict:
+        """
+        Merge the extracted data of a case bundle into one view
+        
+        Args:
+            documents: [{"document_id", "filename", "document_type", "extracted_data"}]
+                for the completed files of the bundle
+        
+        Returns:
+            extract_case_info-shaped dict where single-value fields come from the
+            highest-priority document (FIR first), list fields are unioned, and
+            "sources"/"conflicts" record which files supplied or disagree on a value
+        """
+        ordered = sorted(
+            documents,
+            key=lambda doc: (self.DOCUMENT_PRIORITY.get(doc.get("document_type") or "general", 99), doc["document_id"])
+        )
+        merged = {
+            "petitioner": None,
+            "respondent": None,
+            "accused": None,
+            "complainant": None,
+            "sections": [],
+            "dates": [],
+            "facts": None,
+            "fir_number": None,
+            "police_station": None,
+            "place": None,
+            "extracted_fields": [],
+            "sources": {},
+            "conflicts": {}
+        }
+        
+        for field in self.LOCATABLE_FIELDS + ("facts",):
+            found = [
+                (doc, doc["extracted_data"][field]) for doc in ordered
+                if (doc.get("extracted_data") or {}).get(field)
+            ]
+            if not found:
+                continue
+            chosen_doc, value = found[0]
+            merged[field] = value
+            merged["sources"][field] = chosen_doc["document_id"]
+            merged["extracted_fields"].append(field)
+            distinct = {re.sub(r'\s+', ' ', str(v)).strip().lower() for _, v in found}
+            if field != "facts" and len(distinct) > 1:
+                merged["conflicts"][field] = [
+                    {"document_id": doc["document_id"], "filename": doc["filename"], "value": v}
+                    for doc, v in found
+                ]
+        
+        for field in ("sections", "dates"):
+            values = set()
+            for doc in ordered:
+                values.update((doc.get("extracted_data") or {}).get(field) or [])
+            if values:
+                merged[field] = sorted(values)
+                merged["extracted_fields"].append(field)
+        
+        return merged
+    
     def _extract_names(self, text: str) -> Dict[str, str]:
         """Extract petitioner, respondent, accused, complainant names"""
         names = {}
@@ -0,0 +1,146 @@
+"""
+Multi-Pattern Phrase Matcher
+Aho-Corasick automaton over word tokens for extracting legal phrases in one pass
+"""
+
+import re
+from collections import deque
+from typing import Dict, List, Tuple, Iterable, Iterator, Optional
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Dropped on both sides so "section 302 of the ipc" matches "section 302 ipc"
+FILLER_TOKENS = {"of", "the"}
+
+
+def phrase_tokens(text: str) -> List[str]:
+    """Tokenize the same way for patterns and documents"""
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in FILLER_TOKENS]
+
+
+class AhoCorasickMatcher:
+    """
+    Aho-Corasick automaton whose alphabet is word tokens
+
+    Matching on tokens instead of characters gives whole-word matches for
+    free and keeps the Python loop to one step per word, so a long draft is
+    scanned in a few milliseconds regardless of vocabulary size.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, str, float]]):
+        """
+        Args:
+            patterns: (phrase, canonical term, weight) triples; several
+                phrases may map to the same canonical term
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Outputs per state: (canonical term, weight, phrase length in tokens)
+        self._outputs: List[List[Tuple[str, float, int]]] = [[]]
+        self.pattern_count = 0
+
+        for phrase, term, weight in patterns:
+            tokens = phrase_tokens(phrase)
+            if tokens:
+                self._add(tokens, term, weight)
+                self.pattern_count += 1
+
+        self._build_failure_links()
+
+    def _add(self, tokens: List[str], term: str, weight: float):
+        state = 0
+        for token in tokens:
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][token] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        self._outputs[state].append((term, weight, len(tokens)))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(token, 0)
+                if self._fail[child] == child:
+                    self._fail[child] = 0
+                # Inherit matches that end at the failure state (suffix phrases)
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str, float, int]]:
+        """Yield (end token index, term, weight, length) for every match"""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        state = 0
+
+        for position, token in enumerate(phrase_tokens(text)):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for term, weight, length in outputs[state]:
+                yield position, term, weight, length
+
+    def iter_longest_matches(self, text: str) -> Iterator[Tuple[int, str, float, int]]:
+        """
+        Like iter_matches, but resolve overlaps leftmost-longest: a match
+        inside (or overlapping) an already chosen one is dropped, so "u s 302"
+        is not also counted as "s 302". Other terms spanning exactly the
+        chosen tokens are kept; each term is yielded once per span.
+        """
+        matches = sorted(
+            self.iter_matches(text),
+            key=lambda match: (match[0] - match[3], -match[3], -match[2])  # start, longest, heaviest
+        )
+        covered_until = -1
+        chosen_span = None
+        chosen_terms = set()
+        for end, term, weight, length in matches:
+            start = end - length + 1
+            if (start, end) != chosen_span:
+                if start <= covered_until:
+                    continue
+                chosen_span = (start, end)
+                chosen_terms = set()
+                covered_until = end
+            if term not in chosen_terms:
+                chosen_terms.add(term)
+                yield end, term, weight, length
+
+    def extract(self, text: str) -> Dict[str, Dict[str, float]]:
+        """
+        Count every matched canonical term in a single linear pass
+
+        Overlapping phrases count once, as the leftmost-longest match.
+
+        Returns:
+            {term: {"count": n, "weight": phrase weight}}
+        """
+        hits: Dict[str, Dict[str, float]] = {}
+        for _, term, weight, _ in self.iter_longest_matches(text):
+            entry = hits.get(term)
+            if entry is None:
+                hits[term] = {"count": 1, "weight": weight}
+            else:
+                entry["count"] += 1
+                entry["weight"] = max(entry["weight"], weight)
+        return hits
+
+    def weighted_query(self, text: str, max_terms: Optional[int] = None) -> Dict[str, float]:
+        """
+        Turn matched phrases into a {term: weight} query
+
+        Repeated mentions add weight with diminishing returns.
+        """
+        scored = {
+            term: hit["weight"] * (1 + hit["count"]) ** 0.5
+            for term, hit in self.extract(text).items()
+        }
+        ranked = sorted(scored.items(), key=lambda item: item[1], reverse=True)
+        return dict(ranked[:max_terms] if max_terms else ranked)
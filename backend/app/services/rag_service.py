@@ -4,48 +4,91 @@ RAG (Retrieval Augmented Generation) Service for Legal Knowledge
 
 from typing import List, Dict, Optional
 from app.core.config import settings
+from app.services.index_snapshots import IndexSnapshotManager, SnapshotConflictError
 import os
+import shutil
+import threading
+import time
 
 class LegalRAGService:
     """RAG service for legal knowledge retrieval"""
     
+    # Rebuilds of an add_legal_knowledge write that lost a race with another publisher
+    PUBLISH_RETRIES = 3
+    
     def __init__(self):
         """Initialize embeddings and vector store"""
         # Lazy imports to avoid loading heavy dependencies on startup
         from langchain_community.embeddings import HuggingFaceEmbeddings
-        from langchain_community.vectorstores import FAISS
         
         self.embeddings = HuggingFaceEmbeddings(
             model_name=settings.EMBEDDING_MODEL
         )
         
         self.vector_store_path = settings.VECTOR_DB_PATH
-        self.vector_store = None
+        self.snapshots = IndexSnapshotManager(self.vector_store_path)
+        
+        # (snapshot version, vector store) - replaced as a single reference so
+        # queries always see a consistent pair; in-flight queries keep the old one
+        self._active = (None, None)
+        self._reload_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._manifest_mtime = 0.0
+        self._last_watch_check = 0.0
         
         # Initialize or load vector store
         self._load_or_create_vector_store()
     
+    @property
+    def vector_store(self):
+        return self._active[1]
+    
+    @property
+    def snapshot_version(self) -> Optional[str]:
+        return self._active[0]
+    
+    def _load_snapshot(self, version: str):
+        """Load an immutable snapshot into a fresh FAISS store"""
+        from langchain_community.vectorstores import FAISS
+        
+        return FAISS.load_local(
+            self.snapshots.snapshot_path(version),
+            self.embeddings
+        )
+    
+    def _publish_store(self, store, base_version: Optional[str] = None, check_base: bool = False) -> str:
+        """Write a store as a new snapshot and atomically make it current"""
+        staging = self.snapshots.staging_dir()
+        store.save_local(staging)
+        try:
+            return self.snapshots.publish(staging, base_version, check_base)
+        except SnapshotConflictError:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+    
     def _load_or_create_vector_store(self):
         """Load existing vector store or create new one"""
-        from langchain_community.vectorstores import FAISS
+        # Adopt an index saved at the root by older versions
+        self.snapshots.migrate_legacy_index()
         
-        index_path = os.path.join(self.vector_store_path, "index.faiss")
+        version = self.snapshots.current_version()
+        self._manifest_mtime = self.snapshots.manifest_mtime()
         
-        if os.path.exists(index_path):
+        if version:
             try:
-                self.vector_store = FAISS.load_local(
-                    self.vector_store_path,
-                    self.embeddings
-                )
-                print("✅ Loaded existing legal knowledge vector store")
+                self._active = (version, self._load_snapshot(version))
+                print(f"✅ Loaded legal knowledge vector store snapshot {version}")
+                return
             except Exception as e:
                 print(f"⚠️ Error loading vector store: {e}")
-                self._create_default_vector_store()
-        else:
-            self._create_default_vector_store()
+        
+        self._create_default_vector_store()
     
     def _create_default_vector_store(self):
         """Create default vector store with sample legal knowledge"""
+        from langchain_community.vectorstores import FAISS
+        from langchain_core.documents import Document
+        
         sample_docs = [
             Document(
                 page_content="Indian Penal Code Section 302: Murder - Whoever commits murder shall be punished with death or imprisonment for life, and shall also be liable to fine.",
@@ -61,27 +104,70 @@ class LegalRAGService:
             ),
         ]
         
-        self.vector_store = FAISS.from_documents(
+        store = FAISS.from_documents(
             sample_docs,
             self.embeddings
         )
         
-        # Save the vector store
-        os.makedirs(self.vector_store_path, exist_ok=True)
-        self.vector_store.save_local(self.vector_store_path)
+        # Save the vector store as the first snapshot
+        version = self._publish_store(store)
+        self._active = (version, store)
+        self._manifest_mtime = self.snapshots.manifest_mtime()
         print("✅ Created new legal knowledge vector store")
     
+    def reload(self) -> Dict[str, any]:
+        """
+        Hot-swap to the snapshot named in the manifest
+        
+        The new snapshot is loaded off to the side and swapped in with a single
+        reference assignment, so queries never wait on a reload. Retired
+        snapshots are garbage-collected once their grace period has passed.
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            return {"reloaded": False, "version": self.snapshot_version, "reason": "reload in progress"}
+        
+        try:
+            # Only recorded once the load succeeds, so a failed reload is retried
+            manifest_mtime = self.snapshots.manifest_mtime()
+            version = self.snapshots.current_version()
+            previous = self.snapshot_version
+            
+            if not version or version == previous:
+                self._manifest_mtime = manifest_mtime
+                return {"reloaded": False, "version": previous, "reason": "already current"}
+            
+            self._active = (version, self._load_snapshot(version))
+            self._manifest_mtime = manifest_mtime
+            removed = self.snapshots.garbage_collect(settings.INDEX_SNAPSHOT_GRACE_SECONDS)
+            print(f"✅ Swapped vector store snapshot {previous} -> {version}")
+            
+            return {"reloaded": True, "version": version, "previous_version": previous, "snapshots_removed": removed}
+        finally:
+            self._reload_lock.release()
+    
+    def watch_for_new_snapshot(self):
+        """Poll the manifest (throttled) and reload in the background when it changes"""
+        now = time.monotonic()
+        if now - self._last_watch_check < settings.INDEX_WATCH_INTERVAL_SECONDS:
+            return
+        self._last_watch_check = now
+        
+        if self.snapshots.manifest_mtime() != self._manifest_mtime and not self._reload_lock.locked():
+            threading.Thread(target=self.reload, daemon=True).start()
+    
     def search_relevant_sections(
         self,
         query: str,
         k: int = 5
     ) -> List[Dict[str, any]]:
         """Search for relevant legal sections"""
-        if not self.vector_store:
+        self.watch_for_new_snapshot()
+        store = self.vector_store
+        if not store:
             return []
         
         # Perform similarity search
-        results = self.vector_store.similarity_search_with_score(query, k=k)
+        results = store.similarity_search_with_score(query, k=k)
         
         # Format results
         formatted_results = []
@@ -99,17 +185,40 @@ class LegalRAGService:
         content: str,
         metadata: Dict[str, any]
     ) -> bool:
-        """Add new legal knowledge to vector store"""
+        """
+        Add new legal knowledge to vector store (published as a new snapshot)
+        
+        The copy is based on the manifest's current snapshot, which may be
+        newer than the one being served if another process published; if yet
+        another snapshot lands before ours is published, the copy is rebuilt.
+        """
+        from langchain_community.vectorstores import FAISS
+        from langchain_core.documents import Document
+        
         try:
             doc = Document(page_content=content, metadata=metadata)
             
-            if self.vector_store:
-                self.vector_store.add_documents([doc])
-                self.vector_store.save_local(self.vector_store_path)
-            else:
-                self.vector_store = FAISS.from_documents([doc], self.embeddings)
-                self.vector_store.save_local(self.vector_store_path)
+            with self._write_lock:
+                for attempt in range(self.PUBLISH_RETRIES):
+                    # Never mutate the live store: copy it from its snapshot, then swap
+                    version = self.snapshots.current_version()
+                    if version:
+                        store = self._load_snapshot(version)
+                        store.add_documents([doc])
+                    else:
+                        store = FAISS.from_documents([doc], self.embeddings)
+                    
+                    try:
+                        new_version = self._publish_store(store, version, check_base=True)
+                        break
+                    except SnapshotConflictError:
+                        if attempt == self.PUBLISH_RETRIES - 1:
+                            raise
+                
+                self._active = (new_version, store)
+                self._manifest_mtime = self.snapshots.manifest_mtime()
             
+            self.snapshots.garbage_collect(settings.INDEX_SNAPSHOT_GRACE_SECONDS)
             return True
         except Exception as e:
             print(f"Error adding legal knowledge: {e}")
@@ -119,20 +228,33 @@ class LegalRAGService:
         self,
         query: str,
         case_type: Optional[str] = None,
-        k: int = 5
+        k: int = 5,
+        rerank: Optional[bool] = None,
+        rerank_budget_ms: Optional[float] = None
     ) -> List[Dict[str, any]]:
-        """Search for relevant case laws"""
-        if not self.vector_store:
+        """
+        Search for relevant case laws
+        
+        With re-ranking enabled (per call or via RERANK_ENABLED), the top
+        RERANK_CANDIDATES bi-encoder hits are re-scored by a cross-encoder
+        within rerank_budget_ms and the best k are returned.
+        """
+        self.watch_for_new_snapshot()
+        store = self.vector_store
+        if not store:
             return []
         
+        use_rerank = settings.RERANK_ENABLED if rerank is None else rerank
+        fetch_k = max(k, settings.RERANK_CANDIDATES) if use_rerank else k
+        
         # Add filter for case type if provided
         filter_dict = {"category": "case_law"}
         if case_type:
             filter_dict["case_type"] = case_type
         
-        results = self.vector_store.similarity_search_with_score(
+        results = store.similarity_search_with_score(
             query,
-            k=k,
+            k=fetch_k,
             filter=filter_dict if case_type else None
         )
         
@@ -144,6 +266,10 @@ class LegalRAGService:
                 "relevance_score": float(1 - score)
             })
         
+        if use_rerank and formatted_results:
+            from app.services.rerank_service import get_reranker
+            return get_reranker().rerank(query, formatted_results, top_k=k, budget_ms=rerank_budget_ms)
+        
         return formatted_results
 
 # Lazy singleton instance
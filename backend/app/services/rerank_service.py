@@ -0,0 +1,173 @@
+"""
+Cross-Encoder Re-ranking Service
+Re-scores bi-encoder candidates with a small CPU cross-encoder under a latency budget
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+
+class CrossEncoderReranker:
+    """Re-rank retrieval candidates by scoring (query, passage) pairs jointly"""
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        cache_size: Optional[int] = None
+    ):
+        self.model_name = model_name or settings.RERANK_MODEL
+        self.batch_size = batch_size or settings.RERANK_BATCH_SIZE
+        self.cache_size = cache_size or settings.RERANK_CACHE_SIZE
+        self._model = None
+        self._model_lock = threading.Lock()
+
+        # (query hash, doc id) -> cross-encoder score, LRU ordered
+        self._cache: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def _get_model(self):
+        """Load the cross-encoder on first use (or at startup, see warm_up)"""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    started = time.perf_counter()
+                    from sentence_transformers import CrossEncoder
+                    self._model = CrossEncoder(self.model_name, device="cpu")
+                    metrics.observe("rerank_model_load_ms", (time.perf_counter() - started) * 1000)
+        return self._model
+
+    def warm_up(self):
+        """Load the model now so no request pays for it (called at startup when RERANK_ENABLED)"""
+        self._get_model()
+
+    @staticmethod
+    def _query_hash(query: str) -> str:
+        normalized = " ".join(query.lower().split())
+        return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _doc_id(candidate: Dict) -> str:
+        """
+        Cache id for a candidate: a hash of the passage text it is scored on
+
+        Passages of one judgment share its judgment_id and citation, so
+        metadata ids would make them share one cached score.
+        """
+        return hashlib.sha1(candidate.get("content", "").encode("utf-8")).hexdigest()
+
+    def _cache_get(self, key: Tuple[str, str]) -> Optional[float]:
+        with self._cache_lock:
+            score = self._cache.get(key)
+            if score is not None:
+                self._cache.move_to_end(key)
+            return score
+
+    def _cache_put(self, key: Tuple[str, str], score: float):
+        with self._cache_lock:
+            self._cache[key] = score
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def rerank(
+        self,
+        query: str,
+        candidates: List[Dict],
+        top_k: int,
+        budget_ms: Optional[float] = None
+    ) -> List[Dict]:
+        """
+        Re-rank candidates, stopping early when the latency budget runs out
+
+        Args:
+            query: User query
+            candidates: Bi-encoder results (content, metadata, relevance_score), best first
+            top_k: Number of results to return
+            budget_ms: Per-request latency budget in milliseconds
+
+        Returns:
+            Top-k candidates; re-scored ones first (by cross-encoder score),
+            followed by any unscored ones in their original order
+        """
+        # A first-use model load is a one-off cost, not scoring time: keep it
+        # out of the budget so the first request isn't cut short
+        model = self._get_model()
+
+        started = time.perf_counter()
+        budget_ms = budget_ms if budget_ms is not None else settings.RERANK_BUDGET_MS
+        deadline = started + budget_ms / 1000.0
+
+        query_hash = self._query_hash(query)
+        scores: Dict[int, float] = {}
+        pending: List[int] = []
+
+        for i, candidate in enumerate(candidates):
+            cached = self._cache_get((query_hash, self._doc_id(candidate)))
+            if cached is not None:
+                scores[i] = cached
+            else:
+                pending.append(i)
+
+        metrics.increment("rerank_cache_hits", len(scores))
+        metrics.increment("rerank_cache_misses", len(pending))
+
+        partial = False
+        last_batch_seconds = 0.0
+
+        # Candidates arrive best-first, so scoring in order keeps the most
+        # promising ones inside the budget
+        for offset in range(0, len(pending), self.batch_size):
+            now = time.perf_counter()
+            if now + last_batch_seconds > deadline:
+                partial = True
+                break
+
+            batch = pending[offset:offset + self.batch_size]
+            pairs = [(query, candidates[i].get("content", "")) for i in batch]
+            batch_scores = model.predict(pairs, batch_size=self.batch_size)
+
+            for i, score in zip(batch, batch_scores):
+                scores[i] = float(score)
+                self._cache_put((query_hash, self._doc_id(candidates[i])), float(score))
+
+            last_batch_seconds = time.perf_counter() - now
+
+        reranked = sorted(scores, key=lambda i: scores[i], reverse=True)
+        unscored = [i for i in range(len(candidates)) if i not in scores]
+
+        results = []
+        for i in (reranked + unscored)[:top_k]:
+            results.append({
+                **candidates[i],
+                "rerank_score": scores.get(i),
+                "reranked": i in scores
+            })
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        metrics.observe("rerank_added_latency_ms", elapsed_ms)
+        if partial:
+            metrics.increment("rerank_partial")
+
+        return results
+
+    def get_latency_stats(self) -> Optional[Dict[str, float]]:
+        """Extra latency (p50/p95) added by the re-ranking stage"""
+        return metrics.summary("rerank_added_latency_ms")
+
+
+# Lazy singleton instance
+_reranker_instance = None
+
+def get_reranker():
+    """Get or create the re-ranker singleton instance"""
+    global _reranker_instance
+    if _reranker_instance is None:
+        _reranker_instance = CrossEncoderReranker()
+    return _reranker_instance
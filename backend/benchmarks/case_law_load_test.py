@@ -0,0 +1,81 @@
+"""
+Case-Law Search Load Test
+Drives CaseLawService's Indian Kanoon calls against the local stand-in
+and reports latency percentiles, throughput, retries and connections opened
+
+Usage (from backend/):
+    python -m benchmarks.case_law_load_test --requests 2000 --concurrency 64 --error-rate 0.02
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from app.core.metrics import metrics
+from app.core.http_client import http_client
+from app.services.case_law_service import CaseLawService
+from benchmarks.kanoon_standin import StandInKanoonServer
+
+
+async def run_load(service: CaseLawService, total: int, concurrency: int) -> dict:
+    """Fire `total` searches with at most `concurrency` in flight"""
+    gate = asyncio.Semaphore(concurrency)
+    latencies, empty = [], 0
+
+    async def one(i: int):
+        nonlocal empty
+        async with gate:
+            started = time.perf_counter()
+            # Remote path only: the local mirror would answer repeat queries itself
+            try:
+                cases = await service._search_remote(f"anticipatory bail section 438 query {i}", 5)
+            except Exception:
+                cases = []
+            latencies.append((time.perf_counter() - started) * 1000)
+            empty += not cases
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - started
+    await http_client.aclose()
+
+    latencies.sort()
+    pick = lambda p: round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 2)
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "throughput_rps": round(total / elapsed, 1),
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "failed_searches": empty,
+        "client_retries": metrics.counter("http_retries"),
+        "http2": http_client.http2
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Case-law search load test")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency-ms", type=float, default=40.0, help="Stand-in mean response time")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Stand-in 503 rate (exercises retries)")
+    args = parser.parse_args()
+
+    server = StandInKanoonServer(latency_ms=args.latency_ms, error_rate=args.error_rate)
+    server.start_in_background()
+
+    service = CaseLawService()
+    service.base_url = server.url
+    service.api_token = "load-test"
+
+    report = asyncio.run(run_load(service, args.requests, args.concurrency))
+    report["server"] = dict(server.stats)
+    server.shutdown()
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
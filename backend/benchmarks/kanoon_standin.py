@@ -0,0 +1,126 @@
+"""
+Indian Kanoon Stand-in Server
+Local HTTP server answering /search/ with Indian Kanoon-shaped JSON so the
+case-law client can be load-tested offline
+
+Usage (from backend/):
+    python -m benchmarks.kanoon_standin --port 8765 --latency-ms 40 --error-rate 0.05
+Then point INDIAN_KANOON_API_URL=http://127.0.0.1:8765 and set any token.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+from benchmarks.synthetic_corpus import generate_passages
+
+
+def _case_title(text: str) -> str:
+    """Synthetic passages start with "<Party> v. State of <State>." """
+    petitioner, _, rest = text.partition(" v. ")
+    return f"{petitioner} v. {rest.split('. ')[0]}"
+
+
+class StandInKanoonServer(ThreadingHTTPServer):
+    """Threaded keep-alive server with configurable latency and failure rate"""
+
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, latency_ms: float = 40.0, error_rate: float = 0.0,
+                 corpus_size: int = 2000, seed: int = 42):
+        super().__init__(("127.0.0.1", port), _SearchHandler)
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.passages = list(generate_passages(corpus_size, seed=seed))
+        self.stats_lock = threading.Lock()
+        self.stats = {"connections": 0, "requests": 0, "errors": 0}
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def count(self, name: str):
+        with self.stats_lock:
+            self.stats[name] += 1
+
+    def start_in_background(self) -> threading.Thread:
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+class _SearchHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, so connection reuse is visible
+
+    def setup(self):
+        super().setup()
+        self.server.count("connections")
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        server = self.server
+        server.count("requests")
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        parts = urlsplit(self.path)
+        if parts.path.rstrip("/") != "/search":
+            return self._reply(404, {"errmsg": "not found"})
+        if not self.headers.get("Authorization", "").startswith("Token "):
+            return self._reply(403, {"errmsg": "missing token"})
+
+        time.sleep(server.latency_ms / 1000.0 * (0.5 + server.random.random()))
+        if server.random.random() < server.error_rate:
+            server.count("errors")
+            return self._reply(503, {"errmsg": "temporarily unavailable"})
+
+        query = parse_qs(parts.query).get("formInput", [""])[0]
+        sample = server.random.sample(server.passages, k=min(10, len(server.passages)))
+        self._reply(200, {
+            "found": f"1 - {len(sample)} of {len(server.passages)}",
+            "docs": [
+                {
+                    "tid": int(p["id"][1:]),
+                    "title": _case_title(p["text"]),
+                    "headline": f"{query} ... {p['text'][:200]}",
+                    "docsource": "Supreme Court of India",
+                    "publishdate": f"{2000 + int(p['id'][1:]) % 24}-01-15",
+                    "citation": p["citation"]
+                }
+                for p in sample
+            ]
+        })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Indian Kanoon stand-in server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=40.0, help="Mean simulated response time")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 503")
+    args = parser.parse_args()
+
+    server = StandInKanoonServer(args.port, args.latency_ms, args.error_rate)
+    print(f"Indian Kanoon stand-in listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(f"Stats: {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+"""
+Retrieval Benchmark Suite
+Measures build time, memory, query latency, concurrent QPS and recall@k
+for each vector index configuration as the corpus grows
+
+Usage (from backend/):
+    python -m benchmarks.retrieval_benchmark --sizes 10000,100000,1000000 --output bench.json
+"""
+
+import argparse
+import gc
+import hashlib
+import json
+import os
+import platform
+import re
+import resource
+import subprocess
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Callable, Optional
+
+import numpy as np
+
+from benchmarks.synthetic_corpus import build_dataset
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+# ========== EMBEDDERS ==========
+
+class HashingEmbedder:
+    """
+    Deterministic feature-hashing embedder (unigrams + bigrams)
+
+    Lets the harness build 1M-passage indexes in minutes; use
+    --embedder model to benchmark with the production sentence-transformer.
+    """
+
+    name = "hashing"
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def _bucket(self, token: str) -> int:
+        return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little") % self.dim
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = TOKEN_PATTERN.findall(text.lower())
+            for token in tokens + [f"{a}_{b}" for a, b in zip(tokens, tokens[1:])]:
+                vectors[row, self._bucket(token)] += 1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-9)
+
+
+class ModelEmbedder:
+    """Production embedding model (settings.EMBEDDING_MODEL)"""
+
+    name = "model"
+
+    def __init__(self):
+        from sentence_transformers import SentenceTransformer
+        from app.core.config import settings
+
+        self.model = SentenceTransformer(settings.EMBEDDING_MODEL)
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        return self.model.encode(texts, batch_size=64, normalize_embeddings=True,
+                                 show_progress_bar=False).astype(np.float32)
+
+
+def embed_corpus(embedder, texts: List[str], batch_size: int = 4096) -> np.ndarray:
+    """Embed in batches into one preallocated matrix"""
+    matrix = np.empty((len(texts), embedder.dim), dtype=np.float32)
+    for start in range(0, len(texts), batch_size):
+        matrix[start:start + batch_size] = embedder.encode(texts[start:start + batch_size])
+    return matrix
+
+
+# ========== INDEX CONFIGURATIONS ==========
+
+class IndexConfig(ABC):
+    """A buildable index exposing search(query_vector, k) -> passage ids"""
+
+    name = "base"
+
+    @abstractmethod
+    def build(self, ids: List[str], texts: List[str], vectors: np.ndarray):
+        ...
+
+    @abstractmethod
+    def search(self, query_vector: np.ndarray, k: int) -> List[str]:
+        ...
+
+
+class FaissFlatConfig(IndexConfig):
+    """Exact inner-product search"""
+
+    name = "faiss_flat"
+
+    def build(self, ids, texts, vectors):
+        import faiss
+        self.ids = ids
+        self.index = faiss.IndexFlatIP(vectors.shape[1])
+        self.index.add(vectors)
+
+    def search(self, query_vector, k):
+        _, rows = self.index.search(query_vector.reshape(1, -1), k)
+        return [self.ids[r] for r in rows[0] if r >= 0]
+
+
+class FaissHNSWConfig(IndexConfig):
+    """Graph-based approximate search"""
+
+    name = "faiss_hnsw"
+
+    def __init__(self, m: int = 32, ef_search: int = 64):
+        self.m = m
+        self.ef_search = ef_search
+
+    def build(self, ids, texts, vectors):
+        import faiss
+        self.ids = ids
+        self.index = faiss.IndexHNSWFlat(vectors.shape[1], self.m, faiss.METRIC_INNER_PRODUCT)
+        self.index.hnsw.efSearch = self.ef_search
+        self.index.add(vectors)
+
+    def search(self, query_vector, k):
+        _, rows = self.index.search(query_vector.reshape(1, -1), k)
+        return [self.ids[r] for r in rows[0] if r >= 0]
+
+
+class FaissIVFConfig(IndexConfig):
+    """Inverted-file approximate search (nlist ~ 4 * sqrt(N))"""
+
+    name = "faiss_ivf"
+
+    def __init__(self, nprobe: int = 16):
+        self.nprobe = nprobe
+
+    def build(self, ids, texts, vectors):
+        import faiss
+        self.ids = ids
+        nlist = max(1, int(4 * np.sqrt(len(ids))))
+        quantizer = faiss.IndexFlatIP(vectors.shape[1])
+        self.index = faiss.IndexIVFFlat(quantizer, vectors.shape[1], nlist, faiss.METRIC_INNER_PRODUCT)
+        sample = vectors[np.random.default_rng(0).choice(len(ids), min(len(ids), nlist * 64), replace=False)]
+        self.index.train(sample)
+        self.index.add(vectors)
+        self.index.nprobe = self.nprobe
+
+    def search(self, query_vector, k):
+        _, rows = self.index.search(query_vector.reshape(1, -1), k)
+        return [self.ids[r] for r in rows[0] if r >= 0]
+
+
+class RAGServiceConfig(IndexConfig):
+    """The LangChain FAISS store used by LegalRAGService"""
+
+    name = "rag_service_faiss"
+
+    def build(self, ids, texts, vectors):
+        from langchain_community.vectorstores import FAISS
+        from langchain_core.embeddings import Embeddings
+
+        class _Precomputed(Embeddings):
+            def embed_documents(self, docs):
+                raise RuntimeError("Corpus embeddings are precomputed")
+
+            def embed_query(self, text):
+                raise RuntimeError("Query embeddings are precomputed")
+
+        self.store = FAISS.from_embeddings(
+            text_embeddings=list(zip(texts, vectors.tolist())),
+            embedding=_Precomputed(),
+            metadatas=[{"id": i} for i in ids]
+        )
+
+    def search(self, query_vector, k):
+        results = self.store.similarity_search_with_score_by_vector(query_vector.tolist(), k=k)
+        return [doc.metadata["id"] for doc, _ in results]
+
+
+class ChromaConfig(IndexConfig):
+    """The ChromaDB collection used by the dataset builder"""
+
+    name = "chroma"
+
+    def build(self, ids, texts, vectors):
+        import chromadb
+        from chromadb.config import Settings
+
+        client = chromadb.EphemeralClient(settings=Settings(anonymized_telemetry=False))
+        self.collection = client.create_collection(
+            name=f"bench_{int(time.time() * 1000)}",
+            metadata={"hnsw:space": "cosine"}
+        )
+        batch = 5000
+        for start in range(0, len(ids), batch):
+            self.collection.add(
+                ids=ids[start:start + batch],
+                documents=texts[start:start + batch],
+                embeddings=vectors[start:start + batch].tolist()
+            )
+
+    def search(self, query_vector, k):
+        results = self.collection.query(query_embeddings=[query_vector.tolist()], n_results=k, include=[])
+        return results["ids"][0]
+
+
+INDEX_CONFIGS: Dict[str, Callable[[], IndexConfig]] = {
+    "faiss_flat": FaissFlatConfig,
+    "faiss_hnsw": FaissHNSWConfig,
+    "faiss_ivf": FaissIVFConfig,
+    "rag_service_faiss": RAGServiceConfig,
+    "chroma": ChromaConfig,
+}
+
+
+# ========== MEASUREMENT ==========
+
+def rss_bytes() -> int:
+    """Current resident set size (Linux), falling back to peak RSS"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p * (len(ordered) - 1))))]
+
+
+def measure_latency(search: Callable[[str], List[str]], queries: List[Dict]) -> Dict[str, float]:
+    """Sequential end-to-end latency (query embedding + index search)"""
+    timings = []
+    for q in queries:
+        started = time.perf_counter()
+        search(q["query"])
+        timings.append((time.perf_counter() - started) * 1000)
+
+    return {
+        "p50_ms": round(percentile(timings, 0.50), 3),
+        "p99_ms": round(percentile(timings, 0.99), 3),
+        "mean_ms": round(sum(timings) / len(timings), 3)
+    }
+
+
+def measure_qps(search: Callable[[str], List[str]], queries: List[Dict], concurrency: int) -> float:
+    """Throughput with `concurrency` threads issuing the query set"""
+    texts = [q["query"] for q in queries]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(search, texts))
+    return round(len(texts) / (time.perf_counter() - started), 2)
+
+
+def measure_recall(search: Callable[[str], List[str]], queries: List[Dict], ks: List[int]) -> Dict[str, float]:
+    """Fraction of queries whose labelled passage appears in the top k"""
+    max_k = max(ks)
+    hits = {k: 0 for k in ks}
+    for q in queries:
+        retrieved = search(q["query"], max_k)
+        relevant = set(q["relevant_ids"])
+        for k in ks:
+            if relevant.intersection(retrieved[:k]):
+                hits[k] += 1
+
+    return {f"recall@{k}": round(hits[k] / len(queries), 4) for k in ks}
+
+
+def run_config(
+    config_name: str,
+    embedder,
+    ids: List[str],
+    texts: List[str],
+    vectors: np.ndarray,
+    queries: List[Dict],
+    ks: List[int],
+    concurrency_levels: List[int]
+) -> Dict:
+    """Build one index configuration and measure it"""
+    config = INDEX_CONFIGS[config_name]()
+    gc.collect()
+    rss_before = rss_bytes()
+
+    try:
+        started = time.perf_counter()
+        config.build(ids, texts, vectors)
+        build_seconds = time.perf_counter() - started
+    except ImportError as e:
+        return {"index": config_name, "skipped": f"missing dependency: {e}"}
+
+    index_memory = max(0, rss_bytes() - rss_before)
+
+    def search(query: str, k: int = max(ks)) -> List[str]:
+        return config.search(embedder.encode([query])[0], k)
+
+    result = {
+        "index": config_name,
+        "build_seconds": round(build_seconds, 3),
+        "index_memory_bytes": index_memory,
+        "latency": measure_latency(search, queries),
+        "qps": {str(c): measure_qps(search, queries, c) for c in concurrency_levels},
+        "recall": measure_recall(search, queries, ks)
+    }
+
+    del config
+    gc.collect()
+    return result
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(args) -> Dict:
+    sizes = [int(s) for s in args.sizes.split(",")]
+    configs = args.indexes.split(",")
+    ks = [int(k) for k in args.k.split(",")]
+    concurrency_levels = [int(c) for c in args.concurrency.split(",")]
+
+    embedder = ModelEmbedder() if args.embedder == "model" else HashingEmbedder(args.dim)
+    report = {
+        "benchmark": "retrieval",
+        "timestamp": datetime.utcnow().isoformat(),
+        "git_commit": git_commit(),
+        "machine": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count()
+        },
+        "params": {
+            "embedder": embedder.name,
+            "dim": embedder.dim,
+            "queries": args.queries,
+            "k": ks,
+            "concurrency": concurrency_levels,
+            "seed": args.seed
+        },
+        "results": []
+    }
+
+    for size in sizes:
+        print(f"[*] Generating corpus of {size:,} passages...")
+        started = time.perf_counter()
+        passages, queries = build_dataset(size, args.queries, seed=args.seed)
+        ids = [p["id"] for p in passages]
+        texts = [p["text"] for p in passages]
+        del passages
+
+        vectors = embed_corpus(embedder, texts)
+        embed_seconds = time.perf_counter() - started
+        print(f"[+] Corpus embedded in {embed_seconds:.1f}s")
+
+        for config_name in configs:
+            print(f"[*] {config_name} @ {size:,}")
+            result = run_config(config_name, embedder, ids, texts, vectors, queries, ks, concurrency_levels)
+            result.update({"corpus_size": size, "embed_seconds": round(embed_seconds, 3)})
+            report["results"].append(result)
+            print(f"    {json.dumps(result)}")
+
+        del ids, texts, vectors
+        gc.collect()
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LawMind retrieval benchmark")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated corpus sizes (passages)")
+    parser.add_argument("--indexes", default=",".join(INDEX_CONFIGS), help="Comma-separated index configurations")
+    parser.add_argument("--embedder", choices=["hashing", "model"], default="hashing")
+    parser.add_argument("--dim", type=int, default=384, help="Hashing embedder dimension")
+    parser.add_argument("--queries", type=int, default=500, help="Labelled queries per corpus")
+    parser.add_argument("--k", default="1,5,10", help="Comma-separated recall cut-offs")
+    parser.add_argument("--concurrency", default="1,4,16", help="Comma-separated thread counts for QPS")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="retrieval_benchmark.json", help="JSON report path")
+    args = parser.parse_args()
+
+    report = run_benchmark(args)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"[+] Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
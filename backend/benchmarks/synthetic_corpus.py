@@ -0,0 +1,117 @@
+"""
+Synthetic Legal Corpus Generator
+Deterministic judgment-like passages with section/citation tokens and labelled queries
+"""
+
+import random
+from typing import List, Dict, Iterator, Tuple
+
+ACTS = [
+    ("IPC", "Indian Penal Code", [302, 304, 307, 323, 376, 379, 406, 420, 498, 506]),
+    ("CrPC", "Code of Criminal Procedure", [125, 154, 156, 161, 164, 167, 313, 397, 438, 439, 482]),
+    ("CPC", "Code of Civil Procedure", [9, 10, 11, 80, 100, 115, 151]),
+    ("NDPS", "Narcotic Drugs and Psychotropic Substances Act", [8, 20, 21, 22, 37, 50]),
+    ("NI Act", "Negotiable Instruments Act", [138, 139, 141, 143]),
+    ("Evidence Act", "Indian Evidence Act", [3, 24, 25, 27, 32, 45, 65, 114]),
+    ("Constitution", "Constitution of India", [14, 19, 21, 32, 226, 227, 300]),
+]
+
+REPORTERS = ["AIR {year} SC {page}", "({year}) {vol} SCC {page}", "{year} SCC OnLine SC {page}",
+             "[{year}] {vol} SCR {page}", "{year} INSC {page}"]
+
+DOCTRINES = [
+    "basic structure", "res judicata", "natural justice", "audi alteram partem", "legitimate expectation",
+    "proportionality", "anticipatory bail", "personal liberty", "burden of proof", "benefit of doubt",
+    "last seen theory", "dying declaration", "circumstantial evidence", "reverse burden", "promissory estoppel",
+    "doctrine of eclipse", "separation of powers", "judicial review", "right to privacy", "absolute liability",
+]
+
+FILLER = (
+    "the learned counsel for the appellant submitted that the impugned order suffers from infirmity "
+    "and the high court erred in appreciating the evidence on record the prosecution failed to establish "
+    "the chain of circumstances the trial court recorded findings of fact which were affirmed in appeal "
+    "we have heard the parties at length and perused the material placed before us the respondent contended "
+    "that the petition is not maintainable the question that arises for consideration is whether the "
+    "accused is entitled to relief having regard to the facts and circumstances of the case"
+).split()
+
+SURNAMES = ["Sharma", "Verma", "Iyer", "Reddy", "Patel", "Singh", "Nair", "Gupta", "Rao", "Joshi",
+            "Mehta", "Kumar", "Das", "Bose", "Khan", "Pillai", "Menon", "Chopra", "Kapoor", "Yadav"]
+STATES = ["Kerala", "Maharashtra", "Rajasthan", "Punjab", "Karnataka", "Gujarat", "Bihar", "Assam",
+          "Odisha", "Haryana", "Tamil Nadu", "West Bengal", "Uttar Pradesh", "Madhya Pradesh"]
+
+PASSAGES_PER_JUDGMENT = 8
+
+
+def _citation(rng: random.Random) -> str:
+    template = rng.choice(REPORTERS)
+    return template.format(year=rng.randint(1950, 2025), vol=rng.randint(1, 12), page=rng.randint(1, 4000))
+
+
+def _rare_term(rng: random.Random) -> str:
+    """Judgment-specific fact token (e.g. a village or exhibit name)"""
+    return "".join(rng.choice("bcdfghjklmnprstvz") + rng.choice("aeiou") for _ in range(4))
+
+
+def generate_passages(size: int, seed: int = 42) -> Iterator[Dict]:
+    """
+    Yield `size` passages grouped into judgments
+
+    Each judgment shares parties, sections and a few rare fact terms across
+    its passages; each passage also carries its own distinctive terms, which
+    labelled queries are drawn from.
+    """
+    rng = random.Random(seed)
+    passage_id = 0
+
+    while passage_id < size:
+        judgment_id = passage_id // PASSAGES_PER_JUDGMENT
+        short, act_name, sections = rng.choice(ACTS)
+        section = rng.choice(sections)
+        parties = f"{rng.choice(SURNAMES)} v. State of {rng.choice(STATES)}"
+        judgment_terms = [_rare_term(rng) for _ in range(3)]
+        doctrine = rng.choice(DOCTRINES)
+
+        for _ in range(min(PASSAGES_PER_JUDGMENT, size - passage_id)):
+            distinctive = [_rare_term(rng) for _ in range(4)]
+            cited = _citation(rng)
+            words = rng.sample(FILLER, 25)
+            words[5:5] = [f"Section {section} of the {act_name}", f"({short})"]
+            words[12:12] = [doctrine, "as held in", cited]
+            words[18:18] = distinctive + judgment_terms[:rng.randint(1, 3)]
+
+            yield {
+                "id": f"p{passage_id}",
+                "judgment_id": f"j{judgment_id}",
+                "text": f"{parties}. " + " ".join(words) + ".",
+                "section": f"{short} {section}",
+                "citation": cited,
+                "distinctive_terms": distinctive
+            }
+            passage_id += 1
+
+
+def generate_queries(passages: List[Dict], count: int, seed: int = 7) -> List[Dict]:
+    """
+    Build labelled queries: each targets one passage via its distinctive
+    terms mixed with its section reference and generic legal wording
+    """
+    rng = random.Random(seed)
+    queries = []
+
+    for target in rng.sample(passages, min(count, len(passages))):
+        terms = rng.sample(target["distinctive_terms"], 3)
+        noise = rng.sample(FILLER, 3)
+        queries.append({
+            "query": " ".join(terms + [f"section {target['section']}"] + noise),
+            "relevant_ids": [target["id"]],
+            "relevant_judgment": target["judgment_id"]
+        })
+
+    return queries
+
+
+def build_dataset(size: int, query_count: int, seed: int = 42) -> Tuple[List[Dict], List[Dict]]:
+    """Generate a corpus of `size` passages and `query_count` labelled queries"""
+    passages = list(generate_passages(size, seed=seed))
+    return passages, generate_queries(passages, query_count, seed=seed + 1)
@@ -3,14 +3,17 @@ LawMind Backend - Main FastAPI Application
 AI-Powered Legal Drafting Assistant
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import uvicorn
 
 from app.routers import drafts, auth, documents, citations, dataset, analytics
 from app.core.config import settings
 from app.core.database import init_db
+from app.core.metrics import metrics
+from app.core.security import verify_token
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -18,8 +21,29 @@ async def lifespan(app: FastAPI):
     print("[*] LawMind Backend Starting...")
     await init_db()
     print("[+] Database initialized")
+    from app.services.citation_service import get_citation_service
+    print(f"[+] Citation index loaded ({len(get_citation_service().index)} precedents)")
+    from app.services.case_law_mirror import get_case_law_mirror
+    print(f"[+] Case law mirror ready ({len(get_case_law_mirror())} cases)")
+    if settings.RERANK_ENABLED:
+        from app.services.rerank_service import get_reranker
+        await asyncio.to_thread(get_reranker().warm_up)
+        print(f"[+] Re-ranking model loaded ({settings.RERANK_MODEL})")
+    if settings.OCR_PRELOAD_MODELS:
+        from app.services.ocr_executor import ocr_executor
+        await ocr_executor.start()
+        print(f"[+] OCR workers started ({ocr_executor.workers}, models preloaded)")
+    from app.services.ocr_jobs import ocr_job_worker
+    ocr_worker_task = asyncio.create_task(ocr_job_worker.run()) if settings.OCR_JOB_WORKER_ENABLED else None
     yield
     print("[-] LawMind Backend Shutting Down...")
+    if ocr_worker_task is not None:
+        await ocr_job_worker.stop()
+        await ocr_worker_task
+    from app.core.http_client import http_client
+    await http_client.aclose()
+    from app.services.ocr_executor import ocr_executor
+    ocr_executor.shutdown()
 
 app = FastAPI(
     title="LawMind API",
@@ -63,6 +87,11 @@ async def health_check():
         "ai_service": "ready"
     }
 
+@app.get("/metrics")
+async def get_metrics(token_data: dict = Depends(verify_token)):
+    """In-process counters and latency percentiles (e.g. re-ranking p50/p95); requires a valid token"""
+    return metrics.snapshot()
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",